@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 ClaudeKit Help Command - All-in-one guide with dynamic command discovery.
-Scans .opencode/commands/ directory to build catalog at runtime.
+Scans .opencode/commands/ directory to build catalog at runtime; the catalog
+is cached in .opencode/.ck-help-cache.json and rebuilt only when the commands
+tree changes (file count or newest mtime).
 
 Usage:
     python ck-help.py                    # Overview with quick start
@@ -12,8 +14,12 @@ Usage:
 """
 
 import sys
+import os
 import re
 import io
+import json
+import math
+from functools import lru_cache
 from pathlib import Path
 
 # Fix Windows console encoding for Unicode characters
@@ -45,8 +51,14 @@ def emit_output_type(output_type: str) -> None:
 
 
 # Fuzzy matching for typo tolerance
-def levenshtein_distance(s1: str, s2: str) -> int:
-    """Standard Levenshtein distance algorithm."""
+def levenshtein_distance(s1: str, s2: str, max_distance: int = None) -> int:
+    """Standard Levenshtein distance algorithm.
+
+    With max_distance, returns max_distance + 1 as soon as the distance is
+    known to exceed it (see bounded_levenshtein).
+    """
+    if max_distance is not None:
+        return bounded_levenshtein(s1, s2, max_distance)
     if len(s1) < len(s2):
         return levenshtein_distance(s2, s1)
     if len(s2) == 0:
@@ -64,6 +76,37 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     return prev_row[-1]
 
 
+@lru_cache(maxsize=4096)
+def bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """Levenshtein distance capped at max_distance + 1 (memoized).
+
+    Only the diagonal band |i - j| <= max_distance of the DP matrix can hold
+    values within the limit, so only that band is computed, and the scan
+    stops as soon as a whole row exceeds the limit.
+    """
+    over = max_distance + 1
+    if abs(len(s1) - len(s2)) > max_distance:
+        return over
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    prev_row = [j if j <= max_distance else over for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1, 1):
+        curr_row = [over] * (len(s2) + 1)
+        curr_row[0] = i if i <= max_distance else over
+        for j in range(max(1, i - max_distance), min(len(s2), i + max_distance) + 1):
+            curr_row[j] = min(
+                prev_row[j] + 1,                        # insertion
+                curr_row[j - 1] + 1,                    # deletion
+                prev_row[j - 1] + (c1 != s2[j - 1]),    # substitution
+                over
+            )
+        if min(curr_row) > max_distance:
+            return over
+        prev_row = curr_row
+    return prev_row[-1]
+
+
 def fuzzy_match(word: str, target: str, threshold: int = 2) -> bool:
     """Check if word matches target within edit distance threshold."""
     if len(word) < 3:  # Skip very short words
@@ -83,7 +126,53 @@ def fuzzy_match(word: str, target: str, threshold: int = 2) -> bool:
     if max_edits < 1:
         return word == target
 
-    return levenshtein_distance(word, target) <= max_edits
+    return bounded_levenshtein(word, target, max_edits) <= max_edits
+
+
+class FuzzyIndex:
+    """SymSpell-style deletion index for fuzzy_match lookups.
+
+    Every term is indexed under all strings reachable by deleting up to
+    `max_edits` characters. Two strings within edit distance d share such a
+    deletion (each side needs at most d deletes), so the candidates for a
+    word come from hash probes of the word's own deletions; each candidate
+    is then confirmed with fuzzy_match, giving exactly the terms a linear
+    fuzzy_match scan would accept.
+    """
+
+    def __init__(self, terms, max_edits: int = 2):
+        self.max_edits = max_edits
+        self.terms = set(terms)
+        self._deletes = {}
+        for term in self.terms:
+            for variant in self._deletions(term):
+                self._deletes.setdefault(variant, set()).add(term)
+        self._max_len = max((len(t) for t in self.terms), default=0)
+
+    def _deletions(self, text: str) -> set:
+        variants = {text}
+        frontier = {text}
+        for _ in range(self.max_edits):
+            frontier = {v[:i] + v[i + 1:] for v in frontier for i in range(len(v))}
+            variants |= frontier
+        return variants
+
+    @lru_cache(maxsize=1024)
+    def lookup(self, word: str) -> frozenset:
+        """All indexed terms t with fuzzy_match(word, t)."""
+        if len(word) < 3 or len(word) > self._max_len + 1:
+            # Short words only match exactly; fuzzy_match needs lengths within 1
+            return frozenset({word} & self.terms)
+        candidates = set()
+        for variant in self._deletions(word):
+            candidates |= self._deletes.get(variant, set())
+        return frozenset(t for t in candidates if fuzzy_match(word, t))
+
+
+@lru_cache(maxsize=16)
+def fuzzy_index(terms: frozenset) -> FuzzyIndex:
+    """Shared FuzzyIndex per term set."""
+    return FuzzyIndex(terms)
 
 
 # Disambiguation threshold - if top 2 scores within this, ask user
@@ -119,19 +208,51 @@ SYNONYMS = {
 }
 
 
-def expand_synonyms(text: str) -> str:
-    """Replace synonyms with canonical terms."""
-    result = text.lower()
+def _compile_synonyms(synonyms: dict) -> tuple:
+    """Build a single-pass synonym matcher.
 
+    Synonyms are applied longest first, one after another, so a canonical
+    term can itself be rewritten by a later (shorter) synonym - e.g.
+    "pipeline" -> "github actions" -> "github github actions". Each synonym's
+    replacement is therefore pre-expanded through every later synonym, and
+    one alternation regex (longest first) then does all replacements in a
+    single scan with the same result.
+    """
     # Sort by length (longest first) to handle multi-word synonyms
-    sorted_synonyms = sorted(SYNONYMS.items(), key=lambda x: -len(x[0]))
+    ordered = sorted(synonyms.items(), key=lambda x: -len(x[0]))
+    patterns = [re.compile(r'\b' + re.escape(synonym) + r'\b', re.IGNORECASE)
+                for synonym, _ in ordered]
 
-    for synonym, canonical in sorted_synonyms:
-        # Word boundary aware replacement
-        pattern = r'\b' + re.escape(synonym) + r'\b'
-        result = re.sub(pattern, canonical, result, flags=re.IGNORECASE)
+    expansions = {}
+    for i, (synonym, canonical) in enumerate(ordered):
+        for later, (_, later_canonical) in zip(patterns[i + 1:], ordered[i + 1:]):
+            canonical = later.sub(later_canonical, canonical)
+        expansions[synonym] = canonical
 
-    return result
+    combined = re.compile(
+        r'\b(?:' + '|'.join(re.escape(synonym) for synonym, _ in ordered) + r')\b',
+        re.IGNORECASE
+    )
+    return combined, [(p, expansions[synonym]) for p, (synonym, _) in zip(patterns, ordered)], expansions
+
+
+_SYNONYM_PATTERN, _SYNONYM_RULES, _SYNONYM_EXPANSIONS = _compile_synonyms(SYNONYMS)
+
+
+def _synonym_replacement(match) -> str:
+    text = match.group(0)
+    if text in _SYNONYM_EXPANSIONS:
+        return _SYNONYM_EXPANSIONS[text]
+    # Case-insensitive oddities (e.g. U+017F long s): same order as the alternation
+    for pattern, expansion in _SYNONYM_RULES:
+        if pattern.fullmatch(text):
+            return expansion
+    return text
+
+
+def expand_synonyms(text: str) -> str:
+    """Replace synonyms with canonical terms."""
+    return _SYNONYM_PATTERN.sub(_synonym_replacement, text.lower())
 
 
 # Task keyword mappings for intent detection
@@ -153,6 +274,47 @@ TASK_MAPPINGS = {
     "notifications": ["notification", "notifications", "notify", "discord", "telegram", "slack", "alert", "webhook", "stop hook", "session end", "setup notification", "setup notifications", "configure discord", "configure telegram", "configure slack", "discord webhook", "telegram bot", "slack webhook"],
 }
 
+
+def _compile_keywords(mappings: dict) -> tuple:
+    """Split single-word keywords into plain words and punctuated ones.
+
+    A plain keyword (word characters only) matches at word boundaries exactly
+    where a whole run of word characters equals it, so one tokenizing pass
+    finds the first match of every plain keyword at once; the few with
+    punctuation (".ck.json") keep a precompiled regex.
+    """
+    plain = set()
+    punctuated = {}
+    for keywords in mappings.values():
+        for kw in keywords:
+            if ' ' in kw:
+                continue
+            if re.fullmatch(r'\w+', kw):
+                plain.add(kw)
+            else:
+                punctuated[kw] = re.compile(r'\b' + re.escape(kw) + r'\b')
+    return plain, punctuated
+
+
+_WORD_RUN = re.compile(r'\w+')
+_PLAIN_KEYWORDS, _PUNCTUATED_KEYWORDS = _compile_keywords(TASK_MAPPINGS)
+_KEYWORD_INDEX = FuzzyIndex(_PLAIN_KEYWORDS | set(_PUNCTUATED_KEYWORDS))
+
+
+def keyword_starts(text: str) -> dict:
+    """Start offset of the first whole-word match of each single-word TASK_MAPPINGS keyword."""
+    starts = {}
+    for match in _WORD_RUN.finditer(text):
+        word = match.group(0)
+        if word in _PLAIN_KEYWORDS and word not in starts:
+            starts[word] = match.start()
+    for kw, pattern in _PUNCTUATED_KEYWORDS.items():
+        match = pattern.search(text)
+        if match:
+            starts[kw] = match.start()
+    return starts
+
+
 # Category workflows and tips
 CATEGORY_GUIDES = {
     "plan": {
@@ -388,6 +550,165 @@ def discover_commands(commands_dir: Path, prefix: str) -> dict:
     return {"commands": commands, "categories": categories}
 
 
+# Bump when the cached catalog layout changes
+CATALOG_CACHE_VERSION = 2
+CATALOG_CACHE_NAME = ".ck-help-cache.json"
+
+# BM25 parameters for do_search
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_WEIGHT = 3  # Name tokens count as this many occurrences
+
+
+def tokenize(text: str) -> list:
+    """Lowercase alphanumeric tokens ("/plan:fast" -> ["plan", "fast"])."""
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def strip_command_prefix(term: str, prefix: str = "") -> str:
+    """Drop the command namespace from typed names ("/ck:plan fix" -> "plan fix").
+
+    Index names are stored without the prefix, so leaving "ck" in the query
+    would match /ck-help's heavily weighted name instead.
+    """
+    namespaces = {p for p in (prefix, "ck:") if p}
+    pattern = r'(^|\s)/?(?:' + "|".join(re.escape(p) for p in sorted(namespaces)) + r')'
+    return re.sub(pattern, r'\1', term, flags=re.IGNORECASE).strip()
+
+
+def _guide_text(guide: dict) -> str:
+    return " ".join([guide.get("title", "")]
+                    + [f"{step} {cmd}" for step, cmd in guide.get("workflow", [])])
+
+
+def build_search_index(data: dict, prefix: str = "") -> dict:
+    """Inverted index over command names, descriptions and category guides.
+
+    Each command is one document: its name (weighted), its description and
+    the guide of its category - the directory category, or for flat
+    layouts the guide named by the command's first name segment
+    ("/docs-init" -> docs).
+    """
+    docs = []
+    postings = {}
+    lengths = []
+
+    for category in sorted(data["commands"]):
+        for position, cmd in enumerate(data["commands"][category]):
+            base_name = cmd["name"].lstrip("/")
+            if prefix and base_name.startswith(prefix):
+                base_name = base_name[len(prefix):]
+            name_tokens = tokenize(base_name)
+            guide = CATEGORY_GUIDES.get(category) or CATEGORY_GUIDES.get(name_tokens[0] if name_tokens else "", {})
+
+            tokens = name_tokens * NAME_WEIGHT + tokenize(cmd["description"]) + tokenize(_guide_text(guide))
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+
+            doc_id = len(docs)
+            docs.append([category, position])
+            lengths.append(len(tokens))
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append([doc_id, tf])
+
+    return {
+        "docs": docs,
+        "lengths": lengths,
+        "avg_length": (sum(lengths) / len(lengths)) if lengths else 0.0,
+        "postings": postings,
+    }
+
+
+def bm25_search(data: dict, term: str, prefix: str = "") -> list:
+    """Commands ranked by BM25 relevance to term (synonyms expanded)."""
+    index = data.get("search_index") or build_search_index(data, prefix)
+    docs = index["docs"]
+    if not docs:
+        return []
+
+    term = strip_command_prefix(term, prefix)
+
+    query = set(tokenize(term)) | set(tokenize(expand_synonyms(term)))
+    scores = {}
+    for token in query:
+        postings = index["postings"].get(token)
+        if not postings:
+            continue
+        idf = math.log(1 + (len(docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+        for doc_id, tf in postings:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * index["lengths"][doc_id] / index["avg_length"])
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+    return [data["commands"][docs[d][0]][docs[d][1]] for d in ranked]
+
+
+def commands_fingerprint(commands_dir: Path) -> list:
+    """Cheap change detector for the commands tree: [file count, newest mtime].
+
+    Only stats entries (no reads). Directory mtimes are included so that
+    deletes and renames are noticed even when file mtimes don't change.
+    """
+    count = 0
+    newest = 0
+    stack = [str(commands_dir)]
+    while stack:
+        directory = stack.pop()
+        try:
+            newest = max(newest, os.stat(directory).st_mtime_ns)
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.endswith(".md"):
+                count += 1
+                try:
+                    newest = max(newest, entry.stat().st_mtime_ns)
+                except OSError:
+                    pass
+    return [count, newest]
+
+
+def load_catalog(commands_dir: Path, prefix: str, cache_path: Path = None) -> dict:
+    """Command catalog from cache, rescanning only when the commands tree changed."""
+    if cache_path is None:
+        cache_path = commands_dir.parent / CATALOG_CACHE_NAME
+
+    key = {
+        "version": CATALOG_CACHE_VERSION,
+        "commands_dir": str(commands_dir),
+        "prefix": prefix,
+        "fingerprint": commands_fingerprint(commands_dir),
+        # Guides and index layout live in this script; rebuild when it changes
+        "script_mtime": os.stat(__file__).st_mtime_ns,
+    }
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and all(cached.get(k) == v for k, v in key.items()):
+            return cached["data"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    data = discover_commands(commands_dir, prefix)
+    data["search_index"] = build_search_index(data, prefix)
+
+    # Best-effort write (read-only installs just rescan every time)
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(key, data=data), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return data
+
+
 def detect_intent(input_str: str, categories: list) -> str:
     """Smart auto-detection of user intent."""
     if not input_str:
@@ -414,15 +735,12 @@ def detect_intent(input_str: str, categories: list) -> str:
 
     # Single word typo tolerance: fuzzy match against categories
     all_categories = set(c.lower() for c in categories) | set(c.lower() for c in CATEGORY_GUIDES.keys())
-    for cat in all_categories:
-        if fuzzy_match(input_lower, cat):
-            return "category"
+    if fuzzy_index(frozenset(all_categories)).lookup(input_lower):
+        return "category"
 
     # Single word typo tolerance: fuzzy match against task keywords
-    for cat, keywords in TASK_MAPPINGS.items():
-        for kw in keywords:
-            if ' ' not in kw and fuzzy_match(input_lower, kw):
-                return "task"
+    if _KEYWORD_INDEX.lookup(input_lower):
+        return "task"
 
     # Check if it looks like a command (has colon)
     if ':' in input_str:
@@ -496,8 +814,9 @@ def show_category_guide(data: dict, category: str, prefix: str) -> None:
     # Fuzzy match for typos (e.g., "notifcations" → "notifications")
     if not cat_key:
         all_categories = list(categories.keys()) + list(CATEGORY_GUIDES.keys())
+        matches = fuzzy_index(frozenset(k.lower() for k in all_categories)).lookup(category_lower)
         for key in all_categories:
-            if fuzzy_match(category_lower, key.lower()):
+            if key.lower() in matches:
                 cat_key = key
                 break
 
@@ -556,7 +875,7 @@ def show_command(data: dict, command: str, prefix: str) -> None:
     if not found:
         print(f"Command '{command}' not found.")
         print()
-        do_search(data, command.replace(":", " "), prefix)
+        do_search(data, strip_command_prefix(command, prefix).replace(":", " "), prefix)
         return
 
     print(f"# `{found['name']}`")
@@ -578,17 +897,22 @@ def show_command(data: dict, command: str, prefix: str) -> None:
 
 
 def do_search(data: dict, term: str, prefix: str) -> None:
-    """Search commands by keyword."""
+    """Search commands by keyword, most relevant first (BM25)."""
     emit_output_type("search-results")
 
     commands = data["commands"]
-    term_lower = term.lower()
-    matches = []
+    term_lower = strip_command_prefix(term, prefix).lower()
+    ranked = bm25_search(data, term, prefix)
 
+    # Partial-word hits (e.g. "fix" in "fixing") rank after whole-word ones
+    ranked_names = set(cmd["name"] for cmd in ranked)
+    partial = []
     for cmds in commands.values():
         for cmd in cmds:
-            if term_lower in cmd["name"].lower() or term_lower in cmd["description"].lower():
-                matches.append(cmd)
+            if cmd["name"] not in ranked_names and (
+                    term_lower in cmd["name"].lower() or term_lower in cmd["description"].lower()):
+                partial.append(cmd)
+    matches = ranked + partial
 
     if not matches:
         print(f"No commands found for '{term}'.")
@@ -598,7 +922,10 @@ def do_search(data: dict, term: str, prefix: str) -> None:
 
     print(f"# Search: {term}")
     print()
-    print(f"Found {len(matches)} matches:")
+    found = f"Found {len(matches)} matches"
+    if partial:
+        found += f" ({len(partial)} partial-word)"
+    print(f"{found}:")
     for cmd in matches[:8]:
         print(f"- `{cmd['name']}` - {cmd['description']}")
 
@@ -650,6 +977,11 @@ def recommend_task(data: dict, task: str, prefix: str) -> None:
     # Check if first word is an action verb
     first_word_is_action = words[0] in ACTION_VERBS if words else False
 
+    # First match of every single-word keyword, found in one pass, and the
+    # keywords each word fuzzy-matches (deletion-index probes, no DP scan)
+    starts = keyword_starts(task_lower)
+    fuzzy_hits = [_KEYWORD_INDEX.lookup(word) for word in words]
+
     # Score categories by keyword matches with smart weighting
     scores = {}
     for cat, keywords in TASK_MAPPINGS.items():
@@ -665,19 +997,19 @@ def recommend_task(data: dict, task: str, prefix: str) -> None:
                 is_fuzzy = False
 
                 # Try exact match first
-                match = re.search(r'\b' + re.escape(kw) + r'\b', task_lower)
-                if match:
+                start = starts.get(kw)
+                if start is not None:
                     # Find word position from character position
                     char_count = 0
                     for i, word in enumerate(words):
-                        if char_count <= match.start() < char_count + len(word):
+                        if char_count <= start < char_count + len(word):
                             matched_pos = i
                             break
                         char_count += len(word) + 1
                 else:
                     # Fuzzy matching fallback for typos
-                    for i, word in enumerate(words):
-                        if fuzzy_match(word, kw):
+                    for i, hits in enumerate(fuzzy_hits):
+                        if kw in hits:
                             matched_pos = i
                             is_fuzzy = True
                             break
@@ -1047,9 +1379,9 @@ def main():
         print("Error: .opencode/commands/ directory not found.")
         sys.exit(1)
 
-    # Detect prefix and discover commands
+    # Detect prefix and load the (cached) command catalog
     prefix = detect_prefix(commands_dir)
-    data = discover_commands(commands_dir, prefix)
+    data = load_catalog(commands_dir, prefix)
 
     if not data["commands"]:
         print("No commands found in .opencode/commands/")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Shared ffprobe cache for media skills (media-processing, ai-multimodal).
+
+ffprobe output is cached per file keyed by (absolute path, size, mtime), so
+a file probed before encoding, after encoding and again for a comparison
+spawns ffprobe once, while an edited file is probed again. probe_many()
+inspects many files concurrently for batch jobs.
+
+Kept in memory unless $MEDIA_PROBE_CACHE names a JSON file, so repeated
+batch runs over the same clips skip probing entirely; both skills read and
+write the same store.
+
+Usage (in a skill script):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'scripts'))
+    from media_probe_cache import get_probe_cache
+
+    info = get_probe_cache().probe('clip.mp4')
+"""
+
+import atexit
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+PROBE_WORKERS = 8  # ffprobe is I/O + process-spawn bound
+PROBE_COMMAND = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams']
+
+PathLike = Union[str, Path]
+
+
+class ProbeCache:
+    """(path, size, mtime) -> parsed `ffprobe -show_format -show_streams` JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def _stat_key(file_path: PathLike) -> tuple:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return os.path.abspath(file_path), None  # Let ffprobe report the error
+        return os.path.abspath(file_path), [stat.st_size, stat.st_mtime_ns]
+
+    def lookup(self, file_path: PathLike) -> Optional[Dict[str, Any]]:
+        """Cached ffprobe data if file_path is unchanged since it was probed."""
+        key, file_stat = self._stat_key(file_path)
+        if not file_stat:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry.get('stat') == file_stat:
+            return entry['data']
+        return None
+
+    def probe(self, file_path: PathLike) -> Dict[str, Any]:
+        """ffprobe data for file_path, from cache when the file is unchanged.
+
+        Raises like the ffprobe call itself (CalledProcessError,
+        FileNotFoundError, ValueError); failures are not cached.
+        """
+        data = self.lookup(file_path)
+        if data is not None:
+            return data
+
+        key, file_stat = self._stat_key(file_path)
+        result = subprocess.run(PROBE_COMMAND + [str(file_path)],
+                                capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout)
+        if file_stat:
+            with self._lock:
+                self._entries[key] = {'stat': file_stat, 'data': data}
+                self._dirty = True
+        return data
+
+    def probe_many(
+        self,
+        file_paths: List[PathLike],
+        max_workers: int = PROBE_WORKERS
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Probe many files concurrently; None for files that fail. Keeps input order."""
+        def safe_probe(file_path: PathLike) -> Optional[Dict[str, Any]]:
+            try:
+                return self.probe(file_path)
+            except (subprocess.CalledProcessError, OSError, ValueError):
+                return None
+
+        if len(file_paths) <= 1:
+            return [safe_probe(p) for p in file_paths]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(safe_probe, file_paths))
+
+    def save(self) -> None:
+        """Write the on-disk store (if any) when new files were probed."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(data, encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Best-effort: the next run just probes again
+
+
+_probe_cache: Optional[ProbeCache] = None
+_probe_cache_lock = threading.Lock()
+
+
+def get_probe_cache() -> ProbeCache:
+    """Process-wide ProbeCache; persisted at exit only when $MEDIA_PROBE_CACHE is set."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            store = os.getenv('MEDIA_PROBE_CACHE')
+            _probe_cache = ProbeCache(Path(store) if store else None)
+            if store:
+                atexit.register(_probe_cache.save)
+    return _probe_cache
@@ -16,12 +16,17 @@ Usage:
 
     api_key = resolve_env('GEMINI_API_KEY', skill='ai-multimodal')
     api_key = resolve_env('GEMINI_API_KEY')  # Without skill context
+
+    # Several variables, one pass over the .env hierarchy
+    from resolve_env import get_resolver
+    values = get_resolver('ai-multimodal').resolve_many(['GEMINI_API_KEY', 'GEMINI_MODEL'])
 """
 
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Iterable, Optional, Dict, List, Tuple
 
 def _parse_env_file_fallback(path) -> Dict[str, str]:
     """
@@ -138,6 +143,135 @@ def get_env_file_paths(skill: Optional[str] = None) -> List[Tuple[str, Path]]:
     return paths
 
 
+class EnvResolver:
+    """
+    Parsed, merged view of the .env hierarchy for one skill.
+
+    Every .env file is parsed once and re-parsed only when its mtime (or
+    size) changes, so resolving many variables costs one stat per file
+    instead of one parse per file per variable. Each merged value keeps the
+    layer it came from. process.env is always read live.
+    """
+
+    def __init__(self, skill: Optional[str] = None):
+        self.skill = skill
+        self.env_paths = get_env_file_paths(skill)
+        self._lock = threading.Lock()
+        self._files: Dict[Path, Tuple[Tuple[int, int], Dict[str, str], Optional[str]]] = {}
+        self._merged: Dict[str, Tuple[str, str, Path]] = {}
+        self._stats: Optional[List[Optional[Tuple[int, int]]]] = None
+
+    def _load(self, path: Path, stat: Tuple[int, int]) -> None:
+        """Parse path into self._files (values, error) for this stat."""
+        try:
+            values = {k: v for k, v in dotenv_values(path).items() if v is not None}
+            error = None
+        except Exception as e:
+            values, error = {}, str(e)
+        self._files[path] = (stat, values, error)
+
+    def refresh(self) -> None:
+        """Re-parse the .env files that changed since the last call."""
+        stats = []
+        for _, path in self.env_paths:
+            try:
+                st = path.stat()
+                stats.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append(None)
+
+        with self._lock:
+            if stats == self._stats:
+                return
+            for (_, path), stat in zip(self.env_paths, stats):
+                if stat is None:
+                    self._files.pop(path, None)
+                elif path not in self._files or self._files[path][0] != stat:
+                    self._load(path, stat)
+
+            # Lowest priority first, so higher layers overwrite
+            merged = {}
+            for description, path in reversed(self.env_paths):
+                if path in self._files:
+                    for name, value in self._files[path][1].items():
+                        if value:
+                            merged[name] = (value, description, path)
+            self._merged = merged
+            self._stats = stats
+
+    def layers(self) -> List[Tuple[str, Path, Optional[Dict[str, str]], Optional[str]]]:
+        """(description, path, values or None if missing, parse error) per layer, highest first."""
+        self.refresh()
+        with self._lock:
+            result = []
+            for description, path in self.env_paths:
+                entry = self._files.get(path)
+                if entry:
+                    result.append((description, path, entry[1], entry[2]))
+                else:
+                    result.append((description, path, None, None))
+            return result
+
+    def lookup(self, var_name: str) -> Optional[Tuple[str, str, Optional[Path]]]:
+        """(value, description, path) of the winning definition, or None."""
+        value = os.getenv(var_name)
+        if value:
+            return (value, "Runtime environment", None)
+        self.refresh()
+        return self._merged.get(var_name)
+
+    def resolve(self, var_name: str, default: Optional[str] = None) -> Optional[str]:
+        found = self.lookup(var_name)
+        return found[0] if found else default
+
+    def resolve_many(
+        self,
+        names: Iterable[str],
+        default: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """Resolve several variables with a single pass over the .env files."""
+        self.refresh()
+        merged = self._merged
+        result = {}
+        for name in names:
+            value = os.getenv(name)
+            if not value:
+                found = merged.get(name)
+                value = found[0] if found else default
+            result[name] = value
+        return result
+
+    def names(self) -> List[str]:
+        """Every variable defined in process.env or any .env layer."""
+        self.refresh()
+        return sorted(set(self._merged) | set(os.environ))
+
+    def find_all(self, var_name: str) -> List[Tuple[str, str, Optional[Path]]]:
+        """(description, value, path) for every layer defining var_name, highest first."""
+        results = []
+        value = os.getenv(var_name)
+        if value:
+            results.append(("Runtime environment", value, None))
+        for description, path, values, _ in self.layers():
+            if values and values.get(var_name):
+                results.append((description, values[var_name], path))
+        return results
+
+
+_resolvers: Dict[Tuple[Optional[str], Path], EnvResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(skill: Optional[str] = None) -> EnvResolver:
+    """Process-wide EnvResolver for skill (per working directory, which picks the project)."""
+    key = (skill, Path.cwd())
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = _resolvers[key] = EnvResolver(skill)
+    return resolver
+
+
 def resolve_env(
     var_name: str,
     skill: Optional[str] = None,
@@ -156,47 +290,35 @@ def resolve_env(
     Returns:
         Resolved value or default if not found
     """
+    resolver = get_resolver(skill)
+    if not verbose:
+        return resolver.resolve(var_name, default)
+
     # Priority 1: Check process environment (HIGHEST)
     value = os.getenv(var_name)
     if value:
-        if verbose:
-            print(f"✓ {var_name} found in: Runtime environment (process.env)")
+        print(f"✓ {var_name} found in: Runtime environment (process.env)")
         return value
 
-    if verbose:
-        print(f"✗ {var_name} not in: Runtime environment")
-
-    # Note: dotenv_values is always available (uses fallback if python-dotenv not installed)
+    print(f"✗ {var_name} not in: Runtime environment")
 
     # Priority 2-7: Check .env files in order
-    env_paths = get_env_file_paths(skill)
-
-    for description, path in env_paths:
-        if path.exists():
-            try:
-                env_vars = dotenv_values(path)
-                value = env_vars.get(var_name)
-
-                if value:
-                    if verbose:
-                        print(f"✓ {var_name} found in: {description}")
-                        print(f"  Path: {path}")
-                    return value
-                else:
-                    if verbose:
-                        print(f"✗ {var_name} not in: {description} (file exists)")
-            except Exception as e:
-                if verbose:
-                    print(f"⚠ Error reading {description}: {e}")
+    for description, path, env_vars, error in resolver.layers():
+        if error:
+            print(f"⚠ Error reading {description}: {error}")
+        elif env_vars is None:
+            print(f"✗ {var_name} not in: {description} (file not found)")
+        elif env_vars.get(var_name):
+            print(f"✓ {var_name} found in: {description}")
+            print(f"  Path: {path}")
+            return env_vars[var_name]
         else:
-            if verbose:
-                print(f"✗ {var_name} not in: {description} (file not found)")
+            print(f"✗ {var_name} not in: {description} (file exists)")
 
     # Not found anywhere
-    if verbose:
-        print(f"\n❌ {var_name} not found in any location")
-        if default:
-            print(f"   Using default: {default}")
+    print(f"\n❌ {var_name} not found in any location")
+    if default:
+        print(f"   Using default: {default}")
 
     return default
 
@@ -212,28 +334,7 @@ def find_all(var_name: str, skill: Optional[str] = None) -> List[Tuple[str, str,
     Returns:
         List of (description, value, path) tuples for all found locations
     """
-    results = []
-
-    # Check process environment
-    value = os.getenv(var_name)
-    if value:
-        results.append(("Runtime environment", value, None))
-
-    # Check all .env files (dotenv_values always available via fallback)
-    env_paths = get_env_file_paths(skill)
-
-    for description, path in env_paths:
-        if path.exists():
-            try:
-                env_vars = dotenv_values(path)
-                value = env_vars.get(var_name)
-
-                if value:
-                    results.append((description, value, path))
-            except Exception:
-                pass
-
-    return results
+    return get_resolver(skill).find_all(var_name)
 
 
 def show_hierarchy(skill: Optional[str] = None):
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared search daemon for skill knowledge bases (ui-ux-pro-max, ai-artist,
+threejs). Keeps a skill's BM25 indexes warm in memory and answers JSON
+requests over a Unix domain socket.
+
+Request:  {"fn": "search", "args": ["glassmorphism", "style", 3], "kwargs": {}}
+Response: {"ok": true, "result": {...}}  (one JSON line each way per connection)
+
+The socket lives in a directory only the current user can reach:
+$XDG_RUNTIME_DIR when set, else a 0700 directory under the temp dir. The
+client refuses sockets owned by another user (or in a directory where one
+could swap them), since their results would be fed straight into the
+agent's prompt.
+
+Usage (in a skill's search_daemon.py):
+    from skill_search_daemon import SearchDaemon
+
+    daemon = SearchDaemon("threejs", HANDLERS, warm=warm_indexes,
+                          env_var="THREEJS_SEARCH_SOCKET")
+    daemon.serve()                           # python search.py --serve
+    daemon.call("search", "orbit controls")  # daemon, or in-process fallback
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+CLIENT_TIMEOUT = 5.0
+SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def _is_private_dir(path):
+    """True if path is a real directory owned by us that nobody else can enter"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid()
+            and not st.st_mode & 0o077)
+
+
+def _is_own_socket(path):
+    """True if path is our socket, in a directory nobody else can swap it out of"""
+    try:
+        st = os.lstat(path)
+        parent = os.stat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        return False
+    # Our/root's non-writable-by-others directory, or a sticky one like /tmp
+    return (parent.st_uid in (0, os.getuid()) and not parent.st_mode & 0o022) or \
+        bool(parent.st_mode & stat.S_ISVTX)
+
+
+def _private_tmp_dir():
+    return Path(tempfile.gettempdir()) / f"skill-search-{os.getuid() if SUPPORTED else 0}"
+
+
+def default_socket_path(name, env_var=None):
+    """Socket path for a skill: $<env_var>, else a per-user private directory"""
+    override = os.environ.get(env_var) if env_var else None
+    if override:
+        return Path(override)
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and SUPPORTED and _is_private_dir(runtime_dir):
+        return Path(runtime_dir) / f"{name}-search.sock"
+    return _private_tmp_dir() / f"{name}-search.sock"
+
+
+# ============ SERVER ============
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON response line out"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            handler = self.server.handlers[request["fn"]]
+            result = handler(*request.get("args", []), **request.get("kwargs", {}))
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SearchDaemon:
+    """Server and client for one skill's search functions"""
+
+    def __init__(self, name, handlers, warm=None, env_var=None, title=None, socket_path=None):
+        self.name = name
+        self.title = title or name
+        self.handlers = {"ping": lambda: "pong", **handlers}
+        self.warm = warm
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path(name, env_var)
+        self._disabled = False
+
+    def serve(self):
+        """Warm all indexes and serve requests until interrupted"""
+        if not SUPPORTED:
+            print("Error: Unix domain sockets are not supported on this platform", file=sys.stderr)
+            return 1
+
+        socket_path = self.socket_path
+        if socket_path.parent == _private_tmp_dir():
+            try:
+                socket_path.parent.mkdir(mode=0o700, exist_ok=True)
+            except OSError as e:
+                print(f"Error: cannot create {socket_path.parent}: {e}", file=sys.stderr)
+                return 1
+            if not _is_private_dir(socket_path.parent):
+                print(f"Error: {socket_path.parent} is not a private directory owned by you",
+                      file=sys.stderr)
+                return 1
+
+        if os.path.lexists(socket_path):
+            if not _is_own_socket(socket_path):
+                print(f"Error: {socket_path} exists but is not a socket you own "
+                      f"in a safe directory; remove it or pick another path", file=sys.stderr)
+                return 1
+            if self._request({"fn": "ping"}):
+                print(f"Search daemon already running on {socket_path}", file=sys.stderr)
+                return 1
+            socket_path.unlink()  # Stale socket from a killed daemon
+
+        if self.warm:
+            self.warm()
+        server = _Server(str(socket_path), _RequestHandler)
+        server.handlers = self.handlers
+        os.chmod(socket_path, 0o600)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"{self.title} search daemon listening on {socket_path}", file=sys.stderr)
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            socket_path.unlink(missing_ok=True)
+        return 0
+
+    # ============ CLIENT ============
+    def _request(self, payload):
+        """Send one request to the daemon; None if it isn't reachable.
+
+        A timeout means the daemon is hung: stop using it for the rest of
+        this process instead of paying CLIENT_TIMEOUT on every call.
+        """
+        if self._disabled or not SUPPORTED or not _is_own_socket(self.socket_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(CLIENT_TIMEOUT)
+                sock.connect(str(self.socket_path))
+                sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as f:
+                    return json.loads(f.readline())
+        except socket.timeout:
+            self._disabled = True
+            return None
+        except (OSError, ValueError):
+            return None
+
+    def call(self, fn, *args, **kwargs):
+        """Run a search function on the daemon, or in-process if it isn't running"""
+        response = self._request({"fn": fn, "args": args, "kwargs": kwargs})
+        if response and response.get("ok"):
+            return response["result"]
+        return self.handlers[fn](*args, **kwargs)
@@ -6,8 +6,13 @@ Tests all user scenarios and edge cases.
 Run: python test_ck_help.py
 """
 
+import importlib.util
+import io
+import os
 import subprocess
 import sys
+import tempfile
+from contextlib import redirect_stdout
 from pathlib import Path
 
 SCRIPT_PATH = Path(__file__).parent / "ck-help.py"
@@ -65,6 +70,163 @@ def test(name: str, args: str, expect_contains: list[str] = None, expect_type: s
             print(f"   {e}")
 
 
+def check(name: str, condition: bool, error: str = ""):
+    """Record an in-process check (for tests that don't go through the CLI)."""
+    global passed, failed, failures
+
+    if condition:
+        passed += 1
+        print(f"✅ {name}")
+    else:
+        failed += 1
+        failures.append((name, "", [error], ""))
+        print(f"❌ {name}")
+        if error:
+            print(f"   {error}")
+
+
+def load_ck_help():
+    """Import ck-help.py as a module (the dash keeps it out of normal imports)."""
+    spec = importlib.util.spec_from_file_location("ck_help", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_catalog_cache():
+    """Catalog is served from cache until the commands tree changes."""
+    ck = load_ck_help()
+    scans = []
+    discover = ck.discover_commands
+    ck.discover_commands = lambda *args: scans.append(args) or discover(*args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        commands_dir = Path(tmp) / "commands"
+        commands_dir.mkdir()
+        (commands_dir / "plan.md").write_text("---\ndescription: Plan things\n---\n")
+        cache_path = Path(tmp) / ".ck-help-cache.json"
+
+        first = ck.load_catalog(commands_dir, "", cache_path)
+        second = ck.load_catalog(commands_dir, "", cache_path)
+        check("9.1 Second load served from cache",
+              first == second and len(scans) == 1 and cache_path.exists(),
+              f"scans={len(scans)}")
+
+        (commands_dir / "cook.md").write_text("---\ndescription: Cook things\n---\n")
+        third = ck.load_catalog(commands_dir, "", cache_path)
+        names = [c["name"] for c in third["commands"].get("core", [])]
+        check("9.2 New command invalidates cache",
+              len(scans) == 2 and names == ["/cook", "/plan"], f"names={names}")
+
+        plan = commands_dir / "plan.md"
+        plan.write_text("---\ndescription: Plan better\n---\n")
+        stat = plan.stat()
+        os.utime(plan, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        fourth = ck.load_catalog(commands_dir, "", cache_path)
+        descriptions = [c["description"] for c in fourth["commands"]["core"]]
+        check("9.3 Edited command invalidates cache",
+              "Plan better" in descriptions, f"descriptions={descriptions}")
+
+        check("9.4 Prefix change invalidates cache",
+              ck.load_catalog(commands_dir, "ck:", cache_path)["commands"]["core"][0]["name"] == "/ck:cook")
+
+
+def test_compiled_matchers():
+    """Single-pass matchers give the same results as per-pattern regexes."""
+    import re
+
+    ck = load_ck_help()
+
+    def reference_synonyms(text):
+        result = text.lower()
+        for synonym, canonical in sorted(ck.SYNONYMS.items(), key=lambda x: -len(x[0])):
+            result = re.sub(r'\b' + re.escape(synonym) + r'\b', canonical, result, flags=re.IGNORECASE)
+        return result
+
+    samples = ["fix the CI pipeline", "ci/cd for my repo", "Auth db deps", "open a PR or MR",
+               "e2e specs", "alerts and alert", "github actions", "pipeline actions ci"]
+    mismatches = [t for t in samples if ck.expand_synonyms(t) != reference_synonyms(t)]
+    check("10.1 Synonym expansion matches sequential substitution", not mismatches,
+          f"mismatches={mismatches}")
+
+    text = "configure .ck.json then test coverage, not testing"
+    expected = {}
+    for keywords in ck.TASK_MAPPINGS.values():
+        for kw in keywords:
+            match = re.search(r'\b' + re.escape(kw) + r'\b', text)
+            if ' ' not in kw and match:
+                expected[kw] = match.start()
+    check("10.2 Keyword positions match per-keyword search",
+          ck.keyword_starts(text) == expected, f"got={ck.keyword_starts(text)}")
+
+
+def test_fuzzy_index():
+    """Bounded distance and the deletion index agree with the full computations."""
+    import itertools
+
+    ck = load_ck_help()
+
+    words = ["", "a", "ab", "abc", "cab", "abcd", "bcda", "kitten", "sitting", "test", "tset"]
+    wrong = [(a, b, k) for a, b in itertools.product(words, words) for k in range(4)
+             if ck.levenshtein_distance(a, b, k) != min(ck.levenshtein_distance(a, b), k + 1)]
+    check("11.1 Bounded Levenshtein matches full DP up to the limit", not wrong, f"wrong={wrong[:3]}")
+
+    terms = ["notifications", "worktree", "kanban", "test", "explain", "review", "plan", "log"]
+    index = ck.FuzzyIndex(terms)
+    queries = ["notifcations", "worktre", "kanbn", "tset", "explian", "revew", "pln", "lgo", "zzz"]
+    wrong = [q for q in queries if index.lookup(q) != {t for t in terms if ck.fuzzy_match(q, t)}]
+    check("11.2 Deletion index finds exactly the fuzzy_match terms", not wrong, f"wrong={wrong}")
+
+
+def test_ranked_search():
+    """Search results are ranked by relevance and the index is cached with the catalog."""
+    ck = load_ck_help()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        commands_dir = Path(tmp) / "commands"
+        commands_dir.mkdir()
+        for name, description in [
+            ("ask", "Answer questions about deploy scripts"),
+            ("deploy", "Deploy the app"),
+            ("deploy-preview", "Deploy a preview build of the app"),
+            ("journal", "Write a journal entry"),
+            ("ck-help", "ClaudeKit usage guide"),
+            ("plan", "Create an implementation plan"),
+            ("replan", "Revise an existing plan"),
+            ("redeploy", "Rebuild and ship the app again"),
+        ]:
+            (commands_dir / f"{name}.md").write_text(f"---\ndescription: {description}\n---\n")
+        cache_path = Path(tmp) / ".ck-help-cache.json"
+
+        data = ck.load_catalog(commands_dir, "", cache_path)
+        names = [cmd["name"] for cmd in ck.bm25_search(data, "deploy")]
+        check("12.1 Name matches outrank description-only matches",
+              names[:2] == ["/deploy", "/deploy-preview"] and names[-1] == "/ask", f"names={names}")
+
+        cached = ck.load_catalog(commands_dir, "", cache_path)
+        check("12.2 Search index is cached with the catalog",
+              "search_index" in cached and [c["name"] for c in ck.bm25_search(cached, "deploy")] == names)
+
+        check("12.3 Unrelated terms return nothing",
+              ck.bm25_search(data, "kubernetes") == [])
+
+        names = [cmd["name"] for cmd in ck.bm25_search(data, "ck:plan")]
+        check("12.4 Typed command prefix is ignored (no /ck-help match on 'ck')",
+              names[:1] == ["/plan"] and "/ck-help" not in names, f"names={names}")
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            ck.do_search(data, "deploy", "")
+        check("12.5 Match count includes partial-word matches",
+              "Found 4 matches (1 partial-word):" in out.getvalue(), out.getvalue())
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            ck.do_search(data, "eploy", "")
+        check("12.6 Partial-only query reports its matches in the total",
+              "Found 4 matches (4 partial-word):" in out.getvalue(), out.getvalue())
+
+
 def main():
     print("=" * 60)
     print("ck-help.py Comprehensive Test Suite")
@@ -397,6 +559,34 @@ def main():
         expect_contains=["AI Orchestration", "Workflow"]
     )
 
+    # =========================================
+    # CATEGORY 9: Catalog Cache
+    # =========================================
+    print("\n## Category 9: Catalog Cache\n")
+
+    test_catalog_cache()
+
+    # =========================================
+    # CATEGORY 10: Compiled Matchers
+    # =========================================
+    print("\n## Category 10: Compiled Matchers\n")
+
+    test_compiled_matchers()
+
+    # =========================================
+    # CATEGORY 11: Fuzzy Matching Index
+    # =========================================
+    print("\n## Category 11: Fuzzy Matching Index\n")
+
+    test_fuzzy_index()
+
+    # =========================================
+    # CATEGORY 12: Ranked Search
+    # =========================================
+    print("\n## Category 12: Ranked Search\n")
+
+    test_ranked_search()
+
     # =========================================
     # SUMMARY
     # =========================================
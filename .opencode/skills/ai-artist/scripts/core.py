@@ -5,14 +5,21 @@ AI Artist Core - BM25 search engine for prompt engineering resources
 """
 
 import csv
+import heapq
+import importlib.util
 import re
 from pathlib import Path
 from math import log
 from collections import defaultdict
 
+# NumPy is optional and only imported on first vectorized use, so CLI startup stays light
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+VECTORIZE_MIN_DOCS = 50  # Corpus size above which score_batch() uses NumPy
 
 CSV_CONFIG = {
     "use-case": {
@@ -54,18 +61,27 @@ CSV_CONFIG = {
 
 
 # ============ BM25 IMPLEMENTATION ============
+def _numpy():
+    """Import NumPy on demand (only called when NUMPY_AVAILABLE)"""
+    global np
+    if np is None:
+        import numpy as np
+    return np
+
+
 class BM25:
     """BM25 ranking algorithm for text search"""
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.doc_freqs = {}
+        self.postings = {}
         self.N = 0
+        self._matrix = None
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
@@ -73,47 +89,101 @@ class BM25:
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index (postings, doc lengths, IDF) from documents"""
+        corpus = [self.tokenize(doc) for doc in documents]
+        self._matrix = None
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            term_freqs = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self.postings = dict(postings)
+        self.doc_freqs = {word: len(docs) for word, docs in self.postings.items()}
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
+    def score(self, query, top_k=None):
+        """Score documents containing a query term, best first (ties by row order)"""
         query_tokens = self.tokenize(query)
-        scores = []
+        scores = defaultdict(float)
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
+        # Only walk the postings of query terms; untouched documents score 0
+        for token in query_tokens:
+            if token in self.idf:
+                idf = self.idf[token]
+                for idx, tf in self.postings[token]:
                     numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+                    denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+                    scores[idx] += idf * numerator / denominator
+
+        rank_key = lambda x: (x[1], -x[0])
+        if top_k is None:
+            return sorted(scores.items(), key=rank_key, reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=rank_key)
+
+    def score_batch(self, queries, top_k=None):
+        """Score several queries at once; same rankings as score() for each query.
+
+        With NumPy and a large enough corpus, each query is scored as a dense
+        row accumulated from columns of the sparse document-term weight matrix.
+        Columns are added in query-token order, so the float sums (and therefore
+        ties and rankings) are bit-identical to the pure-Python path.
+        """
+        if not NUMPY_AVAILABLE or self.N < VECTORIZE_MIN_DOCS:
+            return [self.score(query, top_k) for query in queries]
+
+        np = _numpy()
+        vocab, indptr, indices, weights = self._weight_matrix()
+        scores = np.zeros((len(queries), self.N))
+        for row, query in enumerate(queries):
+            for token in self.tokenize(query):
+                col = vocab.get(token)
+                if col is not None:
+                    start, end = indptr[col], indptr[col + 1]
+                    scores[row, indices[start:end]] += weights[start:end]
+
+        rankings = []
+        for row_scores in scores:
+            hits = np.flatnonzero(row_scores)
+            order = hits[np.lexsort((hits, -row_scores[hits]))]
+            if top_k is not None:
+                order = order[:top_k]
+            rankings.append([(int(idx), float(row_scores[idx])) for idx in order])
+        return rankings
+
+    def _weight_matrix(self):
+        """Sparse (CSC) document-term matrix of precomputed BM25 term weights"""
+        if self._matrix is None:
+            np = _numpy()
+            vocab = {}
+            indptr = [0]
+            indices = []
+            tfs = []
+            for col, (word, docs) in enumerate(self.postings.items()):
+                vocab[word] = col
+                for idx, tf in docs:
+                    indices.append(idx)
+                    tfs.append(tf)
+                indptr.append(len(indices))
+
+            indices = np.array(indices, dtype=np.int64)
+            tf = np.array(tfs, dtype=np.float64)
+            idf = np.repeat(np.array([self.idf[word] for word in vocab], dtype=np.float64), np.diff(indptr))
+            doc_len = np.array(self.doc_lengths, dtype=np.float64)[indices]
+            # Same operation order as score() so every weight is bit-identical
+            numerator = tf * (self.k1 + 1)
+            denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+            self._matrix = (vocab, indptr, indices, idf * numerator / denominator)
+        return self._matrix
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -123,31 +193,55 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+# In-process cache: (csv path, search cols) -> (file signature, rows, BM25)
+_INDEXES = {}
+
+
+def _get_index(filepath, search_cols):
+    """Load (rows, BM25) for a CSV, rebuilding only when the file changed"""
+    key = (str(filepath), tuple(search_cols))
+    stat = filepath.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _INDEXES.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
 
     data = _load_csv(filepath)
 
     # Build documents from search columns
     documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
     bm25 = BM25()
     bm25.fit(documents)
-    ranked = bm25.score(query)
 
-    # Get top results with score > 0
+    _INDEXES[key] = (signature, data, bm25)
+    return data, bm25
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25"""
+    if not filepath.exists():
+        return []
+
+    data, bm25 = _get_index(filepath, search_cols)
+
+    # Top results (only documents sharing a query term have score > 0)
     results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    for idx, _ in bm25.score_batch([query], max_results)[0]:
+        row = data[idx]
+        results.append({col: row.get(col, "") for col in output_cols if col in row})
 
     return results
 
 
+def warm_indexes():
+    """Load every domain index into memory (used by the search daemon)"""
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _get_index(filepath, config["search_cols"])
+
+
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
     query_lower = query.lower()
@@ -4,6 +4,7 @@
 AI Artist Search - BM25 search engine for prompt engineering resources
 Usage: python search.py "<query>" [--domain <domain>] [--max-results 3]
        python search.py "<query>" --prompt-system [--platform <platform>]
+       python search.py --serve    (keep indexes warm; later calls use the daemon)
 
 Domains: use-case, style, platform, technique, lighting
 Platforms: midjourney, dalle, sd, flux, nano-banana
@@ -11,7 +12,8 @@ Platforms: midjourney, dalle, sd, flux, nano-banana
 
 import argparse
 import sys
-from core import CSV_CONFIG, MAX_RESULTS, search, search_all_domains
+from core import CSV_CONFIG, MAX_RESULTS
+from search_daemon import call, serve
 
 # Fix Windows cp1252 encoding: hardcoded emojis can't encode on Windows.
 # Reconfigure stdout to UTF-8 with replacement (Python 3.7+).
@@ -52,10 +54,10 @@ def generate_prompt_system(query, platform=None):
     output.append("")
 
     # Search relevant domains
-    use_case = search(query, "use-case", 1)
-    style = search(query, "style", 2)
-    lighting = search(query, "lighting", 1)
-    technique = search(query, "technique", 2)
+    use_case = call("search", query, "use-case", 1)
+    style = call("search", query, "style", 2)
+    lighting = call("search", query, "lighting", 1)
+    technique = call("search", query, "technique", 2)
 
     # Use case / Template
     if use_case.get("count", 0) > 0:
@@ -98,7 +100,7 @@ def generate_prompt_system(query, platform=None):
 
     # Platform-specific tips
     if platform:
-        plat = search(platform, "platform", 1)
+        plat = call("search", platform, "platform", 1)
         if plat.get("count", 0) > 0:
             p = plat["results"][0]
             output.append(f"### 🖥️ {p.get('Platform', '')} Tips")
@@ -112,7 +114,7 @@ def generate_prompt_system(query, platform=None):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="AI Artist Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
@@ -120,16 +122,23 @@ if __name__ == "__main__":
     parser.add_argument("--prompt-system", "-ps", action="store_true", help="Generate comprehensive prompt system")
     parser.add_argument("--platform", "-p", type=str, default=None, help="Target platform for prompt system")
     parser.add_argument("--all", "-a", action="store_true", help="Search all domains")
+    # Search daemon
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (keeps indexes warm in memory)")
 
     args = parser.parse_args()
 
+    if args.serve:
+        sys.exit(serve())
+    if args.query is None:
+        parser.error("the following arguments are required: query")
+
     # Prompt system generation
     if args.prompt_system:
         result = generate_prompt_system(args.query, args.platform)
         print(result)
     # Search all domains
     elif args.all:
-        results = search_all_domains(args.query, args.max_results)
+        results = call("search_all_domains", args.query, args.max_results)
         if args.json:
             import json
             print(json.dumps(results, indent=2, ensure_ascii=False))
@@ -139,7 +148,7 @@ if __name__ == "__main__":
                 print("---\n")
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = call("search", args.query, args.domain, args.max_results)
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
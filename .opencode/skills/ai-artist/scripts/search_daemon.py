@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI Artist Search Daemon - keeps every BM25 index warm in memory and
+answers JSON requests over a Unix domain socket (server and client live in
+.opencode/scripts/skill_search_daemon.py).
+
+Start:    python search.py --serve
+Request:  {"fn": "search", "args": ["cyberpunk portrait", "style", 3], "kwargs": {}}
+Response: {"ok": true, "result": {...}}  (one JSON line each way per connection)
+
+search.py calls through call(), which uses the daemon when it is running and
+falls back to in-process search when it isn't.
+"""
+
+import sys
+from pathlib import Path
+
+from core import search, search_all_domains, warm_indexes
+
+# Shared daemon plumbing lives in .opencode/scripts (works for both local and global installs)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "scripts"))
+try:
+    from skill_search_daemon import SearchDaemon
+    SEARCH_DAEMON_AVAILABLE = True
+except ImportError:
+    SEARCH_DAEMON_AVAILABLE = False
+
+# ============ CONFIGURATION ============
+HANDLERS = {
+    "search": search,
+    "search_all_domains": search_all_domains
+}
+
+
+if SEARCH_DAEMON_AVAILABLE:
+    DAEMON = SearchDaemon("ai-artist", HANDLERS, warm=warm_indexes,
+                          env_var="AI_ARTIST_SEARCH_SOCKET", title="AI Artist")
+    serve, call = DAEMON.serve, DAEMON.call
+else:
+    def serve():
+        print("Error: search daemon needs .opencode/scripts/skill_search_daemon.py", file=sys.stderr)
+        return 1
+
+    def call(fn, *args, **kwargs):
+        """Run a search function in-process (no daemon support installed)"""
+        return HANDLERS[fn](*args, **kwargs)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long Gemini batch runs.
+
+Every finished file is appended to a JSONL journal as soon as its result is
+known, so a batch that dies halfway loses nothing: re-running with --resume
+skips files that already succeeded, and the final report is streamed from
+the journal instead of being held in memory.
+
+Format (one JSON object per line):
+    {"journal": 1, "task": "...", "model": "...", "prompt": "..."}   header
+    {"file": "photo.jpg", "result": {...}}                          one per finished file
+
+A file may appear more than once (e.g. an error, then a success after
+--resume); the last entry wins.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+JOURNAL_VERSION = 1
+
+
+class BatchJournal:
+    """JSONL record of finished files for one batch run.
+
+    Args:
+        path: Journal file
+        run_info: Parameters that must match for a resume to be valid
+                  (task, model, prompt)
+    """
+
+    def __init__(self, path: str, run_info: Dict[str, Any]):
+        self.path = Path(path)
+        self.run_info = dict(run_info)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self, resume: bool = False) -> Set[str]:
+        """Start journaling; return the files that already succeeded.
+
+        Without resume (or without an existing journal) the journal starts over.
+        Raises ValueError when resuming a journal written for a different run.
+        """
+        completed: Set[str] = set()
+        if resume and self.path.exists():
+            header, entries = self._read()
+            if header is not None and any(header.get(k) != v for k, v in self.run_info.items()):
+                raise ValueError(
+                    f"Journal {self.path} was written for a different task/model/prompt; "
+                    "remove it or run without --resume"
+                )
+            completed = {f for f, (_, status) in entries.items() if status == 'success'}
+
+            # A crash can leave half a line behind; don't glue the next entry onto it
+            torn = False
+            with open(self.path, 'rb') as f:
+                if f.seek(0, 2) > 0:
+                    f.seek(-1, 2)
+                    torn = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if torn:
+                self._file.write('\n')
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({'journal': JOURNAL_VERSION, **self.run_info})
+        return completed
+
+    def record(self, file_key: str, result: Dict[str, Any]) -> None:
+        """Append one finished file (thread-safe, flushed immediately)."""
+        with self._lock:
+            self._write({'file': file_key, 'result': result})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def iter_results(self, file_keys: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Yield the latest result of each file, in the given order.
+
+        Only byte offsets are kept in memory; each result is read back from the
+        journal when it is yielded. Files without an entry are skipped.
+        """
+        _, entries = self._read()
+        with open(self.path, 'rb') as f:
+            for key in file_keys:
+                if key in entries:
+                    f.seek(entries[key][0])
+                    yield json.loads(f.readline())['result']
+
+    def results(self, file_keys: Iterable[str]) -> 'JournalResults':
+        """Sized, re-iterable view of iter_results(file_keys)."""
+        return JournalResults(self, file_keys)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _read(self):
+        """Return (header, {file: (offset, status)}), skipping damaged lines."""
+        header: Optional[Dict[str, Any]] = None
+        entries: Dict[str, tuple] = {}
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict):
+                    if 'journal' in entry:
+                        header = entry
+                    elif 'file' in entry and isinstance(entry.get('result'), dict):
+                        entries[entry['file']] = (offset, entry['result'].get('status'))
+                offset += len(line)
+        return header, entries
+
+
+class JournalResults:
+    """Results of a journaled run, read back from disk on every iteration.
+
+    Supports len() and repeated iteration, so a caller can print, count and
+    save a large batch without holding every result in memory.
+    """
+
+    def __init__(self, journal: BatchJournal, file_keys: Iterable[str]):
+        self.journal = journal
+        self.file_keys = list(file_keys)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.journal.iter_results(self.file_keys)
+
+    def __len__(self) -> int:
+        _, entries = self.journal._read()
+        return sum(1 for key in self.file_keys if key in entries)
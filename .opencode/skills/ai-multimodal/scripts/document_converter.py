@@ -36,6 +36,9 @@ try:
 except ImportError:
     load_dotenv = None
 
+from media_cache import ResultCache, file_sha256, get_upload_cache
+from payload_budget import get_inline_budget
+
 
 def find_api_key() -> Optional[str]:
     """Find Gemini API key using correct priority order.
@@ -126,8 +129,24 @@ def get_mime_type(file_path: str) -> str:
     return mime_types.get(ext, 'application/octet-stream')
 
 
-def upload_file(client: genai.Client, file_path: str, verbose: bool = False) -> Any:
-    """Upload file to Gemini File API."""
+def upload_file(client: genai.Client, file_path: str, verbose: bool = False,
+                use_cache: bool = True) -> Any:
+    """Upload file to Gemini File API.
+
+    With use_cache, content already uploaded (same SHA-256) and not yet
+    expired is reused instead of being uploaded and processed again.
+    """
+    digest = None
+    if use_cache:
+        try:
+            digest = file_sha256(file_path)
+        except OSError:
+            digest = None
+        if digest:
+            cached = get_upload_cache().reuse(client, digest, verbose)
+            if cached is not None:
+                return cached
+
     if verbose:
         print(f"Uploading {file_path}...")
 
@@ -152,6 +171,9 @@ def upload_file(client: genai.Client, file_path: str, verbose: bool = False) ->
     if verbose:
         print(f"  Uploaded: {myfile.name}")
 
+    if digest:
+        get_upload_cache().store(digest, myfile)
+
     return myfile
 
 
@@ -161,11 +183,32 @@ def convert_to_markdown(
     model: str = 'gemini-2.5-flash',
     custom_prompt: Optional[str] = None,
     verbose: bool = False,
-    max_retries: int = 3
+    max_retries: int = 3,
+    use_cache: bool = True,
+    result_cache: Optional[ResultCache] = None
 ) -> Dict[str, Any]:
     """Convert a document to markdown using Gemini."""
 
+    cache_key = None
+    if result_cache is not None:
+        try:
+            cache_key = ResultCache.make_key(
+                file_sha256=file_sha256(str(file_path)),
+                prompt=custom_prompt,
+                model=model,
+                task='markdown'
+            )
+        except OSError:
+            cache_key = None  # Unreadable file; let the request report the error
+        cached = result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            if verbose:
+                print(f"  Using cached result for: {file_path}")
+            return dict(cached, file=str(file_path))
+
+    inline_budget = get_inline_budget()
     for attempt in range(max_retries):
+        inline_bytes = 0
         try:
             file_path_obj = Path(file_path)
             file_size = file_path_obj.stat().st_size
@@ -189,9 +232,11 @@ Output only the markdown content without any preamble or explanation."""
 
             # Upload or inline the file
             if use_file_api:
-                myfile = upload_file(client, str(file_path), verbose)
+                myfile = upload_file(client, str(file_path), verbose, use_cache=use_cache)
                 content = [prompt, myfile]
             else:
+                # Waits while other in-flight payloads fill the memory budget
+                inline_bytes = inline_budget.acquire(file_size)
                 with open(file_path, 'rb') as f:
                     file_bytes = f.read()
 
@@ -206,9 +251,15 @@ Output only the markdown content without any preamble or explanation."""
                 model=model,
                 contents=content
             )
+            content = file_bytes = None
+            inline_budget.release(inline_bytes)
+            inline_bytes = 0
 
             markdown_content = response.text if hasattr(response, 'text') else ''
 
+            if cache_key:
+                result_cache.put(cache_key, {'status': 'success', 'markdown': markdown_content})
+
             return {
                 'file': str(file_path),
                 'status': 'success',
@@ -216,6 +267,7 @@ Output only the markdown content without any preamble or explanation."""
             }
 
         except Exception as e:
+            inline_budget.release(inline_bytes)
             if attempt == max_retries - 1:
                 return {
                     'file': str(file_path),
@@ -236,9 +288,15 @@ def batch_convert(
     auto_name: bool = False,
     model: str = 'gemini-2.5-flash',
     custom_prompt: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    use_cache: bool = True,
+    cache_results: bool = False
 ) -> List[Dict[str, Any]]:
-    """Batch convert multiple files to markdown."""
+    """Batch convert multiple files to markdown.
+
+    With cache_results, documents already converted with the same model and
+    prompt are served from the local result cache (disabled by use_cache=False).
+    """
 
     api_key = find_api_key()
     if not api_key:
@@ -249,6 +307,7 @@ def batch_convert(
 
     client = genai.Client(api_key=api_key)
     results = []
+    result_cache = ResultCache() if cache_results and use_cache else None
 
     # Determine output path
     if not output_file:
@@ -276,7 +335,9 @@ def batch_convert(
             file_path=file_path,
             model=model,
             custom_prompt=custom_prompt,
-            verbose=verbose
+            verbose=verbose,
+            use_cache=use_cache,
+            result_cache=result_cache
         )
 
         results.append(result)
@@ -339,6 +400,9 @@ Examples:
   # Batch convert directory
   %(prog)s --input ./documents/*.pdf --verbose
 
+  # Re-run after adding documents; unchanged ones come from the result cache
+  %(prog)s --input ./documents/*.pdf --cache-results
+
 Supported formats:
   - PDF documents (up to 1,000 pages)
   - Images (JPEG, PNG, WEBP, HEIC)
@@ -359,6 +423,10 @@ Default output: <project-root>/docs/assets/document-extraction.md
                        help='Gemini model to use (default: gemini-2.5-flash)')
     parser.add_argument('--prompt', '-p',
                        help='Custom prompt for conversion')
+    parser.add_argument('--cache-results', action='store_true',
+                       help='Reuse stored conversions of unchanged documents (size-bounded LRU on disk)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable all caching: re-upload files and ignore --cache-results')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
 
@@ -387,7 +455,9 @@ Default output: <project-root>/docs/assets/document-extraction.md
         auto_name=args.auto_name,
         model=args.model,
         custom_prompt=args.prompt,
-        verbose=args.verbose
+        verbose=args.verbose,
+        use_cache=not args.no_cache,
+        cache_results=args.cache_results
     )
 
 
@@ -16,10 +16,13 @@ Supports all Gemini modalities:
 import argparse
 import json
 import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import csv
 import shutil
 
@@ -27,7 +30,7 @@ import shutil
 CLAUDE_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(CLAUDE_ROOT / 'scripts'))
 try:
-    from resolve_env import resolve_env
+    from resolve_env import get_resolver
     CENTRALIZED_RESOLVER_AVAILABLE = True
 except ImportError:
     # Fallback if centralized resolver not available
@@ -49,6 +52,14 @@ except ImportError:
     is_rate_limit_error = None
     find_all_api_keys = None
 
+from batch_journal import BatchJournal
+from key_scheduler import KeyScheduler
+from media_cache import ResultCache, file_sha256, get_upload_cache
+from media_optimizer import normalize_for_task
+from payload_budget import get_inline_budget
+from veo_operations import (MAX_IN_FLIGHT, VeoJob, VeoOperationManager, build_veo_request,
+                            save_veo_video, video_output_dir)
+
 try:
     from google import genai
     from google.genai import types
@@ -71,6 +82,9 @@ IMAGEN_MODELS = {
 }
 # Video models have no fallback - Veo always requires billing
 
+# Parallel ffmpeg/Pillow jobs for --normalize (ffmpeg is multithreaded itself)
+NORMALIZE_WORKERS = 2
+
 
 def find_api_key() -> Optional[str]:
     """Find Gemini API key using centralized resolver or fallback.
@@ -89,7 +103,7 @@ def find_api_key() -> Optional[str]:
     """
     if CENTRALIZED_RESOLVER_AVAILABLE:
         # Use centralized resolver (recommended)
-        return resolve_env('GEMINI_API_KEY', skill='ai-multimodal')
+        return get_resolver('ai-multimodal').resolve('GEMINI_API_KEY')
 
     # Fallback: Local resolution (legacy)
     api_key = os.getenv('GEMINI_API_KEY')
@@ -119,6 +133,28 @@ def find_api_key() -> Optional[str]:
     return None
 
 
+def find_api_keys() -> List[str]:
+    """All configured Gemini keys: GEMINI_API_KEY, then GEMINI_API_KEY_2, _3, ...
+
+    Looks every key up in one pass over the .env hierarchy (same priority
+    order as find_api_key); duplicates are dropped.
+    """
+    if not CENTRALIZED_RESOLVER_AVAILABLE:
+        api_key = find_api_key()
+        return [api_key] if api_key else []
+
+    resolver = get_resolver('ai-multimodal')
+    numbered = sorted((int(m.group(1)), name) for name in resolver.names()
+                      for m in [re.fullmatch(r'GEMINI_API_KEY_(\d+)', name)] if m)
+    values = resolver.resolve_many(['GEMINI_API_KEY'] + [name for _, name in numbered])
+
+    keys = []
+    for value in values.values():
+        if value and value not in keys:
+            keys.append(value)
+    return keys
+
+
 def get_default_model(task: str) -> str:
     """Get default model for task from environment or fallback.
 
@@ -258,8 +294,50 @@ def get_mime_type(file_path: str) -> str:
     return mime_types.get(ext, 'application/octet-stream')
 
 
-def upload_file(client: genai.Client, file_path: str, verbose: bool = False) -> Any:
-    """Upload file to Gemini File API."""
+def estimate_request_tokens(file_path: Optional[str], prompt: str) -> int:
+    """Rough input-token estimate for TPM scheduling (corrected after the call).
+
+    Uses Gemini's published rates: ~258 tokens per image, ~32 tokens per
+    second of audio and ~1 token per 4 bytes of text. Audio/video duration
+    is approximated from file size.
+    """
+    tokens = len(prompt or '') // 4 + 1
+    if not file_path:
+        return tokens
+
+    mime_type = get_mime_type(str(file_path))
+    size = Path(file_path).stat().st_size
+    if mime_type.startswith('image/'):
+        tokens += 258
+    elif mime_type.startswith('audio/'):
+        tokens += 32 * max(1, size // 16000)  # ~128 kbps
+    elif mime_type.startswith('video/'):
+        tokens += 263 * max(1, size // 250000)  # ~2 Mbps
+    elif mime_type == 'application/pdf':
+        tokens += 258 * max(1, size // 100000)  # ~100 KB per page
+    else:
+        tokens += size // 4
+    return tokens
+
+
+def upload_file(client: genai.Client, file_path: str, verbose: bool = False,
+                use_cache: bool = True) -> Any:
+    """Upload file to Gemini File API.
+
+    With use_cache, content already uploaded (same SHA-256) and not yet
+    expired is reused instead of being uploaded and processed again.
+    """
+    digest = None
+    if use_cache:
+        try:
+            digest = file_sha256(file_path)
+        except OSError:
+            digest = None
+        if digest:
+            cached = get_upload_cache().reuse(client, digest, verbose)
+            if cached is not None:
+                return cached
+
     if verbose:
         print(f"Uploading {file_path}...")
 
@@ -286,6 +364,9 @@ def upload_file(client: genai.Client, file_path: str, verbose: bool = False) ->
     if verbose:
         print(f"  Uploaded: {myfile.name}")
 
+    if digest:
+        get_upload_cache().store(digest, myfile)
+
     return myfile
 
 
@@ -436,50 +517,18 @@ def generate_video_veo(
     - First reference image becomes the opening frame (image parameter)
     - Second reference image becomes the closing frame (last_frame config)
     - Model interpolates between them to create smooth video
+
+    For many videos at once use generate_videos_veo().
     """
     try:
-        # Build config with snake_case for Python SDK
-        config_params = {
-            'aspect_ratio': aspect_ratio,
-            'resolution': resolution
-        }
-
-        # Prepare first frame and last frame images
-        first_frame = None
-        last_frame = None
-
-        if reference_images:
-            import mimetypes
-
-            def load_image(img_path_str: str) -> types.Image:
-                """Load image file as types.Image with bytes and mime type."""
-                img_path = Path(img_path_str)
-                image_bytes = img_path.read_bytes()
-                mime_type, _ = mimetypes.guess_type(str(img_path))
-                if not mime_type:
-                    mime_type = 'image/png'
-                return types.Image(
-                    image_bytes=image_bytes,
-                    mime_type=mime_type
-                )
-
-            # First image = opening frame
-            if len(reference_images) >= 1:
-                first_frame = load_image(reference_images[0])
-
-            # Second image = closing frame (last_frame in config)
-            if len(reference_images) >= 2:
-                last_frame = load_image(reference_images[1])
-                config_params['last_frame'] = last_frame
-
-        gen_config = types.GenerateVideosConfig(**config_params)
+        request = build_veo_request(prompt, model, resolution, aspect_ratio, reference_images)
 
         if verbose:
             print(f"  Generating video with Veo: {model}")
             print(f"  Config: {resolution}, {aspect_ratio}")
-            if first_frame:
+            if request['image']:
                 print(f"  First frame: provided")
-            if last_frame:
+            if reference_images and len(reference_images) >= 2:
                 print(f"  Last frame: provided (interpolation mode)")
 
         start = time.time()
@@ -488,12 +537,7 @@ def generate_video_veo(
             print(f"  Starting video generation (this may take 11s-6min)...")
 
         # Call generate_videos with image parameter for first frame
-        operation = client.models.generate_videos(
-            model=model,
-            prompt=prompt,
-            image=first_frame,  # First frame as opening image
-            config=gen_config
-        )
+        operation = client.models.generate_videos(**request)
 
         # Poll operation until complete
         poll_count = 0
@@ -507,28 +551,9 @@ def generate_video_veo(
 
         duration = time.time() - start
 
-        # Access generated video from operation response
-        generated_video = operation.response.generated_videos[0]
-
-        # Download the video file first
-        client.files.download(file=generated_video.video)
-
-        # Save video
-        script_dir = Path(__file__).parent
-        project_root = script_dir
-        for parent in [script_dir] + list(script_dir.parents):
-            if (parent / '.git').exists() or (parent / '.claude').exists():
-                project_root = parent
-                break
-
-        output_dir = project_root / 'docs' / 'assets'
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / f"veo_generated_{int(time.time())}.mp4"
-
-        # Now save to file
-        generated_video.video.save(str(output_file))
-
-        file_size = output_file.stat().st_size / (1024 * 1024)  # MB
+        # Download and save the generated video
+        output_file = video_output_dir() / f"veo_generated_{int(time.time())}.mp4"
+        file_size = save_veo_video(client, operation, output_file)
 
         if verbose:
             print(f"  Generated in {duration:.1f}s")
@@ -554,6 +579,69 @@ def generate_video_veo(
         }
 
 
+def generate_videos_veo(
+    client,
+    prompts: List[str],
+    model: str,
+    resolution: str = '1080p',
+    aspect_ratio: str = '16:9',
+    reference_images: Optional[List[str]] = None,
+    max_in_flight: int = MAX_IN_FLIGHT,
+    verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """Generate one video per prompt with up to max_in_flight Veo jobs running at once.
+
+    Operations are polled from a single asyncio loop and each video is
+    downloaded as soon as it is ready (see veo_operations). Results keep the
+    prompt order.
+    """
+    jobs = [VeoJob(prompt=p, model=model, resolution=resolution,
+                   aspect_ratio=aspect_ratio, reference_images=reference_images)
+            for p in prompts]
+    if verbose:
+        print(f"  Generating {len(jobs)} videos with Veo: {model} ({max_in_flight} in flight)")
+    return VeoOperationManager(client, max_in_flight=max_in_flight, verbose=verbose).run(jobs)
+
+
+def lookup_cached_result(
+    result_cache: Optional[ResultCache],
+    file_path: Optional[str],
+    prompt: str,
+    model: str,
+    task: str,
+    format_output: str,
+    verbose: bool = False
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return (cache_key, cached result) for a request; either may be None.
+
+    Image generation is never cached, and an unreadable file gets no key so
+    the request itself reports the error.
+    """
+    if result_cache is None or not file_path or task == 'generate':
+        return None, None
+
+    # Key on what the request actually sends: csv/markdown/text output all make
+    # the same call, only json changes the response mime type
+    try:
+        cache_key = ResultCache.make_key(
+            file_sha256=file_sha256(str(file_path)),
+            prompt=prompt,
+            model=model,
+            task=task,
+            response_mime_type='application/json' if format_output == 'json' else None
+        )
+    except OSError:
+        return None, None
+
+    cached = result_cache.get(cache_key)
+    if cached is None:
+        return cache_key, None
+    if verbose:
+        print(f"  Using cached result for: {file_path}")
+    # Nothing was billed
+    return cache_key, dict(cached, file=str(file_path), total_tokens=0)
+
+
 def process_file(
     client: genai.Client,
     file_path: Optional[str],
@@ -564,16 +652,32 @@ def process_file(
     aspect_ratio: Optional[str] = None,
     image_size: Optional[str] = None,
     verbose: bool = False,
-    max_retries: int = 3
+    max_retries: int = 3,
+    retry_rate_limits: bool = True,
+    use_cache: bool = True,
+    result_cache: Optional[ResultCache] = None
 ) -> Dict[str, Any]:
     """Process a single file with retry logic.
 
     Args:
         image_size: Image size for Nano Banana models (1K, 2K, 4K). Must be uppercase K.
                     Note: Not all models support image_size - only pass when explicitly needed.
+        retry_rate_limits: Retry 429s here with backoff. Disable when a KeyScheduler
+                    moves the request to another key instead.
+        use_cache: Reuse File API uploads of identical content (see media_cache).
+        result_cache: Return a stored result for an identical request instead of
+                    calling the API, and store successful results. Image
+                    generation is never cached (its output is written to disk).
     """
 
+    cache_key, cached = lookup_cached_result(result_cache, file_path, prompt, model,
+                                             task, format_output, verbose)
+    if cached is not None:
+        return cached
+
+    inline_budget = get_inline_budget()
     for attempt in range(max_retries):
+        inline_bytes = 0
         try:
             # For generation tasks without input files
             if task == 'generate' and not file_path:
@@ -587,10 +691,11 @@ def process_file(
 
                 if use_file_api:
                     # Upload to File API
-                    myfile = upload_file(client, str(file_path), verbose)
+                    myfile = upload_file(client, str(file_path), verbose, use_cache=use_cache)
                     content = [prompt, myfile]
                 else:
-                    # Inline data
+                    # Inline data; waits while other workers' payloads fill the memory budget
+                    inline_bytes = inline_budget.acquire(file_size)
                     with open(file_path, 'rb') as f:
                         file_bytes = f.read()
 
@@ -626,6 +731,10 @@ def process_file(
                 contents=content,
                 config=config
             )
+            # Drop the payload and hand its budget to the next worker
+            content = file_bytes = None
+            inline_budget.release(inline_bytes)
+            inline_bytes = 0
 
             # Extract response
             result = {
@@ -633,6 +742,9 @@ def process_file(
                 'status': 'success',
                 'response': response.text if hasattr(response, 'text') else None
             }
+            total_tokens = getattr(getattr(response, 'usage_metadata', None), 'total_token_count', None)
+            if isinstance(total_tokens, int):
+                result['total_tokens'] = total_tokens
 
             # Handle image output
             if task == 'generate' and hasattr(response, 'candidates'):
@@ -662,9 +774,14 @@ def process_file(
                         if verbose:
                             print(f"  Saved image to: {output_file}")
 
+            if cache_key:
+                result_cache.put(cache_key, {k: v for k, v in result.items()
+                                             if k not in ('file', 'total_tokens')})
             return result
 
         except Exception as e:
+            inline_budget.release(inline_bytes)
+
             # Don't retry on billing/free tier errors - they won't resolve
             if _is_billing_error(e) or _is_free_tier_quota_error(e):
                 return {
@@ -680,7 +797,7 @@ def process_file(
                 is_rate_limit_error(e)
             )
 
-            if attempt == max_retries - 1:
+            if attempt == max_retries - 1 or (is_rate_limited and not retry_rate_limits):
                 return {
                     'file': str(file_path) if file_path else 'generated',
                     'status': 'error',
@@ -707,26 +824,68 @@ def batch_process(
     reference_images: Optional[List[str]] = None,
     output_file: Optional[str] = None,
     verbose: bool = False,
-    dry_run: bool = False
-) -> List[Dict[str, Any]]:
-    """Batch process multiple files with automatic key rotation."""
+    dry_run: bool = False,
+    concurrency: int = 1,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+    use_cache: bool = True,
+    cache_results: bool = False,
+    journal_file: Optional[str] = None,
+    resume: bool = False,
+    prompts: Optional[List[str]] = None,
+    veo_in_flight: int = MAX_IN_FLIGHT,
+    normalize: bool = False
+) -> Iterable[Dict[str, Any]]:
+    """Batch process multiple files with automatic key rotation.
+
+    Returns a list of results, or with journal_file a sized, re-iterable
+    view that reads them back from the journal (see BatchJournal.results).
+
+    Args:
+        concurrency: Number of files processed in parallel (worker threads).
+                     Results keep the input order; the key rotator is shared
+                     between workers.
+        rpm, tpm: Per-key requests/tokens per minute. When set, a KeyScheduler
+                  dispatches each file to a key with spare capacity instead of
+                  waiting for 429s.
+        use_cache: Reuse earlier File API uploads of identical content.
+                   False disables every cache, including cache_results.
+        cache_results: Reuse stored results of identical requests (same file
+                       content, prompt, model, task and parameters), so
+                       re-runs only bill files that have not succeeded yet.
+        journal_file: Append each file's result to this JSONL journal as soon
+                      as it finishes instead of keeping it in memory; the
+                      output file and returned results are read from it.
+        resume: Skip files that already succeeded in journal_file.
+        prompts: Several prompts for generate-video; one result is returned
+                 per prompt.
+        veo_in_flight: Veo jobs generating at once for `prompts`. Separate
+                       from `concurrency`, whose default of 1 would make
+                       them run one after another.
+        normalize: Shrink each input to what the task needs before sending it
+                   (see media_optimizer.normalize_for_task). Transcodes run on
+                   their own workers while ready files are already processed.
+    """
 
     # Initialize key rotator or fall back to single key
     rotator = None
     api_key = None
+    all_keys = []
 
     if KEY_ROTATION_AVAILABLE and find_all_api_keys:
         all_keys = find_all_api_keys()
-        if all_keys:
-            if len(all_keys) > 1:
-                rotator = KeyRotator(keys=all_keys, verbose=verbose)
-                api_key = rotator.get_key()
-                if verbose:
-                    print(f"✓ Key rotation enabled with {len(all_keys)} keys", file=sys.stderr)
-            else:
-                api_key = all_keys[0]
-                if verbose:
-                    print(f"✓ Using single API key: {api_key[:8]}...", file=sys.stderr)
+    elif CENTRALIZED_RESOLVER_AVAILABLE:
+        all_keys = find_api_keys()
+    if all_keys:
+        if len(all_keys) > 1 and KeyRotator:
+            rotator = KeyRotator(keys=all_keys, verbose=verbose)
+            api_key = rotator.get_key()
+            if verbose:
+                print(f"✓ Key rotation enabled with {len(all_keys)} keys", file=sys.stderr)
+        else:
+            api_key = all_keys[0]
+            if verbose:
+                print(f"✓ Using single API key: {api_key[:8]}...", file=sys.stderr)
 
     # Fallback to original single-key lookup
     if not api_key:
@@ -751,6 +910,11 @@ def batch_process(
         print(f"Model: {model}")
         print(f"Task: {task}")
         print(f"Prompt: {prompt}")
+        if prompts:
+            print(f"Prompts: {len(prompts)}")
+        print(f"Concurrency: {concurrency}")
+        if rpm or tpm:
+            print(f"Rate limits per key: {rpm or 'unlimited'} RPM, {tpm or 'unlimited'} TPM")
         if rotator:
             print(f"API keys available: {rotator.key_count}")
         return []
@@ -758,22 +922,39 @@ def batch_process(
     # Create client with current key
     client = genai.Client(api_key=api_key)
     results = []
-
-    def get_client_with_rotation(error: Optional[Exception] = None) -> Optional[genai.Client]:
-        """Get client, rotating key if rate limited."""
+    rotation_lock = threading.Lock()
+    result_cache = ResultCache() if cache_results and use_cache else None
+    journal = None
+
+    scheduler = None
+    if rpm or tpm:
+        scheduler = KeyScheduler(all_keys or [api_key], rpm=rpm, tpm=tpm, verbose=verbose)
+        scheduler_clients = {api_key: client}
+
+    def get_client_with_rotation(error: Optional[Exception] = None,
+                                 failed_key: Optional[str] = None) -> Optional[genai.Client]:
+        """Get client, rotating key if rate limited.
+
+        Safe to call from several workers: if failed_key is no longer the
+        current key, another worker already rotated and its client is reused
+        instead of burning the next key too.
+        """
         nonlocal client, api_key
 
-        if error and rotator and is_rate_limit_error and is_rate_limit_error(error):
-            # Try to rotate to next key
-            if rotator.mark_rate_limited(str(error)):
-                new_key = rotator.get_key()
-                if new_key:
-                    api_key = new_key
-                    client = genai.Client(api_key=api_key)
+        with rotation_lock:
+            if error and rotator and is_rate_limit_error and is_rate_limit_error(error):
+                if failed_key is not None and failed_key != api_key:
                     return client
-            # All keys exhausted
-            return None
-        return client
+                # Try to rotate to next key
+                if rotator.mark_rate_limited(str(error)):
+                    new_key = rotator.get_key()
+                    if new_key:
+                        api_key = new_key
+                        client = genai.Client(api_key=api_key)
+                        return client
+                # All keys exhausted
+                return None
+            return client
 
     # For generation tasks without input files, process once
     if task == 'generate' and not files:
@@ -846,40 +1027,99 @@ def batch_process(
         if verbose:
             print(f"\nGenerating video from prompt...")
 
-        result = generate_video_veo(
-            client=client,
-            prompt=prompt,
-            model=model,
-            resolution=resolution,
-            aspect_ratio=aspect_ratio or '16:9',
-            reference_images=reference_images,
-            verbose=verbose
-        )
+        if prompts and len(prompts) > 1:
+            video_results = generate_videos_veo(
+                client=client,
+                prompts=prompts,
+                model=model,
+                resolution=resolution,
+                aspect_ratio=aspect_ratio or '16:9',
+                reference_images=reference_images,
+                max_in_flight=veo_in_flight,
+                verbose=verbose
+            )
+        else:
+            video_results = [generate_video_veo(
+                client=client,
+                prompt=prompts[0] if prompts else prompt,
+                model=model,
+                resolution=resolution,
+                aspect_ratio=aspect_ratio or '16:9',
+                reference_images=reference_images,
+                verbose=verbose
+            )]
 
-        # Check for free tier error - video gen has NO free tier access
-        if result.get('status') == 'error':
-            error_str = result.get('error', '')
-            if _is_free_tier_quota_error(Exception(error_str)) or _is_billing_error(Exception(error_str)):
-                result['error'] = FREE_TIER_NO_ACCESS_MSG
+        for result in video_results:
+            # Check for free tier error - video gen has NO free tier access
+            if result.get('status') == 'error':
+                error_str = result.get('error', '')
+                if _is_free_tier_quota_error(Exception(error_str)) or _is_billing_error(Exception(error_str)):
+                    result['error'] = FREE_TIER_NO_ACCESS_MSG
 
-        results.append(result)
+            results.append(result)
 
-        if verbose:
-            status = result.get('status', 'unknown')
-            print(f"  Status: {status}")
+            if verbose:
+                status = result.get('status', 'unknown')
+                print(f"  Status: {status}")
     else:
         # Process input files with key rotation support
-        for i, file_path in enumerate(files, 1):
+        def process_with_scheduler(file_path: str) -> Dict[str, Any]:
+            """Send the file through whichever key has RPM/TPM capacity."""
+            # A cached result makes no request, so it must not wait for a slot
+            _, cached = lookup_cached_result(result_cache, file_path, prompt, model,
+                                             task, format_output, verbose)
+            if cached is not None:
+                return cached
+
+            estimated = estimate_request_tokens(file_path, prompt)
+            result = None
+            for _ in range(scheduler.key_count):
+                key = scheduler.acquire(estimated)
+                with rotation_lock:
+                    if key not in scheduler_clients:
+                        scheduler_clients[key] = genai.Client(api_key=key)
+                    key_client = scheduler_clients[key]
+
+                result = process_file(
+                    client=key_client,
+                    file_path=file_path,
+                    prompt=prompt,
+                    model=model,
+                    task=task,
+                    format_output=format_output,
+                    aspect_ratio=aspect_ratio,
+                    image_size=size,
+                    verbose=verbose,
+                    retry_rate_limits=False,
+                    use_cache=use_cache,
+                    result_cache=result_cache
+                )
+                scheduler.settle(key, estimated, result.get('total_tokens'))
+                if not result.get('rate_limited'):
+                    break
+                scheduler.penalize(key)
+            return result
+
+        def process_with_rotation(index: int, file_path: str) -> Dict[str, Any]:
             if verbose:
-                print(f"\n[{i}/{len(files)}] Processing: {file_path}")
+                print(f"\n[{index}/{len(files)}] Processing: {file_path}")
+
+            if scheduler:
+                result = process_with_scheduler(file_path)
+                if verbose:
+                    print(f"  [{index}/{len(files)}] Status: {result.get('status', 'unknown')}")
+                return result
 
             # Try processing with key rotation on rate limit
             max_rotation_attempts = rotator.key_count if rotator else 1
             result = None
 
             for rotation_attempt in range(max_rotation_attempts):
+                with rotation_lock:
+                    current_client, current_key = client, api_key
+
                 result = process_file(
-                    client=client,
+                    client=current_client,
                     file_path=file_path,
                     prompt=prompt,
                     model=model,
@@ -887,15 +1127,16 @@ def batch_process(
                     format_output=format_output,
                     aspect_ratio=aspect_ratio,
                     image_size=size,
-                    verbose=verbose
+                    verbose=verbose,
+                    use_cache=use_cache,
+                    result_cache=result_cache
                 )
 
                 # Check if rate limited and can rotate
                 if (result.get('rate_limited') and rotator and
                     rotation_attempt < max_rotation_attempts - 1):
-                    new_client = get_client_with_rotation(Exception(result.get('error', '')))
+                    new_client = get_client_with_rotation(Exception(result.get('error', '')), current_key)
                     if new_client:
-                        client = new_client
                         if verbose:
                             print(f"  Retrying with rotated key...")
                         continue
@@ -906,11 +1147,70 @@ def batch_process(
                         result['error'] = "All API keys exhausted (rate limited). Try again later."
                 break
 
-            results.append(result)
-
             if verbose:
                 status = result.get('status', 'unknown')
-                print(f"  Status: {status}")
+                print(f"  [{index}/{len(files)}] Status: {status}")
+
+            return result
+
+        file_keys = [str(Path(f)) for f in files]
+        completed = set()
+        if journal_file:
+            journal = BatchJournal(journal_file, {'task': task, 'model': model, 'prompt': prompt})
+            try:
+                completed = journal.open(resume=resume)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            if completed and verbose:
+                done = sum(1 for key in file_keys if key in completed)
+                print(f"Resuming: {done}/{len(files)} files already done", file=sys.stderr)
+
+        def process_and_record(index: int, file_path: str, send_path: str) -> Dict[str, Any]:
+            result = process_with_rotation(index, send_path)
+            if send_path != file_path:
+                result['file'] = str(Path(file_path))
+                result['normalized_file'] = send_path
+            if journal:
+                journal.record(str(Path(file_path)), result)
+                return None  # Kept only in the journal
+            return result
+
+        pending = [(i, f) for i, (f, key) in enumerate(zip(files, file_keys), 1) if key not in completed]
+
+        def prepared_inputs():
+            """Yield (index, file, file to send) as soon as each input is ready."""
+            if not normalize:
+                yield from ((i, f, f) for i, f in pending)
+                return
+            with ThreadPoolExecutor(max_workers=NORMALIZE_WORKERS) as prep:
+                futures = {prep.submit(normalize_for_task, f, task, verbose=verbose): (i, f)
+                           for i, f in pending}
+                for future in as_completed(futures):
+                    i, f = futures[future]
+                    try:
+                        yield i, f, future.result()
+                    except Exception:
+                        yield i, f, f  # Send the original if normalization blew up
+
+        try:
+            if concurrency > 1 and len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=min(concurrency, len(pending))) as executor:
+                    # Submitted as inputs become ready, so files that need no
+                    # transcoding are already uploading while others convert
+                    futures = {executor.submit(process_and_record, *item): item[0]
+                               for item in prepared_inputs()}
+                fresh = {index: future.result() for future, index in futures.items()}
+            else:
+                fresh = {item[0]: process_and_record(*item) for item in prepared_inputs()}
+        finally:
+            if journal:
+                journal.close()
+        if journal:
+            # Streamed from disk by save_results() and the caller, not held in memory
+            results = journal.results(file_keys)
+        else:
+            results.extend(fresh[i] for i in range(1, len(files) + 1))
 
     # Save results
     if output_file:
@@ -919,7 +1219,7 @@ def batch_process(
     return results
 
 
-def print_results(results: List[Dict[str, Any]], task: str) -> None:
+def print_results(results: Iterable[Dict[str, Any]], task: str) -> None:
     """Print results to stdout for LLM workflows.
 
     Always prints actual results (not just success/fail counts) so LLMs
@@ -974,14 +1274,21 @@ def print_results(results: List[Dict[str, Any]], task: str) -> None:
         print()  # Blank line between results
 
 
-def save_results(results: List[Dict[str, Any]], output_file: str, format_output: str):
-    """Save results to file."""
+def save_results(results: Iterable[Dict[str, Any]], output_file: str, format_output: str):
+    """Save results to file.
+
+    results may be any iterable (e.g. BatchJournal.iter_results()); text
+    formats are written one result at a time without building a list.
+    """
     output_path = Path(output_file)
 
     # Special handling for image generation - if output has image extension, copy the generated image
     image_extensions = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
     video_extensions = {'.mp4', '.mov', '.avi', '.webm'}
 
+    if output_path.suffix.lower() in image_extensions | video_extensions:
+        results = list(results)  # Media outputs only apply to single results
+
     if output_path.suffix.lower() in image_extensions and len(results) == 1:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1019,7 +1326,16 @@ def save_results(results: List[Dict[str, Any]], output_file: str, format_output:
 
     if format_output == 'json':
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+            if isinstance(results, list):
+                json.dump(results, f, indent=2)
+            else:
+                # Same layout as json.dump(..., indent=2), one item at a time
+                separator = '[\n'
+                for result in results:
+                    item = json.dumps(result, indent=2).replace('\n', '\n  ')
+                    f.write(f"{separator}  {item}")
+                    separator = ',\n'
+                f.write('[]' if separator == '[\n' else '\n]')
     elif format_output == 'csv':
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
             fieldnames = ['file', 'status', 'response', 'error']
@@ -1061,6 +1377,29 @@ Examples:
   %(prog)s --files *.pdf --task extract --prompt "Extract data as JSON" \\
     --format json --output results.json
 
+  # Caption thousands of images with 8 parallel workers
+  %(prog)s --files images/*.jpg --task analyze --prompt "Caption this image" \\
+    --concurrency 8 --format csv --output captions.csv
+
+  # Stay under per-key quotas across all configured keys
+  %(prog)s --files images/*.jpg --task analyze --concurrency 8 --rpm 15 --tpm 250000
+
+  # Shrink inputs first (audio-only 16kHz for transcription, 720p video,
+  # downscaled images); transcodes are cached by content hash
+  %(prog)s --files recordings/*.mp4 --task transcribe --normalize --concurrency 4
+
+  # Long batch: results are journaled to run.jsonl as they finish instead of
+  # being held in memory; after a crash, --resume skips files that succeeded
+  %(prog)s --files images/*.jpg --task analyze --journal run.jsonl --output captions.csv --format csv
+  %(prog)s --files images/*.jpg --task analyze --journal run.jsonl --output captions.csv --format csv --resume
+
+  # Re-run a batch, only billing files whose result is not cached yet
+  %(prog)s --files images/*.jpg --task analyze --cache-results --format csv --output captions.csv
+
+  # Generate one clip per line of prompts.txt, 5 Veo jobs in flight at once
+  %(prog)s --task generate-video --prompts-file prompts.txt --veo-in-flight 5 \\
+    --model veo-3.1-fast-generate-preview
+
   # Generate images with Nano Banana Flash (fast)
   %(prog)s --task generate --prompt "A mountain landscape at sunset" \\
     --model gemini-2.5-flash-image --aspect-ratio 16:9 --size 2K
@@ -1080,6 +1419,8 @@ Examples:
                        choices=['transcribe', 'analyze', 'extract', 'generate', 'generate-video'],
                        help='Task to perform (auto-detected from file type if not specified)')
     parser.add_argument('--prompt', help='Prompt for analysis/generation')
+    parser.add_argument('--prompts-file',
+                       help='Video generation: one prompt per line, generated concurrently')
     parser.add_argument('--model',
                        help='Model to use (default: auto-detected from task and env vars)')
     parser.add_argument('--format', dest='format_output', default='text',
@@ -1105,6 +1446,25 @@ Examples:
                        help='Reference images for video generation (max 3)')
 
     parser.add_argument('--output', help='Output file for results')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of files to process in parallel (default: 1)')
+    parser.add_argument('--veo-in-flight', type=int, default=MAX_IN_FLIGHT,
+                       help=f'Veo jobs generating at once with --prompts-file (default: {MAX_IN_FLIGHT})')
+    parser.add_argument('--rpm', type=float, default=None,
+                       help='Requests per minute allowed per API key (enables proactive scheduling)')
+    parser.add_argument('--tpm', type=float, default=None,
+                       help='Tokens per minute allowed per API key (enables proactive scheduling)')
+    parser.add_argument('--normalize', action='store_true',
+                       help='Transcode/downscale inputs to the smallest form the task needs (needs ffmpeg)')
+    parser.add_argument('--cache-results', action='store_true',
+                       help='Reuse stored results of identical requests (size-bounded LRU on disk)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable all caching: re-upload files and ignore --cache-results')
+    parser.add_argument('--journal',
+                       help='Checkpoint journal (JSONL) written as files finish; '
+                            'results are streamed from it instead of kept in memory')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip files that already succeeded in the journal')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
     parser.add_argument('--dry-run', action='store_true',
@@ -1137,9 +1497,30 @@ Examples:
     if args.task not in ['generate', 'generate-video'] and not args.files:
         parser.error("--files required for non-generation tasks")
 
+    prompts = None
+    if args.prompts_file:
+        if args.task != 'generate-video':
+            parser.error("--prompts-file is only supported with --task generate-video")
+        with open(args.prompts_file, 'r', encoding='utf-8') as f:
+            prompts = [line.strip() for line in f if line.strip()]
+        if not prompts:
+            parser.error(f"No prompts found in {args.prompts_file}")
+        args.prompt = args.prompt or prompts[0]
+
     if args.task in ['generate', 'generate-video'] and not args.prompt:
         parser.error("--prompt required for generation tasks")
 
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.veo_in_flight < 1:
+        parser.error("--veo-in-flight must be at least 1")
+
+    if (args.rpm is not None and args.rpm <= 0) or (args.tpm is not None and args.tpm <= 0):
+        parser.error("--rpm and --tpm must be positive")
+
+    if args.resume and not (args.files and args.journal):
+        parser.error("--resume requires --files and --journal")
+
     if args.task not in ['generate', 'generate-video'] and not args.prompt:
         # Set default prompts
         if args.task == 'transcribe':
@@ -1164,7 +1545,17 @@ Examples:
         reference_images=args.reference_images,
         output_file=args.output,
         verbose=args.verbose,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        use_cache=not args.no_cache,
+        cache_results=args.cache_results,
+        journal_file=args.journal if args.files else None,
+        resume=args.resume,
+        prompts=prompts,
+        veo_in_flight=args.veo_in_flight,
+        normalize=args.normalize
     )
 
     # Print results and summary
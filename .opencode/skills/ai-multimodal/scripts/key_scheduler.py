@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Proactive per-key rate limiting for Gemini API batch jobs.
+
+Each API key gets a token bucket for requests per minute (RPM) and one for
+tokens per minute (TPM). Work is dispatched to whichever key has capacity,
+so batches stay under quota instead of reacting to 429s after the fact.
+
+The clock and sleep functions are injectable, so the scheduler can be
+driven by a fake clock in tests.
+"""
+
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, now: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0  # per second
+        self.tokens = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        self._refill(now)
+        # Requests larger than the bucket wait for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        """Consume `amount` (may go negative after a correction)."""
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def give(self, amount: float, now: float) -> None:
+        """Return unused tokens, e.g. when a request used fewer than estimated."""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self, now: float) -> None:
+        """Empty the bucket (server says we're over the limit)."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class KeyScheduler:
+    """Dispatch requests across API keys by available RPM/TPM capacity.
+
+    Args:
+        keys: API keys to schedule over
+        rpm: Requests per minute allowed per key (None = unlimited)
+        tpm: Tokens per minute allowed per key (None = unlimited)
+        cooldown: Seconds a key is skipped after a 429 (see penalize())
+        clock: Monotonic time source (seconds)
+        sleep: Sleep function used while waiting for capacity
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        verbose: bool = False
+    ):
+        if not keys:
+            raise ValueError("KeyScheduler requires at least one API key")
+        self.keys = list(keys)
+        self.cooldown = cooldown
+        self.verbose = verbose
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0
+
+        now = clock()
+        self._rpm: Dict[str, Optional[TokenBucket]] = {
+            key: TokenBucket(rpm, now) if rpm else None for key in self.keys
+        }
+        self._tpm: Dict[str, Optional[TokenBucket]] = {
+            key: TokenBucket(tpm, now) if tpm else None for key in self.keys
+        }
+        self._cooldown_until: Dict[str, float] = {key: 0.0 for key in self.keys}
+
+    @property
+    def key_count(self) -> int:
+        return len(self.keys)
+
+    def _wait_time(self, key: str, tokens: float, now: float) -> float:
+        waits = [self._cooldown_until[key] - now]
+        if self._rpm[key]:
+            waits.append(self._rpm[key].wait_time(1, now))
+        if self._tpm[key]:
+            waits.append(self._tpm[key].wait_time(tokens, now))
+        return max(0.0, *waits)
+
+    def acquire(self, tokens: float = 1) -> str:
+        """Block until some key has capacity for one request of `tokens`; return it.
+
+        Keys are tried round-robin so load spreads evenly when several have
+        capacity.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                shortest = None
+                for offset in range(len(self.keys)):
+                    key = self.keys[(self._next + offset) % len(self.keys)]
+                    wait = self._wait_time(key, tokens, now)
+                    if wait <= 0:
+                        if self._rpm[key]:
+                            self._rpm[key].take(1, now)
+                        if self._tpm[key]:
+                            self._tpm[key].take(tokens, now)
+                        self._next = (self._next + offset + 1) % len(self.keys)
+                        return key
+                    shortest = wait if shortest is None else min(shortest, wait)
+
+            if self.verbose:
+                print(f"  Rate limit: waiting {shortest:.1f}s for key capacity", file=sys.stderr)
+            self._sleep(shortest)
+
+    def settle(self, key: str, estimated: float, actual: Optional[int]) -> None:
+        """Correct a key's TPM bucket once the real token count is known."""
+        bucket = self._tpm.get(key)
+        if not bucket or actual is None:
+            return
+        with self._lock:
+            now = self._clock()
+            if actual > estimated:
+                bucket.take(actual - estimated, now)
+            else:
+                bucket.give(estimated - actual, now)
+
+    def penalize(self, key: str, cooldown: Optional[float] = None) -> None:
+        """Take a key out of rotation after a 429 and empty its buckets."""
+        with self._lock:
+            now = self._clock()
+            self._cooldown_until[key] = now + (self.cooldown if cooldown is None else cooldown)
+            for bucket in (self._rpm[key], self._tpm[key]):
+                if bucket:
+                    bucket.drain(now)
+        if self.verbose:
+            print(f"  Key {key[:8]}... rate limited, cooling down", file=sys.stderr)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Local caches for Gemini media workflows.
+
+- UploadCache: content-addressed record of File API uploads. Files are keyed
+  by SHA-256, so re-runs and multi-prompt passes over the same media reuse the
+  remote file until it expires instead of uploading (and polling) again.
+- ResultCache: opt-in, size-bounded LRU store of successful results keyed by
+  file hash + prompt + model + task + generation parameters, so re-running a
+  batch does not re-bill files that already succeeded.
+- ProbeCache: ffprobe results keyed by (path, size, mtime), so a file probed
+  before and after optimization spawns ffprobe once. Imported from the
+  shared .opencode/scripts/media_probe_cache (also used by media-processing);
+  without it, files are probed every time.
+
+Cache location: $AI_MULTIMODAL_CACHE_DIR or ~/.cache/ai-multimodal
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Shared ffprobe cache (.opencode/scripts), also used by media-processing
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'scripts'))
+try:
+    from media_probe_cache import ProbeCache, get_probe_cache
+    PROBE_CACHE_AVAILABLE = True
+except ImportError:
+    # Fallback if the shared cache is not available: probe without caching
+    import subprocess
+
+    PROBE_CACHE_AVAILABLE = False
+
+    class ProbeCache:
+        """Uncached stand-in with the shared ProbeCache interface."""
+
+        def __init__(self, path: Optional[Path] = None):
+            self.path = None
+
+        def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+            return None
+
+        def probe(self, file_path: str) -> Dict[str, Any]:
+            result = subprocess.run(['ffprobe', '-v', 'quiet', '-print_format', 'json',
+                                     '-show_format', '-show_streams', str(file_path)],
+                                    capture_output=True, text=True, check=True)
+            return json.loads(result.stdout)
+
+        def save(self) -> None:
+            pass
+
+    def get_probe_cache() -> ProbeCache:
+        return ProbeCache()
+
+CACHE_DIR = Path(os.getenv('AI_MULTIMODAL_CACHE_DIR') or Path.home() / '.cache' / 'ai-multimodal')
+
+# File API keeps uploads for 48h; stop reusing them a bit before that
+FILE_API_TTL = 48 * 3600
+EXPIRY_MARGIN = 15 * 60
+MAX_UPLOADS_PER_FILE = 4  # One per API key/project the file was uploaded with
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv('AI_MULTIMODAL_RESULT_CACHE_MB', '256')) * 1024 * 1024
+
+# (path, size, mtime_ns) -> digest, so one run hashes each file once
+_hash_memo: Dict[tuple, str] = {}
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file's contents, streamed in 1MB chunks."""
+    stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class UploadCache:
+    """SHA-256 -> remote File API names with their expiry times."""
+
+    def __init__(self, path: Optional[Path] = None, clock: Callable[[], float] = time.time):
+        self.path = Path(path) if path else CACHE_DIR / 'uploads.json'
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, List[Dict[str, Any]]]) -> None:
+        try:
+            _write_json_atomic(self.path, entries)
+        except OSError:
+            pass  # Cache is best-effort
+
+    def lookup(self, digest: str) -> List[str]:
+        """Remote names for this content that have not expired yet."""
+        now = self._clock()
+        with self._lock:
+            entries = self._load().get(digest, [])
+        return [e['name'] for e in entries if e.get('expires', 0) - EXPIRY_MARGIN > now]
+
+    def store(self, digest: str, remote_file: Any) -> None:
+        """Record an uploaded (ACTIVE) file for this content."""
+        name = getattr(remote_file, 'name', None)
+        if not isinstance(name, str):
+            return
+
+        expiration = getattr(remote_file, 'expiration_time', None)
+        expires = expiration.timestamp() if hasattr(expiration, 'timestamp') else self._clock() + FILE_API_TTL
+
+        with self._lock:
+            entries = self._load()
+            now = self._clock()
+            kept = [e for e in entries.get(digest, [])
+                    if e.get('name') != name and e.get('expires', 0) > now]
+            entries[digest] = ([{'name': name, 'expires': expires}] + kept)[:MAX_UPLOADS_PER_FILE]
+            # Drop fully expired content while we're rewriting the file
+            entries = {k: v for k, v in entries.items() if any(e.get('expires', 0) > now for e in v)}
+            self._save(entries)
+
+    def forget(self, digest: str, name: str) -> None:
+        """Remove a remote file that turned out to be unusable."""
+        with self._lock:
+            entries = self._load()
+            if digest in entries:
+                entries[digest] = [e for e in entries[digest] if e.get('name') != name]
+                if not entries[digest]:
+                    del entries[digest]
+                self._save(entries)
+
+    def reuse(self, client: Any, digest: str, verbose: bool = False) -> Optional[Any]:
+        """Return a still-ACTIVE remote file for this content, if the client can see one.
+
+        Each candidate is checked with files.get(), which is cheap compared to an
+        upload and also rejects files uploaded under a different API key/project.
+        """
+        for name in self.lookup(digest):
+            try:
+                remote_file = client.files.get(name=name)
+            except Exception:
+                self.forget(digest, name)
+                continue
+            if getattr(getattr(remote_file, 'state', None), 'name', None) == 'ACTIVE':
+                if verbose:
+                    print(f"  Reusing uploaded file: {name}")
+                return remote_file
+        return None
+
+
+class ResultCache:
+    """Size-bounded LRU cache of successful results, one JSON file per key.
+
+    Recency is the entry file's mtime (bumped on every hit). The directory is
+    scanned once per process; after that entry sizes and LRU order are kept
+    in memory, so a put costs O(1) and, once over max_bytes, deletes the
+    least recently used entries without rescanning.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.directory = Path(directory) if directory else CACHE_DIR / 'results'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Optional[OrderedDict] = None  # path -> size, least recently used first
+        self._total = 0
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Stable key from request parts (file hash, prompt, model, task, params)."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _index(self) -> OrderedDict:
+        # Caller holds the lock
+        if self._entries is None:
+            entries = []
+            for path in self.directory.glob('*.json'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+            self._entries = OrderedDict((path, size) for _, path, size in sorted(entries))
+            self._total = sum(self._entries.values())
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            entries = self._index()
+            if path in entries:
+                entries.move_to_end(path)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        path = self._entry_path(key)
+        try:
+            _write_json_atomic(path, result)
+            size = path.stat().st_size
+        except (OSError, TypeError, ValueError):
+            return  # Cache is best-effort; unserializable results are skipped
+
+        with self._lock:
+            entries = self._index()
+            self._total += size - entries.pop(path, 0)
+            entries[path] = size
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        entries = self._entries
+        while self._total > self.max_bytes and entries:
+            path, size = entries.popitem(last=False)
+            try:
+                path.unlink()
+            except OSError:
+                pass  # Already gone (e.g. evicted by another process)
+            self._total -= size
+
+
+_upload_cache = None
+
+
+def get_upload_cache() -> UploadCache:
+    """Process-wide UploadCache at the default location."""
+    global _upload_cache
+    if _upload_cache is None:
+        _upload_cache = UploadCache()
+    return _upload_cache
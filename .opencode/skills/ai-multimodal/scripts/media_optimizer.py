@@ -9,16 +9,22 @@ Features:
 - Format conversion
 - Quality vs size optimization
 - Validation before upload
+- Per-task normalization for batch runs (cached by content hash)
 """
 
 import argparse
 import json
+import math
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+from media_cache import CACHE_DIR, file_sha256, get_probe_cache
+
 try:
     from dotenv import load_dotenv
 except ImportError:
@@ -62,6 +68,10 @@ def load_env_files():
 # Load environment variables at module level
 load_env_files()
 
+# Concurrent ffmpeg processes when splitting (stream copy is I/O bound)
+SPLIT_WORKERS = 4
+PROBE_WORKERS = 8  # Concurrent ffprobe calls in get_media_infos
+
 
 def check_ffmpeg() -> bool:
     """Check if ffmpeg is installed."""
@@ -76,23 +86,18 @@ def check_ffmpeg() -> bool:
 
 
 def get_media_info(file_path: str) -> Dict[str, Any]:
-    """Get media file information using ffprobe."""
-    if not check_ffmpeg():
-        return {}
+    """Get media file information using ffprobe (cached per unchanged file)."""
+    cache = get_probe_cache()
+    data = cache.lookup(file_path)
+    if data is None:
+        if not check_ffmpeg():
+            return {}
+        try:
+            data = cache.probe(file_path)
+        except (subprocess.CalledProcessError, json.JSONDecodeError, Exception):
+            return {}
 
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            file_path
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-
         info = {
             'size': int(data['format'].get('size', 0)),
             'duration': float(data['format'].get('duration', 0)),
@@ -111,10 +116,18 @@ def get_media_info(file_path: str) -> Dict[str, Any]:
 
         return info
 
-    except (subprocess.CalledProcessError, json.JSONDecodeError, Exception):
+    except Exception:
         return {}
 
 
+def get_media_infos(file_paths: List[str], max_workers: int = PROBE_WORKERS) -> List[Dict[str, Any]]:
+    """get_media_info for many files, probed concurrently (in input order)."""
+    if len(file_paths) <= 1:
+        return [get_media_info(p) for p in file_paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_media_info, file_paths))
+
+
 def optimize_video(
     input_path: str,
     output_path: str,
@@ -224,6 +237,7 @@ def optimize_audio(
     # Build command
     cmd = [
         'ffmpeg', '-i', input_path, '-y',
+        '-vn',  # Audio only (also drops video tracks and cover art)
         '-c:a', 'aac',
         '-b:a', bitrate,
         '-ar', str(sample_rate),
@@ -305,13 +319,26 @@ def optimize_image(
         return False
 
 
-def split_video(
+def split_video_chunks(
     input_path: str,
     output_dir: str,
     chunk_duration: int = 3600,
+    max_workers: int = SPLIT_WORKERS,
     verbose: bool = False
-) -> List[str]:
-    """Split long video into chunks."""
+) -> List[Dict[str, Any]]:
+    """Split long video into chunks; return chunk metadata in order.
+
+    Each chunk seeks on the input side (-ss before -i), so ffmpeg jumps to the
+    keyframe at or before the chunk start instead of reading the file from the
+    beginning, and streams are copied, not re-encoded. Chunks are cut in
+    parallel.
+
+    Returns:
+        [{'path', 'index', 'start', 'duration', 'size'}, ...] where start is the
+        requested offset in seconds, duration is probed from the chunk (cuts
+        snap to keyframes) and size is in bytes. A video shorter than one
+        chunk is returned as a single entry for the input file.
+    """
     if not check_ffmpeg():
         print("Error: ffmpeg not installed")
         return []
@@ -321,25 +348,27 @@ def split_video(
         return []
 
     total_duration = info['duration']
-    num_chunks = int(total_duration / chunk_duration) + 1
+    num_chunks = max(1, math.ceil(total_duration / chunk_duration))
 
     if num_chunks == 1:
         if verbose:
             print("Video is short enough, no splitting needed")
-        return [input_path]
+        return [{'path': input_path, 'index': 1, 'start': 0.0,
+                 'duration': total_duration, 'size': info.get('size', 0)}]
 
     Path(output_dir).mkdir(parents=True, exist_ok=True)
-    output_files = []
 
-    for i in range(num_chunks):
+    def cut_chunk(i: int) -> Optional[Dict[str, Any]]:
         start_time = i * chunk_duration
         output_file = Path(output_dir) / f"{Path(input_path).stem}_chunk_{i+1}.mp4"
 
         cmd = [
-            'ffmpeg', '-i', input_path, '-y',
+            'ffmpeg', '-y',
             '-ss', str(start_time),
+            '-i', input_path,
             '-t', str(chunk_duration),
             '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
             str(output_file)
         ]
 
@@ -348,11 +377,116 @@ def split_video(
 
         try:
             subprocess.run(cmd, check=True, capture_output=not verbose)
-            output_files.append(str(output_file))
         except subprocess.CalledProcessError as e:
             print(f"Error creating chunk {i+1}: {e}")
+            return None
+
+        chunk_info = get_media_info(str(output_file))
+        try:
+            size = output_file.stat().st_size
+        except OSError:
+            size = chunk_info.get('size', 0)
+        return {
+            'path': str(output_file),
+            'index': i + 1,
+            'start': float(start_time),
+            'duration': chunk_info.get('duration') or min(chunk_duration, total_duration - start_time),
+            'size': size
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, num_chunks))) as executor:
+        chunks = list(executor.map(cut_chunk, range(num_chunks)))
 
-    return output_files
+    return [chunk for chunk in chunks if chunk]
+
+
+def split_video(
+    input_path: str,
+    output_dir: str,
+    chunk_duration: int = 3600,
+    verbose: bool = False
+) -> List[str]:
+    """Split long video into chunks; return chunk paths (see split_video_chunks)."""
+    return [chunk['path'] for chunk in split_video_chunks(
+        input_path, output_dir, chunk_duration, verbose=verbose)]
+
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.aac', '.flac', '.ogg', '.aiff', '.m4a'}
+VIDEO_EXTENSIONS = {'.mp4', '.mpeg', '.mov', '.avi', '.flv', '.mpg', '.webm', '.wmv', '.3gpp', '.mkv'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp'}
+
+# Smallest input each task needs (see normalize_for_task)
+SPEECH_SAMPLE_RATE = 16000
+MAX_VIDEO_WIDTH = 1280        # Gemini samples frames at low resolution anyway
+MAX_IMAGE_WIDTH = {'analyze': 1536, 'extract': 3072}  # extract keeps detail for OCR
+
+
+def normalize_for_task(
+    file_path: str,
+    task: str,
+    cache_dir: Optional[Path] = None,
+    verbose: bool = False
+) -> str:
+    """Return the smallest file that still serves `task`: the input or a cached transcode.
+
+    - transcribe: audio track only, mono 16kHz AAC
+    - analyze/extract video: scaled down to 1280px wide
+    - analyze/extract images: scaled down to 1536px / 3072px wide
+
+    Transcodes are stored under <cache>/normalized by content hash, so re-runs
+    reuse them. Inputs that are already small enough, can't be probed, or
+    don't get smaller are returned unchanged.
+    """
+    ext = Path(file_path).suffix.lower()
+    if task not in ('transcribe', 'analyze', 'extract'):
+        return file_path
+
+    if task == 'transcribe' and (ext in AUDIO_EXTENSIONS or ext in VIDEO_EXTENSIONS):
+        info = get_media_info(file_path)
+        if 'sample_rate' not in info:
+            return file_path
+        if (ext in AUDIO_EXTENSIONS and info['sample_rate'] <= SPEECH_SAMPLE_RATE
+                and info.get('channels', 0) <= 1):
+            return file_path
+        profile, output_ext = 'speech16k', '.aac'
+        transcode = lambda out: optimize_audio(file_path, out, bitrate='64k',
+                                               sample_rate=SPEECH_SAMPLE_RATE, verbose=verbose)
+    elif ext in VIDEO_EXTENSIONS and task != 'transcribe':
+        if get_media_info(file_path).get('width', 0) <= MAX_VIDEO_WIDTH:
+            return file_path
+        profile, output_ext = f'video{MAX_VIDEO_WIDTH}', '.mp4'
+        transcode = lambda out: optimize_video(file_path, out, resolution=f'{MAX_VIDEO_WIDTH}:-2',
+                                               verbose=verbose)
+    elif ext in IMAGE_EXTENSIONS and task != 'transcribe':
+        max_width = MAX_IMAGE_WIDTH[task]
+        if get_media_info(file_path).get('width', 0) <= max_width:
+            return file_path
+        profile, output_ext = f'image{max_width}', ext if ext != '.bmp' else '.png'
+        transcode = lambda out: optimize_image(file_path, out, max_width=max_width, verbose=verbose)
+    else:
+        return file_path
+
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'normalized'
+    try:
+        output_path = cache_dir / f"{file_sha256(file_path)}-{profile}{output_ext}"
+        if not output_path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Keep the real extension last; ffmpeg/Pillow pick the format from it
+            tmp_path = output_path.with_name(
+                f"{output_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp{output_ext}")
+            if not transcode(str(tmp_path)) or not tmp_path.exists():
+                tmp_path.unlink(missing_ok=True)
+                return file_path
+            os.replace(tmp_path, output_path)
+
+        if output_path.stat().st_size >= Path(file_path).stat().st_size:
+            return file_path
+    except OSError:
+        return file_path
+
+    if verbose:
+        print(f"  Normalized {Path(file_path).name} for {task}: {output_path.name}")
+    return str(output_path)
 
 
 def main():
@@ -410,7 +544,11 @@ Examples:
 
         if args.split:
             output_dir = args.output_dir or './chunks'
-            chunks = split_video(str(input_path), output_dir, args.chunk_duration, args.verbose)
+            chunks = split_video_chunks(str(input_path), output_dir, args.chunk_duration,
+                                        verbose=args.verbose)
+            for chunk in chunks:
+                print(f"  {Path(chunk['path']).name}: start {chunk['start']:.0f}s, "
+                      f"{chunk['duration']:.1f}s, {chunk['size'] / (1024*1024):.2f} MB")
             print(f"\nCreated {len(chunks)} chunks in {output_dir}")
             sys.exit(0)
 
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Process-wide memory ceiling for inline (<20MB) request payloads.
+
+Files under 20MB are sent inline, so each in-flight request holds the file's
+bytes (and the SDK's base64 copy of them) until the response arrives. With
+many worker threads that multiplies peak memory. ByteBudget is a counting
+semaphore measured in bytes: a worker reserves the file size before reading
+it and releases it once the request has returned, so the sum of inline
+payloads alive at once stays under a fixed limit regardless of concurrency.
+
+Limit: $AI_MULTIMODAL_INLINE_BUDGET_MB (default 200)
+"""
+
+import os
+import threading
+
+INLINE_BUDGET_BYTES = int(os.getenv('AI_MULTIMODAL_INLINE_BUDGET_MB', '200')) * 1024 * 1024
+
+
+class ByteBudget:
+    """Blocking byte counter shared by worker threads."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int) -> int:
+        """Block until nbytes fit under the limit; return the amount reserved.
+
+        A single payload larger than the whole budget waits for an empty
+        budget instead of forever.
+        """
+        amount = min(max(0, nbytes), self.limit)
+        with self._cond:
+            while self.in_use + amount > self.limit:
+                self._cond.wait()
+            self.in_use += amount
+        return amount
+
+    def release(self, amount: int) -> None:
+        if not amount:
+            return
+        with self._cond:
+            self.in_use -= amount
+            self._cond.notify_all()
+
+
+_inline_budget = None
+_inline_budget_lock = threading.Lock()
+
+
+def get_inline_budget() -> ByteBudget:
+    """Process-wide budget for inline payloads."""
+    global _inline_budget
+    with _inline_budget_lock:
+        if _inline_budget is None:
+            _inline_budget = ByteBudget(INLINE_BUDGET_BYTES)
+    return _inline_budget
@@ -0,0 +1,112 @@
+"""
+Tests for batch_journal.py
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from batch_journal import BatchJournal
+import gemini_batch_process as gbp
+
+RUN = {'task': 'analyze', 'model': 'gemini-2.5-flash', 'prompt': 'Describe'}
+
+
+class TestBatchJournal:
+    """Test journal writing and reading."""
+
+    def test_resume_returns_only_successes(self, tmp_path):
+        """Test failed files are retried on resume and the last entry wins."""
+        path = tmp_path / 'run.jsonl'
+        journal = BatchJournal(path, RUN)
+        assert journal.open() == set()
+        journal.record('a.jpg', {'file': 'a.jpg', 'status': 'success', 'response': 'A'})
+        journal.record('b.jpg', {'file': 'b.jpg', 'status': 'error', 'error': '500'})
+        journal.close()
+
+        journal = BatchJournal(path, RUN)
+        assert list(journal.open(resume=True)) == ['a.jpg']
+        journal.record('b.jpg', {'file': 'b.jpg', 'status': 'success', 'response': 'B'})
+        journal.close()
+
+        results = list(journal.iter_results(['b.jpg', 'a.jpg', 'missing.jpg']))
+        assert [r['response'] for r in results] == ['B', 'A']
+
+    def test_resume_rejects_different_run(self, tmp_path):
+        """Test a journal is not reused for another prompt."""
+        path = tmp_path / 'run.jsonl'
+        BatchJournal(path, RUN).open()
+
+        with pytest.raises(ValueError):
+            BatchJournal(path, dict(RUN, prompt='Caption')).open(resume=True)
+
+    def test_torn_last_line_is_ignored(self, tmp_path):
+        """Test a half-written entry from a crash doesn't corrupt the next one."""
+        path = tmp_path / 'run.jsonl'
+        journal = BatchJournal(path, RUN)
+        journal.open()
+        journal.record('a.jpg', {'file': 'a.jpg', 'status': 'success'})
+        journal.close()
+        with open(path, 'a') as f:
+            f.write('{"file": "b.jpg", "res')
+
+        journal = BatchJournal(path, RUN)
+        assert list(journal.open(resume=True)) == ['a.jpg']
+        journal.record('b.jpg', {'file': 'b.jpg', 'status': 'success'})
+        journal.close()
+        assert len(list(journal.iter_results(['a.jpg', 'b.jpg']))) == 2
+
+
+class TestBatchProcessResume:
+    """Test batch_process checkpoints and resumes through the journal."""
+
+    @patch('gemini_batch_process.find_api_key', return_value='test_key')
+    @patch('gemini_batch_process.genai.Client')
+    def test_resume_skips_finished_files(self, mock_client_class, mock_find_key, tmp_path):
+        """Test a crashed run only re-processes unfinished files."""
+        files = ['a.jpg', 'b.jpg', 'c.jpg']
+        output = tmp_path / 'out.json'
+        journal = str(output) + '.journal.jsonl'
+        kwargs = dict(files=files, prompt='Describe', model='gemini-2.5-flash', task='analyze',
+                      format_output='json', output_file=str(output), journal_file=journal)
+
+        def crash_on_c(**call):
+            if call['file_path'] == 'c.jpg':
+                raise KeyboardInterrupt
+            return {'file': call['file_path'], 'status': 'success', 'response': call['file_path']}
+
+        with patch('gemini_batch_process.process_file', side_effect=crash_on_c):
+            with pytest.raises(KeyboardInterrupt):
+                gbp.batch_process(**kwargs)
+        assert not output.exists()
+
+        with patch('gemini_batch_process.process_file',
+                   side_effect=lambda **call: {'file': call['file_path'], 'status': 'success',
+                                               'response': call['file_path']}) as mock_process:
+            results = gbp.batch_process(resume=True, **kwargs)
+
+        assert mock_process.call_count == 1
+        assert [r['file'] for r in results] == files
+        assert len(results) == 3
+        assert json.loads(output.read_text()) == list(results)
+
+    @patch('gemini_batch_process.find_api_key', return_value='test_key')
+    @patch('gemini_batch_process.genai.Client')
+    def test_results_are_read_from_journal(self, mock_client_class, mock_find_key, tmp_path):
+        """Test a journaled run returns a view of the journal, not in-memory results."""
+        journal = tmp_path / 'run.jsonl'
+        with patch('gemini_batch_process.process_file',
+                   side_effect=lambda **call: {'file': call['file_path'], 'status': 'success',
+                                               'response': call['file_path']}):
+            results = gbp.batch_process(files=['a.jpg', 'b.jpg'], prompt='Describe',
+                                        model='gemini-2.5-flash', task='analyze',
+                                        format_output='text', journal_file=str(journal),
+                                        concurrency=2)
+
+        assert not isinstance(results, list)
+        journal.write_text(journal.read_text().replace('"response": "b.jpg"', '"response": "B"'))
+        assert [r['response'] for r in results] == ['a.jpg', 'B']
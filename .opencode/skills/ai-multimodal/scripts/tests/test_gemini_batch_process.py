@@ -2,6 +2,7 @@
 Tests for gemini_batch_process.py
 """
 
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -29,6 +30,50 @@ class TestAPIKeyFinder:
         mock_load_dotenv.return_value = None
         assert gbp.find_api_key() is None
 
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        """Empty project + home so only the test's .env files and env vars count."""
+        for name in [n for n in os.environ if n.startswith('GEMINI_API_KEY')]:
+            monkeypatch.delenv(name)
+        (tmp_path / 'proj' / '.git').mkdir(parents=True)
+        (tmp_path / 'home').mkdir()
+        monkeypatch.chdir(tmp_path / 'proj')
+        monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+        return tmp_path / 'proj'
+
+    @pytest.mark.skipif(not gbp.CENTRALIZED_RESOLVER_AVAILABLE, reason="resolve_env not available")
+    def test_find_api_keys_numbered_order(self, project, monkeypatch):
+        """Test numbered keys come after the main key, in numeric order, without duplicates."""
+        skill_env = project / '.claude' / 'skills' / 'ai-multimodal' / '.env'
+        skill_env.parent.mkdir(parents=True)
+        skill_env.write_text('GEMINI_API_KEY=k1\nGEMINI_API_KEY_10=k10\nGEMINI_API_KEY_2=k2\n')
+        (project / '.claude' / '.env').write_text('GEMINI_API_KEY_3=k1\nGEMINI_API_KEY_2=ignored\n')
+        monkeypatch.setenv('GEMINI_API_KEY_4', 'k4')
+
+        assert gbp.find_api_keys() == ['k1', 'k2', 'k4', 'k10']
+
+    @pytest.mark.skipif(not gbp.CENTRALIZED_RESOLVER_AVAILABLE, reason="resolve_env not available")
+    def test_resolver_reparses_only_changed_files(self, project):
+        """Test .env files are parsed once and again only after they change."""
+        import resolve_env
+
+        global_env = project / '.claude' / '.env'
+        global_env.parent.mkdir()
+        global_env.write_text('GEMINI_API_KEY=old\n')
+        resolver = resolve_env.EnvResolver('ai-multimodal')
+
+        with patch('resolve_env.dotenv_values', wraps=resolve_env.dotenv_values) as parse:
+            assert resolver.resolve('GEMINI_API_KEY') == 'old'
+            assert resolver.resolve_many(['GEMINI_API_KEY', 'OTHER']) == {
+                'GEMINI_API_KEY': 'old', 'OTHER': None}
+            assert parse.call_count == 1
+
+            global_env.write_text('GEMINI_API_KEY=new\n')
+            stat = global_env.stat()
+            os.utime(global_env, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert resolver.lookup('GEMINI_API_KEY') == ('new', 'Project global', global_env)
+            assert parse.call_count == 2
+
 
 class TestMimeTypeDetection:
     """Test MIME type detection."""
@@ -276,6 +321,81 @@ class TestBatchProcessing:
         assert len(results) == 2
         assert all(r['status'] == 'success' for r in results)
 
+    @patch('gemini_batch_process.find_api_key', return_value='test_key')
+    @patch('gemini_batch_process.generate_videos_veo')
+    @patch('gemini_batch_process.genai.Client')
+    def test_veo_prompts_run_in_parallel_by_default(self, mock_client_class, mock_veo, mock_find_key):
+        """Test several Veo prompts don't inherit the serial --concurrency default."""
+        mock_veo.return_value = [{'status': 'success'}, {'status': 'success'}]
+
+        gbp.batch_process(
+            files=[],
+            prompt='A',
+            model='veo-3.1-fast-generate-preview',
+            task='generate-video',
+            format_output='text',
+            prompts=['A', 'B']
+        )
+
+        assert mock_veo.call_args.kwargs['max_in_flight'] == gbp.MAX_IN_FLIGHT > 1
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_concurrency_keeps_order(self, mock_client_class, mock_process, mock_find_key):
+        """Test parallel batch processing returns results in input order."""
+        import time
+        mock_find_key.return_value = 'test_key'
+
+        def slow_first(**kwargs):
+            # Earlier files finish last
+            time.sleep(0.05 if kwargs['file_path'] == 'test1.jpg' else 0)
+            return {'file': kwargs['file_path'], 'status': 'success'}
+
+        mock_process.side_effect = slow_first
+        files = ['test1.jpg', 'test2.jpg', 'test3.jpg', 'test4.jpg']
+
+        results = gbp.batch_process(
+            files=files,
+            prompt='Analyze',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            verbose=False,
+            dry_run=False,
+            concurrency=4
+        )
+
+        assert [r['file'] for r in results] == files
+        assert mock_process.call_count == 4
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.normalize_for_task')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_normalize_sends_normalized_file(self, mock_client_class, mock_process,
+                                                          mock_normalize, mock_find_key):
+        """Test normalized inputs are sent but results keep the original names."""
+        mock_find_key.return_value = 'test_key'
+        mock_normalize.side_effect = lambda f, task, verbose=False: (
+            '/cache/talk-speech16k.aac' if f == 'talk.mp4' else f)
+        mock_process.side_effect = lambda **kwargs: {'file': kwargs['file_path'], 'status': 'success'}
+
+        results = gbp.batch_process(
+            files=['talk.mp4', 'note.mp3'],
+            prompt='Transcribe',
+            model='gemini-2.5-flash',
+            task='transcribe',
+            format_output='text',
+            concurrency=2,
+            normalize=True
+        )
+
+        assert [r['file'] for r in results] == ['talk.mp4', 'note.mp3']
+        assert results[0]['normalized_file'] == '/cache/talk-speech16k.aac'
+        sent = sorted(call.kwargs['file_path'] for call in mock_process.call_args_list)
+        assert sent == ['/cache/talk-speech16k.aac', 'note.mp3']
+
     @patch('gemini_batch_process.find_api_key')
     def test_batch_process_no_api_key(self, mock_find_key):
         """Test batch processing without API key."""
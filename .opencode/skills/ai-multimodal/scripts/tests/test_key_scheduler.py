@@ -0,0 +1,176 @@
+"""
+Tests for key_scheduler.py
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import key_scheduler as ks
+
+
+class FakeClock:
+    """Deterministic clock; sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test token bucket accounting."""
+
+    def test_starts_full_and_refills(self):
+        """Test bucket starts at capacity and refills at rate/60 per second."""
+        bucket = ks.TokenBucket(60, now=0.0)
+        assert bucket.wait_time(60, 0.0) == 0.0
+        bucket.take(60, 0.0)
+        assert bucket.wait_time(1, 0.0) == pytest.approx(1.0)
+        assert bucket.wait_time(1, 1.0) == 0.0
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """Test a request larger than capacity doesn't wait forever."""
+        bucket = ks.TokenBucket(10, now=0.0)
+        assert bucket.wait_time(1000, 0.0) == 0.0
+        bucket.take(1000, 0.0)
+        assert bucket.wait_time(1000, 0.0) == pytest.approx(60.0)
+
+
+class TestKeyScheduler:
+    """Test dispatching across keys."""
+
+    def test_requires_keys(self):
+        """Test scheduler rejects an empty key list."""
+        with pytest.raises(ValueError):
+            ks.KeyScheduler([], rpm=10)
+
+    def test_round_robin_while_capacity(self):
+        """Test keys with capacity are used in turn."""
+        clock = FakeClock()
+        scheduler = ks.KeyScheduler(['key_a', 'key_b'], rpm=2, clock=clock, sleep=clock.sleep)
+        assert [scheduler.acquire() for _ in range(4)] == ['key_a', 'key_b', 'key_a', 'key_b']
+        assert clock.sleeps == []
+
+    def test_waits_when_all_keys_exhausted(self):
+        """Test acquire sleeps until the first key refills."""
+        clock = FakeClock()
+        scheduler = ks.KeyScheduler(['key_a', 'key_b'], rpm=1, clock=clock, sleep=clock.sleep)
+        scheduler.acquire()
+        scheduler.acquire()
+        key = scheduler.acquire()
+        assert key in ('key_a', 'key_b')
+        assert sum(clock.sleeps) == pytest.approx(60.0)
+
+    def test_tpm_dispatches_to_key_with_token_capacity(self):
+        """Test token budget steers large requests to the key that has room."""
+        clock = FakeClock()
+        scheduler = ks.KeyScheduler(['key_a', 'key_b'], tpm=1000, clock=clock, sleep=clock.sleep)
+        assert scheduler.acquire(900) == 'key_a'
+        assert scheduler.acquire(900) == 'key_b'
+        # Neither key has 900 left; wait for the first to refill
+        scheduler.acquire(900)
+        assert clock.sleeps and clock.sleeps[0] == pytest.approx(800 / (1000 / 60))
+
+    def test_settle_returns_unused_tokens(self):
+        """Test overestimates are credited back to the bucket."""
+        clock = FakeClock()
+        scheduler = ks.KeyScheduler(['key_a'], tpm=1000, clock=clock, sleep=clock.sleep)
+        scheduler.acquire(900)
+        scheduler.settle('key_a', 900, 100)
+        assert scheduler.acquire(900) == 'key_a'
+        assert clock.sleeps == []
+
+    def test_penalize_skips_key_during_cooldown(self):
+        """Test a rate-limited key is avoided until its cooldown ends."""
+        clock = FakeClock()
+        scheduler = ks.KeyScheduler(['key_a', 'key_b'], rpm=100, cooldown=30,
+                                    clock=clock, sleep=clock.sleep)
+        scheduler.penalize('key_a')
+        assert [scheduler.acquire() for _ in range(3)] == ['key_b', 'key_b', 'key_b']
+        clock.now += 30
+        assert 'key_a' in [scheduler.acquire() for _ in range(2)]
+
+
+class TestBatchScheduling:
+    """Test gemini_batch_process dispatch through the scheduler."""
+
+    @patch('gemini_batch_process.genai.Client')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.estimate_request_tokens', return_value=10)
+    def test_rate_limited_key_moves_request(self, mock_estimate, mock_process, mock_client_class):
+        """Test a 429 on one key re-dispatches the file to another key."""
+        import gemini_batch_process as gbp
+
+        clients = {}
+
+        def make_client(api_key):
+            clients[api_key] = Mock(name=api_key)
+            return clients[api_key]
+
+        mock_client_class.side_effect = make_client
+
+        def stub_process(**kwargs):
+            if kwargs['client'] is clients.get('key_a'):
+                return {'file': kwargs['file_path'], 'status': 'error', 'rate_limited': True}
+            return {'file': kwargs['file_path'], 'status': 'success', 'total_tokens': 12}
+
+        mock_process.side_effect = stub_process
+
+        with patch.object(gbp, 'KEY_ROTATION_AVAILABLE', True), \
+             patch.object(gbp, 'find_all_api_keys', return_value=['key_a', 'key_b'], create=True), \
+             patch.object(gbp, 'KeyRotator', Mock(), create=True):
+            results = gbp.batch_process(
+                files=['test1.jpg', 'test2.jpg'],
+                prompt='Analyze',
+                model='gemini-2.5-flash',
+                task='analyze',
+                format_output='text',
+                rpm=60
+            )
+
+        assert [r['status'] for r in results] == ['success', 'success']
+        assert all(call.kwargs['retry_rate_limits'] is False for call in mock_process.call_args_list)
+
+    @patch('gemini_batch_process.genai.Client')
+    def test_cached_result_skips_scheduler(self, mock_client_class, tmp_path):
+        """Test a result cache hit returns without taking an RPM/TPM slot."""
+        import gemini_batch_process as gbp
+        import media_cache as mc
+
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'\xff\xd8' + b'\x00' * 64)
+        cache = mc.ResultCache(tmp_path / 'results')
+        key = mc.ResultCache.make_key(file_sha256=mc.file_sha256(str(image)), prompt='Analyze',
+                                      model='gemini-2.5-flash', task='analyze',
+                                      response_mime_type=None)
+        cache.put(key, {'status': 'success', 'response': 'A photo'})
+
+        with patch.object(mc, 'CACHE_DIR', tmp_path), \
+             patch.object(gbp, 'KEY_ROTATION_AVAILABLE', True), \
+             patch.object(gbp, 'find_all_api_keys', return_value=['key_a'], create=True), \
+             patch.object(gbp, 'KeyRotator', Mock(), create=True), \
+             patch.object(ks.KeyScheduler, 'acquire',
+                          side_effect=AssertionError('acquired a slot')), \
+             patch('gemini_batch_process.process_file') as mock_process:
+            results = gbp.batch_process(
+                files=[str(image)],
+                prompt='Analyze',
+                model='gemini-2.5-flash',
+                task='analyze',
+                format_output='text',
+                rpm=1,
+                cache_results=True
+            )
+
+        assert results[0]['response'] == 'A photo'
+        mock_process.assert_not_called()
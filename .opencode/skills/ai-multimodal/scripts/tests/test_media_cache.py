@@ -0,0 +1,242 @@
+"""
+Tests for media_cache.py
+"""
+
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import media_cache as mc
+import media_probe_cache  # Importable once media_cache has set up sys.path
+
+
+def remote_file(name, state='ACTIVE', expires=None):
+    f = Mock()
+    f.name = name
+    f.state.name = state
+    f.expiration_time = expires
+    return f
+
+
+class TestFileHash:
+    """Test content hashing."""
+
+    def test_same_content_same_hash(self, tmp_path):
+        """Test identical content hashes identically regardless of name."""
+        a = tmp_path / 'a.mp4'
+        b = tmp_path / 'b.mp4'
+        a.write_bytes(b'video' * 1000)
+        b.write_bytes(b'video' * 1000)
+        assert mc.file_sha256(str(a)) == mc.file_sha256(str(b))
+
+
+class TestUploadCache:
+    """Test upload record keeping."""
+
+    def test_store_and_lookup(self, tmp_path):
+        """Test a stored upload is found until it expires."""
+        now = [1000.0]
+        cache = mc.UploadCache(tmp_path / 'uploads.json', clock=lambda: now[0])
+        cache.store('abc', remote_file('files/1'))
+        assert cache.lookup('abc') == ['files/1']
+
+        now[0] += mc.FILE_API_TTL
+        assert cache.lookup('abc') == []
+
+    def test_uses_remote_expiration_time(self, tmp_path):
+        """Test expiry comes from the File API object when available."""
+        expires = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        cache = mc.UploadCache(tmp_path / 'uploads.json', clock=lambda: expires.timestamp() - 3600)
+        cache.store('abc', remote_file('files/1', expires=expires))
+        assert cache.lookup('abc') == ['files/1']
+
+    def test_reuse_skips_unreachable_files(self, tmp_path):
+        """Test files the client can't see are forgotten and the next one is tried."""
+        cache = mc.UploadCache(tmp_path / 'uploads.json')
+        cache.store('abc', remote_file('files/old'))
+        cache.store('abc', remote_file('files/new'))
+
+        client = Mock()
+        client.files.get.side_effect = [Exception('404 Not Found'), remote_file('files/old')]
+
+        reused = cache.reuse(client, 'abc')
+        assert reused.name == 'files/old'
+        assert cache.lookup('abc') == ['files/old']
+
+    def test_ignores_non_string_names(self, tmp_path):
+        """Test objects without a real name are not recorded."""
+        cache = mc.UploadCache(tmp_path / 'uploads.json')
+        cache.store('abc', Mock())
+        assert cache.lookup('abc') == []
+
+
+class TestUploadFileCaching:
+    """Test upload_file reuses cached uploads."""
+
+    def test_second_upload_reuses_remote_file(self, tmp_path, monkeypatch):
+        """Test identical content is uploaded once."""
+        import gemini_batch_process as gbp
+
+        monkeypatch.setattr(mc, '_upload_cache', mc.UploadCache(tmp_path / 'uploads.json'))
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'\x00' * 2048)
+
+        client = Mock()
+        uploaded = remote_file('files/clip')
+        client.files.upload.return_value = uploaded
+        client.files.get.return_value = uploaded
+
+        assert gbp.upload_file(client, str(video)).name == 'files/clip'
+        assert gbp.upload_file(client, str(video)).name == 'files/clip'
+        client.files.upload.assert_called_once()
+
+        gbp.upload_file(client, str(video), use_cache=False)
+        assert client.files.upload.call_count == 2
+
+
+class TestResultCache:
+    """Test result memoization."""
+
+    def test_key_depends_on_every_part(self):
+        """Test changing any request part changes the key."""
+        base = dict(file_sha256='abc', prompt='Describe', model='m', task='analyze')
+        key = mc.ResultCache.make_key(**base)
+        assert key == mc.ResultCache.make_key(**dict(base))
+        for part, value in [('file_sha256', 'def'), ('prompt', 'Caption'),
+                            ('model', 'n'), ('task', 'extract')]:
+            assert mc.ResultCache.make_key(**dict(base, **{part: value})) != key
+
+    def test_put_and_get(self, tmp_path):
+        """Test a stored result round-trips."""
+        cache = mc.ResultCache(tmp_path)
+        cache.put('k', {'status': 'success', 'response': 'hi'})
+        assert cache.get('k') == {'status': 'success', 'response': 'hi'}
+        assert cache.get('missing') is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the oldest unused entries go first once over the size bound."""
+        import os
+
+        cache = mc.ResultCache(tmp_path, max_bytes=10 ** 6)
+        for i, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, {'response': 'x' * 100})
+            os.utime(tmp_path / f'{key}.json', (1000 + i, 1000 + i))
+        cache.get('a')  # 'a' is now the most recently used
+
+        cache.max_bytes = (tmp_path / 'a.json').stat().st_size * 3
+        cache.put('d', {'response': 'x' * 100})
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+        assert cache.get('d') is not None
+
+    def test_directory_is_scanned_once(self, tmp_path):
+        """Test puts track sizes in memory instead of rescanning the directory."""
+        from unittest.mock import patch
+
+        import os
+
+        mc.ResultCache(tmp_path).put('old', {'response': 'x' * 100})
+        os.utime(tmp_path / 'old.json', (1000, 1000))
+        cache = mc.ResultCache(tmp_path, max_bytes=10 ** 6)
+        cache.put('a', {'response': 'x' * 100})
+        entry_size = (tmp_path / 'a.json').stat().st_size
+        cache.max_bytes = entry_size * 2
+
+        with patch.object(Path, 'glob', side_effect=AssertionError('rescanned')):
+            cache.put('b', {'response': 'x' * 100})
+
+        # The entry from before this process started was the least recently used
+        assert sorted(p.name for p in tmp_path.glob('*.json')) == ['a.json', 'b.json']
+
+
+class TestProcessFileResultCache:
+    """Test process_file serves repeated requests from the result cache."""
+
+    def test_repeat_request_is_not_billed(self, tmp_path):
+        """Test only the first identical request reaches the API."""
+        import gemini_batch_process as gbp
+
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'\xff\xd8' + b'\x00' * 64)
+        cache = mc.ResultCache(tmp_path / 'results')
+
+        client = Mock()
+        client.models.generate_content.return_value = Mock(text='A photo', candidates=[])
+
+        def run(format_output='text', prompt='Describe'):
+            return gbp.process_file(client, str(image), prompt, 'gemini-2.5-flash',
+                                    'analyze', format_output, result_cache=cache)
+
+        first = run()
+        assert run() == dict(first, total_tokens=0)
+        run(format_output='csv')  # Same request, different output file format
+        assert client.models.generate_content.call_count == 1
+
+        run(format_output='json')
+        run(prompt='Caption')
+        assert client.models.generate_content.call_count == 3
+
+
+class TestProbeCache:
+    """Test the shared ffprobe cache as used by ai-multimodal."""
+
+    def test_round_trip_and_invalidation(self, tmp_path):
+        """Test data is reused until the file changes, and survives a reload."""
+        import json
+        from unittest.mock import patch
+
+        media = tmp_path / 'clip.mp4'
+        media.write_bytes(b'video')
+        store = tmp_path / 'probes.json'
+        probe = {'format': {'duration': '12.5'}, 'streams': []}
+
+        cache = mc.ProbeCache(store)
+        assert cache.lookup(str(media)) is None
+        with patch('media_probe_cache.subprocess.run', return_value=Mock(stdout=json.dumps(probe))) as mock_run:
+            assert cache.probe(str(media)) == probe
+            assert cache.probe(str(media)) == probe
+        assert mock_run.call_count == 1
+        cache.save()
+
+        reloaded = mc.ProbeCache(store)
+        assert reloaded.lookup(str(media)) == probe
+        media.write_bytes(b'edited video')
+        assert reloaded.lookup(str(media)) is None
+
+    def test_store_is_opt_in(self, tmp_path, monkeypatch):
+        """Test nothing is written to disk unless MEDIA_PROBE_CACHE is set."""
+        monkeypatch.setattr(media_probe_cache, '_probe_cache', None)
+        monkeypatch.delenv('MEDIA_PROBE_CACHE', raising=False)
+        assert media_probe_cache.get_probe_cache().path is None
+
+        monkeypatch.setattr(media_probe_cache, '_probe_cache', None)
+        monkeypatch.setenv('MEDIA_PROBE_CACHE', str(tmp_path / 'probes.json'))
+        assert media_probe_cache.get_probe_cache().path == tmp_path / 'probes.json'
+        monkeypatch.setattr(media_probe_cache, '_probe_cache', None)
+
+    def test_get_media_info_probes_once(self, tmp_path):
+        """Test repeated get_media_info calls on an unchanged file run ffprobe once."""
+        import json
+        from unittest.mock import patch
+        import media_optimizer as mo
+
+        media = tmp_path / 'clip.mp4'
+        media.write_bytes(b'video')
+        probe = {'format': {'size': '5', 'duration': '3.0', 'bit_rate': '1000'},
+                 'streams': [{'codec_type': 'audio', 'sample_rate': '16000', 'channels': 1}]}
+
+        with patch('media_optimizer.get_probe_cache', return_value=mc.ProbeCache(tmp_path / 'p.json')), \
+                patch('media_optimizer.check_ffmpeg', return_value=True), \
+                patch('media_probe_cache.subprocess.run',
+                      return_value=Mock(stdout=json.dumps(probe))) as mock_run:
+            first = mo.get_media_info(str(media))
+            infos = mo.get_media_infos([str(media), str(media)])
+
+        assert infos == [first, first]
+        assert first['duration'] == 3.0 and first['sample_rate'] == 16000
+        assert mock_run.call_count == 1
@@ -340,9 +340,33 @@ class TestVideoSplitting:
             verbose=False
         )
 
-        # Duration 7200s / 3600s = 2, +1 for safety = 3 chunks
-        assert len(result) == 3
-        assert mock_run.call_count == 3
+        # Duration 7200s / 3600s = 2 chunks (no empty trailing chunk)
+        assert len(result) == 2
+        assert mock_run.call_count == 2
+        # Input-side seeking: -ss comes before -i
+        for call in mock_run.call_args_list:
+            cmd = call.args[0]
+            assert cmd.index('-ss') < cmd.index('-i')
+
+    @patch('media_optimizer.check_ffmpeg')
+    @patch('media_optimizer.get_media_info')
+    @patch('subprocess.run')
+    def test_split_video_chunks_metadata(self, mock_run, mock_info, mock_check, tmp_path):
+        """Test chunk metadata comes back in order with probed durations and sizes."""
+        mock_check.return_value = True
+        mock_info.side_effect = lambda path: (
+            {'duration': 250.0} if path == 'input.mp4' else {'duration': 100.5})
+
+        def fake_ffmpeg(cmd, **kwargs):
+            Path(cmd[-1]).write_bytes(b'\x00' * 10)
+
+        mock_run.side_effect = fake_ffmpeg
+
+        chunks = mo.split_video_chunks('input.mp4', str(tmp_path), chunk_duration=100)
+
+        assert [c['index'] for c in chunks] == [1, 2, 3]
+        assert [c['start'] for c in chunks] == [0.0, 100.0, 200.0]
+        assert all(c['duration'] == 100.5 and c['size'] == 10 for c in chunks)
 
     @patch('media_optimizer.check_ffmpeg')
     @patch('media_optimizer.get_media_info')
@@ -369,5 +393,50 @@ class TestVideoSplitting:
         assert result == []
 
 
+class TestNormalizeForTask:
+    """Test per-task input normalization."""
+
+    @patch('media_optimizer.get_media_info')
+    def test_small_inputs_are_unchanged(self, mock_info, tmp_path):
+        """Test inputs already small enough are sent as-is."""
+        mock_info.return_value = {'width': 800, 'sample_rate': 16000, 'channels': 1}
+        for name, task in [('a.mp3', 'transcribe'), ('b.mp4', 'analyze'), ('c.jpg', 'analyze')]:
+            assert mo.normalize_for_task(name, task, cache_dir=tmp_path) == name
+
+    @patch('media_optimizer.get_media_info')
+    @patch('media_optimizer.optimize_audio')
+    def test_transcribe_video_extracts_speech_once(self, mock_audio, mock_info, tmp_path):
+        """Test a video for transcription becomes cached 16kHz audio."""
+        video = tmp_path / 'talk.mp4'
+        video.write_bytes(b'\x00' * 4096)
+        mock_info.return_value = {'width': 1920, 'sample_rate': 48000, 'channels': 2}
+
+        def fake_transcode(input_path, output_path, **kwargs):
+            Path(output_path).write_bytes(b'\x01' * 100)
+            return True
+
+        mock_audio.side_effect = fake_transcode
+        cache_dir = tmp_path / 'cache'
+
+        first = mo.normalize_for_task(str(video), 'transcribe', cache_dir=cache_dir)
+        second = mo.normalize_for_task(str(video), 'transcribe', cache_dir=cache_dir)
+
+        assert first == second
+        assert first.endswith('-speech16k.aac')
+        assert Path(first).parent == cache_dir
+        mock_audio.assert_called_once()
+
+    @patch('media_optimizer.get_media_info')
+    @patch('media_optimizer.optimize_video')
+    def test_transcode_that_grows_is_ignored(self, mock_video, mock_info, tmp_path):
+        """Test the original is kept when the transcode isn't smaller."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'\x00' * 100)
+        mock_info.return_value = {'width': 3840}
+        mock_video.side_effect = lambda i, o, **kw: Path(o).write_bytes(b'\x01' * 200) or True
+
+        assert mo.normalize_for_task(str(video), 'analyze', cache_dir=tmp_path / 'c') == str(video)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--cov=media_optimizer', '--cov-report=term-missing'])
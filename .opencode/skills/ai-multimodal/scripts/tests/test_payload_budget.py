@@ -0,0 +1,73 @@
+"""
+Tests for payload_budget.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from payload_budget import ByteBudget
+
+
+class TestByteBudget:
+    """Test the byte-counting semaphore."""
+
+    def test_limits_bytes_in_use(self):
+        """Test concurrent holders never exceed the limit."""
+        budget = ByteBudget(100)
+        peak = [0]
+        lock = threading.Lock()
+
+        def worker():
+            amount = budget.acquire(40)
+            with lock:
+                peak[0] = max(peak[0], budget.in_use)
+            time.sleep(0.01)
+            budget.release(amount)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak[0] <= 100
+        assert budget.in_use == 0
+
+    def test_oversized_payload_waits_for_empty_budget(self):
+        """Test a payload bigger than the limit still gets through alone."""
+        budget = ByteBudget(100)
+        assert budget.acquire(500) == 100
+        budget.release(100)
+        assert budget.in_use == 0
+
+
+class TestProcessFileBudget:
+    """Test process_file returns its reservation."""
+
+    def test_budget_released_after_success_and_failure(self, tmp_path):
+        """Test inline payload bytes are released whatever the outcome."""
+        import gemini_batch_process as gbp
+
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'\xff\xd8' + b'\x00' * 64)
+        budget = ByteBudget(1024)
+
+        client = Mock()
+        client.models.generate_content.side_effect = [
+            Mock(text='ok', candidates=[]),
+            Exception('boom')
+        ]
+        with patch('gemini_batch_process.get_inline_budget', return_value=budget):
+            ok = gbp.process_file(client, str(image), 'Describe', 'gemini-2.5-flash',
+                                  'analyze', 'text')
+            failed = gbp.process_file(client, str(image), 'Describe', 'gemini-2.5-flash',
+                                      'analyze', 'text', max_retries=1)
+
+        assert ok['status'] == 'success'
+        assert failed['status'] == 'error'
+        assert budget.in_use == 0
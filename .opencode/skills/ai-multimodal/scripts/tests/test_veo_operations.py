@@ -0,0 +1,88 @@
+"""
+Tests for veo_operations.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import veo_operations as vo
+
+
+class FakeAsyncClient:
+    """Operations finish after `polls_needed[prompt]` polls."""
+
+    def __init__(self, polls_needed, fail_prompts=()):
+        self.polls_needed = polls_needed
+        self.fail_prompts = set(fail_prompts)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.polls = 0
+        self.aio = SimpleNamespace(
+            models=SimpleNamespace(generate_videos=self._generate_videos),
+            operations=SimpleNamespace(get=self._get)
+        )
+
+    async def _generate_videos(self, model, prompt, image, config):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return SimpleNamespace(name=prompt, done=False, remaining=self.polls_needed[prompt])
+
+    async def _get(self, operation):
+        self.polls += 1
+        if operation.name in self.fail_prompts:
+            raise ConnectionError('poll failed')
+        remaining = operation.remaining - 1
+        if remaining <= 0:
+            self.in_flight -= 1
+        return SimpleNamespace(name=operation.name, done=remaining <= 0, remaining=remaining)
+
+
+def run_manager(client, jobs, tmp_path, **kwargs):
+    manager = vo.VeoOperationManager(client, min_poll_interval=0.01, max_poll_interval=0.02,
+                                     output_dir=tmp_path, **kwargs)
+    with patch('veo_operations.save_veo_video', return_value=1.5) as mock_save:
+        results = manager.run(jobs)
+    return results, mock_save
+
+
+class TestVeoOperationManager:
+    """Test concurrent Veo job handling."""
+
+    def test_results_keep_job_order(self, tmp_path):
+        """Test slow and fast jobs all finish and come back in order."""
+        client = FakeAsyncClient({'slow': 5, 'fast': 1, 'medium': 3})
+        jobs = [vo.VeoJob(prompt=p, model='veo-3.1-generate-preview')
+                for p in ['slow', 'fast', 'medium']]
+
+        results, mock_save = run_manager(client, jobs, tmp_path, max_in_flight=3)
+
+        assert [r['prompt'] for r in results] == ['slow', 'fast', 'medium']
+        assert all(r['status'] == 'success' for r in results)
+        assert mock_save.call_count == 3
+        assert client.max_in_flight == 3
+
+    def test_max_in_flight_is_respected(self, tmp_path):
+        """Test no more than max_in_flight jobs are generating at once."""
+        client = FakeAsyncClient({str(i): 2 for i in range(6)})
+        jobs = [vo.VeoJob(prompt=str(i), model='veo-3.1-generate-preview') for i in range(6)]
+
+        results, _ = run_manager(client, jobs, tmp_path, max_in_flight=2)
+
+        assert len(results) == 6
+        assert client.max_in_flight == 2
+
+    def test_failed_polls_give_up_per_job(self, tmp_path):
+        """Test a job whose polls keep failing errors without blocking the rest."""
+        client = FakeAsyncClient({'ok': 2, 'broken': 2}, fail_prompts=['broken'])
+        jobs = [vo.VeoJob(prompt=p, model='veo-3.1-generate-preview') for p in ['broken', 'ok']]
+
+        results, _ = run_manager(client, jobs, tmp_path)
+
+        assert results[0]['status'] == 'error'
+        assert 'poll failed' in results[0]['error']
+        assert results[1]['status'] == 'success'
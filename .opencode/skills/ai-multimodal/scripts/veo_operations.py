@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Concurrent Veo video generation.
+
+Veo jobs are long-running operations (11s-6min). Instead of one blocking
+poll loop per video, VeoOperationManager submits many jobs through the async
+client, polls every pending operation from a single loop with per-operation
+adaptive backoff, and downloads each video as soon as its operation is done,
+so N clips take roughly the latency of the slowest one rather than N times
+the latency of one.
+"""
+
+import asyncio
+import mimetypes
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+# Poll interval grows from MIN to MAX by BACKOFF after every "not done" poll
+MIN_POLL_INTERVAL = 5.0
+MAX_POLL_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+MAX_POLL_FAILURES = 3  # Consecutive failed polls before a job is given up
+MAX_IN_FLIGHT = 4  # Default jobs generating at once (Veo quotas are low)
+
+
+def build_veo_request(
+    prompt: str,
+    model: str,
+    resolution: str = '1080p',
+    aspect_ratio: str = '16:9',
+    reference_images: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Keyword arguments for models.generate_videos().
+
+    First reference image becomes the opening frame, the second the closing
+    frame (Veo 3.1 interpolation).
+    """
+    config_params = {
+        'aspect_ratio': aspect_ratio,
+        'resolution': resolution
+    }
+
+    def load_image(img_path_str: str) -> 'types.Image':
+        """Load image file as types.Image with bytes and mime type."""
+        img_path = Path(img_path_str)
+        mime_type, _ = mimetypes.guess_type(str(img_path))
+        return types.Image(image_bytes=img_path.read_bytes(), mime_type=mime_type or 'image/png')
+
+    first_frame = None
+    if reference_images:
+        first_frame = load_image(reference_images[0])
+        if len(reference_images) >= 2:
+            config_params['last_frame'] = load_image(reference_images[1])
+
+    return {
+        'model': model,
+        'prompt': prompt,
+        'image': first_frame,
+        'config': types.GenerateVideosConfig(**config_params)
+    }
+
+
+def video_output_dir() -> Path:
+    """<project-root>/docs/assets, where generated videos are saved."""
+    script_dir = Path(__file__).parent
+    project_root = script_dir
+    for parent in [script_dir] + list(script_dir.parents):
+        if (parent / '.git').exists() or (parent / '.claude').exists():
+            project_root = parent
+            break
+
+    output_dir = project_root / 'docs' / 'assets'
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def save_veo_video(client, operation, output_file: Path) -> float:
+    """Download the finished operation's video to output_file; return size in MB."""
+    if getattr(operation, 'error', None):
+        raise RuntimeError(f"Video generation failed: {operation.error}")
+    generated_videos = getattr(operation.response, 'generated_videos', None)
+    if not generated_videos:
+        raise RuntimeError("Video generation returned no video (possibly filtered)")
+
+    generated_video = generated_videos[0]
+    client.files.download(file=generated_video.video)
+    generated_video.video.save(str(output_file))
+    return output_file.stat().st_size / (1024 * 1024)
+
+
+@dataclass
+class _PendingOperation:
+    operation: Any
+    future: asyncio.Future
+    next_poll: float
+    interval: float = MIN_POLL_INTERVAL
+    failures: int = 0
+
+
+@dataclass
+class VeoJob:
+    """One video to generate."""
+    prompt: str
+    model: str
+    resolution: str = '1080p'
+    aspect_ratio: str = '16:9'
+    reference_images: Optional[List[str]] = field(default=None)
+
+
+class VeoOperationManager:
+    """Run many Veo jobs concurrently from one event loop.
+
+    Args:
+        client: genai.Client (its .aio client submits and polls)
+        max_in_flight: Jobs generating at the same time (Veo quotas are low)
+        min_poll_interval, max_poll_interval, backoff: Adaptive polling bounds
+    """
+
+    def __init__(
+        self,
+        client,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        min_poll_interval: float = MIN_POLL_INTERVAL,
+        max_poll_interval: float = MAX_POLL_INTERVAL,
+        backoff: float = POLL_BACKOFF,
+        output_dir: Optional[Path] = None,
+        verbose: bool = False
+    ):
+        self.client = client
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.output_dir = output_dir
+        self.verbose = verbose
+        self._pending: List[_PendingOperation] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def run(self, jobs: List[VeoJob]) -> List[Dict[str, Any]]:
+        """Generate all jobs; results are returned in job order."""
+        return asyncio.run(self.generate(jobs))
+
+    async def generate(self, jobs: List[VeoJob]) -> List[Dict[str, Any]]:
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        if self.output_dir is None:
+            self.output_dir = video_output_dir()
+
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        poller = asyncio.create_task(self._poll_loop())
+        try:
+            return await asyncio.gather(*(self._run_job(i, job, semaphore)
+                                          for i, job in enumerate(jobs, 1)))
+        finally:
+            poller.cancel()
+
+    async def _run_job(self, index: int, job: VeoJob, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        start = time.time()
+        try:
+            async with semaphore:
+                request = build_veo_request(job.prompt, job.model, job.resolution,
+                                            job.aspect_ratio, job.reference_images)
+                operation = await self.client.aio.models.generate_videos(**request)
+                if self.verbose:
+                    print(f"  [{index}] Submitted: {job.prompt[:60]}")
+                operation = await self._wait(operation)
+            duration = time.time() - start
+
+            # Download off the event loop so polling of other jobs continues
+            output_file = self.output_dir / f"veo_generated_{int(start)}_{index}.mp4"
+            file_size = await asyncio.to_thread(save_veo_video, self.client, operation, output_file)
+            if self.verbose:
+                print(f"  [{index}] Generated in {duration:.1f}s: {output_file}")
+
+            return {
+                'status': 'success',
+                'prompt': job.prompt,
+                'generated_video': str(output_file),
+                'generation_time': duration,
+                'file_size_mb': file_size,
+                'model': job.model
+            }
+        except Exception as e:
+            if self.verbose:
+                print(f"  [{index}] Error: {e}")
+            return {
+                'status': 'error',
+                'prompt': job.prompt,
+                'error': str(e)
+            }
+
+    async def _wait(self, operation) -> Any:
+        """Hand the operation to the poll loop and wait until it is done."""
+        if operation.done:
+            return operation
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingOperation(
+            operation=operation,
+            future=future,
+            next_poll=loop.time() + self.min_poll_interval,
+            interval=self.min_poll_interval
+        ))
+        self._wakeup.set()
+        return await future
+
+    async def _poll_loop(self) -> None:
+        """Poll every due operation together, then sleep until the next one is due."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            due = [p for p in self._pending if p.next_poll <= now]
+            if not due:
+                timeout = min((p.next_poll for p in self._pending), default=now + 3600) - now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            refreshed = await asyncio.gather(
+                *(self.client.aio.operations.get(p.operation) for p in due),
+                return_exceptions=True
+            )
+            now = loop.time()
+            for pending, operation in zip(due, refreshed):
+                if isinstance(operation, Exception):
+                    pending.failures += 1
+                    if pending.failures >= MAX_POLL_FAILURES:
+                        self._pending.remove(pending)
+                        pending.future.set_exception(operation)
+                        continue
+                elif operation.done:
+                    self._pending.remove(pending)
+                    pending.future.set_result(operation)
+                    continue
+                else:
+                    pending.operation = operation
+                    pending.failures = 0
+                pending.interval = min(pending.interval * self.backoff, self.max_poll_interval)
+                pending.next_poll = now + pending.interval
@@ -4,22 +4,233 @@ Batch image resizing with multiple strategies.
 
 Supports aspect ratio maintenance, smart cropping, thumbnail generation,
 watermarks, format conversion, and parallel processing.
+
+Backends: ImageMagick (one `magick` process per image) or, optionally,
+Pillow in-process with JPEG shrink-on-load, which avoids process spawn cost
+on large directories of small images. Pillow falls back to ImageMagick for
+anything it can't handle (animated images, unsupported formats, modes a
+format can't store such as CMYK PNG).
+
+Renditions: several sizes/formats of each source (e.g. thumbnail, medium
+and large, as webp and jpg) from a single decode, via an ImageMagick
+`mpr:` chain or one in-memory Pillow image.
 """
 
 import argparse
 import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
+
+from build_manifest import BuildManifest, default_manifest_path, file_sha256
+
+try:
+    from PIL import Image, UnidentifiedImageError
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Formats the Pillow backend reads and writes; everything else goes to ImageMagick
+PILLOW_FORMATS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff', '.tif', '.gif'}
+BACKENDS = ('magick', 'pillow', 'auto')
+STRATEGIES = ('fit', 'fill', 'cover', 'exact', 'thumbnail')
+
+
+@dataclass
+class Rendition:
+    """One output size/format written for every source image."""
+    name: str
+    width: Optional[int]
+    height: Optional[int]
+    strategy: str = 'fit'
+    format: Optional[str] = None  # Output extension; None keeps the source's
+
+    def output_path(self, input_path: Path, output_dir: Path) -> Path:
+        ext = f".{self.format}" if self.format else input_path.suffix
+        return output_dir / f"{input_path.stem}-{self.name}{ext}"
+
+
+def parse_renditions(spec: str) -> List[Rendition]:
+    """Parse 'name:WxH[:strategy[:format]],...'.
+
+    Example: 'thumb:200x200:thumbnail:webp,medium:800x:fit:jpg,large:1600x'
+    """
+    renditions = []
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        fields = item.split(':')
+        if len(fields) < 2 or len(fields) > 4 or not fields[0] or 'x' not in fields[1]:
+            raise ValueError(f"Invalid rendition '{item}' (expected name:WxH[:strategy[:format]])")
+        w, h = fields[1].split('x', 1)
+        strategy = fields[2] if len(fields) > 2 and fields[2] else 'fit'
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Invalid strategy '{strategy}' in rendition '{item}'")
+        if not w and not h:
+            raise ValueError(f"Rendition '{item}' needs a width or height")
+        renditions.append(Rendition(
+            name=fields[0],
+            width=int(w) if w else None,
+            height=int(h) if h else None,
+            strategy=strategy,
+            format=fields[3].lstrip('.').lower() if len(fields) > 3 and fields[3] else None
+        ))
+    if not renditions:
+        raise ValueError("No renditions given")
+    return renditions
+
+
+def _target_geometry(
+    src_width: int,
+    src_height: int,
+    width: Optional[int],
+    height: Optional[int],
+    strategy: str
+) -> Tuple[Tuple[int, int], Optional[Tuple[int, int]]]:
+    """Resize size and optional center-crop size, matching the ImageMagick geometry."""
+    if strategy == 'thumbnail':
+        width = height = width or height or 200
+        strategy = 'fill'
+
+    if strategy in ('fill', 'cover', 'exact') and (not width or not height):
+        raise ValueError(f"Both width and height required for '{strategy}' strategy")
+
+    if strategy == 'exact':
+        return (width, height), None
+
+    if strategy == 'fit':
+        scale = min(s for s in (width and width / src_width, height and height / src_height) if s)
+    else:  # fill, cover
+        scale = max(width / src_width, height / src_height)
+
+    size = (max(1, round(src_width * scale)), max(1, round(src_height * scale)))
+    return size, (width, height) if strategy == 'fill' else None
+
+
+def pillow_resize(
+    input_path: Path,
+    output_path: Path,
+    width: Optional[int],
+    height: Optional[int],
+    strategy: str = 'fit',
+    quality: int = 85,
+    watermark: Optional[Path] = None
+) -> bool:
+    """Resize one image in-process with Pillow.
+
+    Returns False (without writing anything) when the image should go to
+    ImageMagick instead.
+    """
+    return pillow_renditions(input_path, [(output_path, width, height, strategy)],
+                             quality, watermark)
+
+
+def pillow_renditions(
+    input_path: Path,
+    outputs: List[Tuple[Path, Optional[int], Optional[int], str]],
+    quality: int = 85,
+    watermark: Optional[Path] = None
+) -> bool:
+    """Write every (output_path, width, height, strategy) from one decode.
+
+    Returns False when the image should go to ImageMagick instead; it then
+    rewrites every output, including any Pillow already saved.
+    """
+    if (input_path.suffix.lower() not in PILLOW_FORMATS
+            or any(out[0].suffix.lower() not in PILLOW_FORMATS for out in outputs)):
+        return False
+
+    try:
+        with Image.open(input_path) as img:
+            if getattr(img, 'is_animated', False):
+                return False  # ImageMagick resizes every frame
+            geometries = [_target_geometry(img.width, img.height, w, h, strategy)
+                          for _, w, h, strategy in outputs]
+
+            # JPEG shrink-on-load: decode at 1/2, 1/4 or 1/8 scale when that
+            # still covers the largest target; resize() then finishes with
+            # reduce() steps (reducing_gap) before the final Lanczos pass
+            img.draft(img.mode, (max(size[0] for size, _ in geometries),
+                                 max(size[1] for size, _ in geometries)))
+            if img.mode in ('1', 'P'):
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            img.load()
+            rendered = [img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+                        for size, _ in geometries]
+    except (UnidentifiedImageError, OSError):
+        return False
+
+    mark = None
+    if watermark:
+        with Image.open(watermark) as wm:
+            mark = wm.convert('RGBA')
+
+    for (output_path, *_), (_, crop), resized in zip(outputs, geometries, rendered):
+        if crop:
+            left = (resized.width - crop[0]) // 2
+            top = (resized.height - crop[1]) // 2
+            resized = resized.crop((left, top, left + crop[0], top + crop[1]))
+
+        if mark:
+            # A mark larger than the rendition is pinned to the top-left corner
+            position = (max(0, resized.width - mark.width - 10),
+                        max(0, resized.height - mark.height - 10))
+            resized.paste(mark, position, mark)
+
+        try:
+            _pillow_save(resized, output_path, quality)
+        except (OSError, ValueError):
+            # e.g. CMYK as PNG/WebP or I;16 as JPEG
+            output_path.unlink(missing_ok=True)
+            return False
+    return True
+
+
+def _pillow_save(img, output_path: Path, quality: int) -> None:
+    """Save like `magick -quality Q -strip` (no metadata is copied)."""
+    ext = output_path.suffix.lower()
+    params = {}
+    if ext in ('.jpg', '.jpeg'):
+        if img.mode not in ('RGB', 'L', 'CMYK'):
+            # JPEG has no alpha: flatten onto white
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.split()[3])
+        params['quality'] = quality
+    elif ext == '.webp':
+        params['quality'] = quality
+    elif ext == '.png':
+        params['compress_level'] = min(9, quality // 10)
+    img.save(output_path, **params)
+
+
+def _pillow_job(job: tuple) -> Tuple[str, Optional[str]]:
+    """Process-pool entry point: ('done' | 'fallback' | 'error', error message)."""
+    try:
+        return ('done' if pillow_resize(*job) else 'fallback'), None
+    except Exception as e:
+        return 'error', str(e)
+
+
+def _pillow_renditions_job(job: tuple) -> Tuple[str, Optional[str]]:
+    """Like _pillow_job, for (input_path, outputs, quality, watermark)."""
+    try:
+        return ('done' if pillow_renditions(*job) else 'fallback'), None
+    except Exception as e:
+        return 'error', str(e)
 
 
 class ImageResizer:
-    """Handle image resizing operations using ImageMagick."""
+    """Handle image resizing operations using ImageMagick or Pillow."""
 
-    def __init__(self, verbose: bool = False, dry_run: bool = False):
+    def __init__(self, verbose: bool = False, dry_run: bool = False, backend: str = 'magick'):
         self.verbose = verbose
         self.dry_run = dry_run
+        self.backend = backend
+
+    def use_pillow(self) -> bool:
+        """Whether images go through the in-process Pillow backend first."""
+        return self.backend in ('pillow', 'auto') and PIL_AVAILABLE and not self.dry_run
 
     def check_imagemagick(self) -> bool:
         """Check if ImageMagick is available."""
@@ -46,6 +257,47 @@ class ImageResizer:
     ) -> List[str]:
         """Build ImageMagick resize command based on strategy."""
         cmd = ['magick', str(input_path)]
+        cmd.extend(self._resize_ops(width, height, strategy))
+        cmd.extend(self._watermark_ops(watermark))
+
+        # Output settings
+        cmd.extend([
+            '-quality', str(quality),
+            '-strip',
+            str(output_path)
+        ])
+
+        return cmd
+
+    def build_renditions_command(
+        self,
+        input_path: Path,
+        outputs: List[Tuple[Path, Rendition]],
+        quality: int,
+        watermark: Optional[Path] = None
+    ) -> List[str]:
+        """Build one ImageMagick command writing every rendition from a single decode.
+
+        The source is decoded once into the `mpr:src` memory register; each
+        rendition is a parenthesized branch that reads the register, resizes
+        and writes its own file.
+        """
+        cmd = ['magick', str(input_path), '-write', 'mpr:src', '+delete']
+        for i, (output_path, rendition) in enumerate(outputs):
+            branch = ['mpr:src']
+            branch.extend(self._resize_ops(rendition.width, rendition.height, rendition.strategy))
+            branch.extend(self._watermark_ops(watermark))
+            branch.extend(['-quality', str(quality), '-strip'])
+            if i < len(outputs) - 1:
+                cmd.extend(['(', *branch, '-write', str(output_path), '+delete', ')'])
+            else:
+                cmd.extend([*branch, str(output_path)])
+        return cmd
+
+    @staticmethod
+    def _resize_ops(width: Optional[int], height: Optional[int], strategy: str) -> List[str]:
+        """ImageMagick operators for a resize strategy."""
+        cmd = []
 
         # Apply resize strategy
         if strategy == 'fit':
@@ -84,24 +336,20 @@ class ImageResizer:
                 '-extent', f'{size}x{size}'
             ])
 
-        # Add watermark if specified
-        if watermark:
-            cmd.extend([
-                str(watermark),
-                '-gravity', 'southeast',
-                '-geometry', '+10+10',
-                '-composite'
-            ])
-
-        # Output settings
-        cmd.extend([
-            '-quality', str(quality),
-            '-strip',
-            str(output_path)
-        ])
-
         return cmd
 
+    @staticmethod
+    def _watermark_ops(watermark: Optional[Path]) -> List[str]:
+        """ImageMagick operators overlaying the watermark at the bottom right."""
+        if not watermark:
+            return []
+        return [
+            str(watermark),
+            '-gravity', 'southeast',
+            '-geometry', '+10+10',
+            '-composite'
+        ]
+
     def resize_image(
         self,
         input_path: Path,
@@ -113,6 +361,29 @@ class ImageResizer:
         watermark: Optional[Path] = None
     ) -> bool:
         """Resize a single image."""
+        if self.use_pillow():
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            status, error = _pillow_job((input_path, output_path, width, height,
+                                         strategy, quality, watermark))
+            if status == 'done':
+                return True
+            if status == 'error':
+                print(f"Error processing {input_path}: {error}", file=sys.stderr)
+                return False
+
+        return self._resize_with_magick(input_path, output_path, width, height,
+                                        strategy, quality, watermark)
+
+    def _resize_with_magick(
+        self,
+        input_path: Path,
+        output_path: Path,
+        width: Optional[int],
+        height: Optional[int],
+        strategy: str,
+        quality: int,
+        watermark: Optional[Path]
+    ) -> bool:
         try:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -145,6 +416,153 @@ class ImageResizer:
             print(f"Error processing {input_path}: {e}", file=sys.stderr)
             return False
 
+    def render_renditions(
+        self,
+        input_path: Path,
+        outputs: List[Tuple[Path, Rendition]],
+        quality: int = 85,
+        watermark: Optional[Path] = None
+    ) -> bool:
+        """Write every rendition of one image from a single decode."""
+        if self.use_pillow():
+            status, error = _pillow_renditions_job(self._renditions_job(input_path, outputs,
+                                                                        quality, watermark))
+            if status == 'done':
+                return True
+            if status == 'error':
+                print(f"Error processing {input_path}: {error}", file=sys.stderr)
+                return False
+
+        return self._renditions_with_magick(input_path, outputs, quality, watermark)
+
+    @staticmethod
+    def _renditions_job(input_path, outputs, quality, watermark) -> tuple:
+        """Picklable _pillow_renditions_job arguments (creates the output dirs)."""
+        for output_path, _ in outputs:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        return (input_path,
+                [(path, r.width, r.height, r.strategy) for path, r in outputs],
+                quality, watermark)
+
+    def _renditions_with_magick(
+        self,
+        input_path: Path,
+        outputs: List[Tuple[Path, Rendition]],
+        quality: int,
+        watermark: Optional[Path]
+    ) -> bool:
+        try:
+            for output_path, _ in outputs:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            cmd = self.build_renditions_command(input_path, outputs, quality, watermark)
+
+            if self.verbose or self.dry_run:
+                print(f"Command: {' '.join(cmd)}")
+
+            if self.dry_run:
+                return True
+
+            subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE if not self.verbose else None,
+                stderr=subprocess.PIPE if not self.verbose else None,
+                check=True
+            )
+            return True
+
+        except subprocess.CalledProcessError as e:
+            print(f"Error resizing {input_path}: {e}", file=sys.stderr)
+            if not self.verbose and e.stderr:
+                print(e.stderr.decode(), file=sys.stderr)
+            return False
+        except Exception as e:
+            print(f"Error processing {input_path}: {e}", file=sys.stderr)
+            return False
+
+    def batch_renditions(
+        self,
+        input_paths: List[Path],
+        output_dir: Path,
+        renditions: List[Rendition],
+        quality: int = 85,
+        watermark: Optional[Path] = None,
+        parallel: int = 1,
+        manifest: Optional[BuildManifest] = None
+    ) -> Tuple[int, int]:
+        """Write every rendition of every image, decoding each source once.
+
+        Outputs are named <stem>-<rendition name>.<ext>. Counts are per source
+        image. With a manifest, a source is skipped when all of its renditions
+        are unchanged.
+        """
+        success_count = 0
+        fail_count = 0
+        jobs = []
+        watermark_hash = file_sha256(watermark) if manifest is not None and watermark else None
+
+        def params(rendition: Rendition) -> dict:
+            return {
+                'tool': 'batch_resize', 'width': rendition.width, 'height': rendition.height,
+                'strategy': rendition.strategy, 'quality': quality, 'watermark': watermark_hash
+            }
+
+        for input_path in input_paths:
+            if not input_path.exists() or not input_path.is_file():
+                fail_count += 1
+                continue
+            outputs = [(r.output_path(input_path, output_dir), r) for r in renditions]
+            if manifest is not None and all(manifest.is_current(input_path, path, params(r), count=False)
+                                            for path, r in outputs):
+                if self.verbose:
+                    print(f"Skipping unchanged {input_path.name}")
+                manifest.skipped += 1
+                success_count += 1
+                continue
+            jobs.append((input_path, outputs))
+
+        def finished(input_path: Path, outputs: List[Tuple[Path, Rendition]], success: bool,
+                     backend: str = '') -> None:
+            nonlocal success_count, fail_count
+            if not success:
+                fail_count += 1
+                return
+            if not self.dry_run:
+                names = ', '.join(path.name for path, _ in outputs)
+                print(f"Processing {input_path.name} -> {names}{backend}")
+            success_count += 1
+            if manifest is not None and not self.dry_run:
+                for path, rendition in outputs:
+                    manifest.record(input_path, path, params(rendition))
+
+        fallbacks = jobs
+        if self.use_pillow() and parallel > 1:
+            # Pillow work is CPU-bound Python: use processes, ImageMagick for leftovers
+            fallbacks = []
+            pillow_jobs = [self._renditions_job(i, o, quality, watermark) for i, o in jobs]
+            chunksize = max(1, len(jobs) // (parallel * 8))
+            with ProcessPoolExecutor(max_workers=parallel) as executor:
+                results = executor.map(_pillow_renditions_job, pillow_jobs, chunksize=chunksize)
+                for (input_path, outputs), (status, error) in zip(jobs, results):
+                    if status == 'fallback':
+                        fallbacks.append((input_path, outputs))
+                        continue
+                    if status == 'error':
+                        print(f"Error processing {input_path}: {error}", file=sys.stderr)
+                    finished(input_path, outputs, status == 'done')
+            render = lambda i, o: self._renditions_with_magick(i, o, quality, watermark)
+            backend = ' (ImageMagick)'
+        else:
+            render = lambda i, o: self.render_renditions(i, o, quality, watermark)
+            backend = ''
+
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+            futures = [executor.submit(render, i, o) for i, o in fallbacks]
+            for (input_path, outputs), future in zip(fallbacks, futures):
+                finished(input_path, outputs, future.result(), backend)
+
+        return success_count, fail_count
+
     def batch_resize(
         self,
         input_paths: List[Path],
@@ -155,10 +573,46 @@ class ImageResizer:
         quality: int = 85,
         format_ext: Optional[str] = None,
         watermark: Optional[Path] = None,
-        parallel: int = 1
+        parallel: int = 1,
+        manifest: Optional[BuildManifest] = None
     ) -> Tuple[int, int]:
-        """Resize multiple images."""
-        success_count = 0
+        """Resize multiple images.
+
+        With the Pillow backend, `parallel` worker processes are used (Pillow
+        work is CPU-bound Python; threads would serialize on the GIL).
+
+        With a manifest, images whose content and options are unchanged since
+        the last run are skipped (and counted as succeeded).
+        """
+        skipped = 0
+        on_built = None
+        if manifest is not None:
+            params = {
+                'tool': 'batch_resize', 'width': width, 'height': height,
+                'strategy': strategy, 'quality': quality,
+                'watermark': file_sha256(watermark) if watermark else None
+            }
+            pending = []
+            for input_path in input_paths:
+                output_path = self._output_path(input_path, output_dir, format_ext)
+                if input_path.is_file() and manifest.is_current(input_path, output_path, params):
+                    if self.verbose:
+                        print(f"Skipping unchanged {input_path.name}")
+                    skipped += 1
+                else:
+                    pending.append(input_path)
+            input_paths = pending
+            if not self.dry_run:
+                on_built = lambda i, o: manifest.record(i, o, params)
+
+        if self.use_pillow() and parallel > 1:
+            success_count, fail_count = self._batch_resize_pillow(
+                input_paths, output_dir, width, height, strategy,
+                quality, format_ext, watermark, parallel, on_built
+            )
+            return success_count + skipped, fail_count
+
+        success_count = skipped
         fail_count = 0
 
         def process_image(input_path: Path) -> Tuple[Path, bool]:
@@ -166,12 +620,7 @@ class ImageResizer:
             if not input_path.exists() or not input_path.is_file():
                 return input_path, False
 
-            # Determine output path
-            output_name = input_path.stem
-            if format_ext:
-                output_path = output_dir / f"{output_name}.{format_ext.lstrip('.')}"
-            else:
-                output_path = output_dir / input_path.name
+            output_path = self._output_path(input_path, output_dir, format_ext)
 
             if not self.dry_run:
                 print(f"Processing {input_path.name} -> {output_path.name}")
@@ -180,6 +629,8 @@ class ImageResizer:
                 input_path, output_path, width, height,
                 strategy, quality, watermark
             )
+            if success and on_built:
+                on_built(input_path, output_path)
 
             return input_path, success
 
@@ -204,6 +655,69 @@ class ImageResizer:
 
         return success_count, fail_count
 
+    @staticmethod
+    def _output_path(input_path: Path, output_dir: Path, format_ext: Optional[str]) -> Path:
+        if format_ext:
+            return output_dir / f"{input_path.stem}.{format_ext.lstrip('.')}"
+        return output_dir / input_path.name
+
+    def _batch_resize_pillow(
+        self,
+        input_paths: List[Path],
+        output_dir: Path,
+        width: Optional[int],
+        height: Optional[int],
+        strategy: str,
+        quality: int,
+        format_ext: Optional[str],
+        watermark: Optional[Path],
+        parallel: int,
+        on_built: Optional[Callable[[Path, Path], None]] = None
+    ) -> Tuple[int, int]:
+        """Resize on a process pool; leftovers Pillow can't handle go to ImageMagick."""
+        success_count = 0
+        fail_count = 0
+        jobs = []
+
+        for input_path in input_paths:
+            if not input_path.exists() or not input_path.is_file():
+                fail_count += 1
+                continue
+            output_path = self._output_path(input_path, output_dir, format_ext)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((input_path, output_path, width, height, strategy, quality, watermark))
+
+        fallbacks = []
+        # Batch several small images per round trip to the workers
+        chunksize = max(1, len(jobs) // (parallel * 8))
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            for job, (status, error) in zip(jobs, executor.map(_pillow_job, jobs, chunksize=chunksize)):
+                input_path, output_path = job[0], job[1]
+                if status == 'done':
+                    print(f"Processing {input_path.name} -> {output_path.name}")
+                    success_count += 1
+                    if on_built:
+                        on_built(input_path, output_path)
+                elif status == 'fallback':
+                    fallbacks.append(job)
+                else:
+                    print(f"Error processing {input_path}: {error}", file=sys.stderr)
+                    fail_count += 1
+
+        if fallbacks:
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                futures = [executor.submit(self._resize_with_magick, *job) for job in fallbacks]
+                for job, future in zip(fallbacks, futures):
+                    if future.result():
+                        print(f"Processing {job[0].name} -> {job[1].name} (ImageMagick)")
+                        success_count += 1
+                        if on_built:
+                            on_built(job[0], job[1])
+                    else:
+                        fail_count += 1
+
+        return success_count, fail_count
+
 
 def collect_images(paths: List[Path], recursive: bool = False) -> List[Path]:
     """Collect image files from paths."""
@@ -252,7 +766,7 @@ def main():
     )
     parser.add_argument(
         '-s', '--strategy',
-        choices=['fit', 'fill', 'cover', 'exact', 'thumbnail'],
+        choices=STRATEGIES,
         default='fit',
         help='Resize strategy (default: fit)'
     )
@@ -266,6 +780,13 @@ def main():
         '-f', '--format',
         help='Output format (e.g., jpg, png, webp)'
     )
+    parser.add_argument(
+        '--renditions',
+        help='Write several sizes/formats per image from one decode: '
+             'name:WxH[:strategy[:format]],... '
+             '(e.g. thumb:200x200:thumbnail:webp,medium:800x:fit:jpg,large:1600x); '
+             'overrides -w/-h/-s/-f'
+    )
     parser.add_argument(
         '-wm', '--watermark',
         type=Path,
@@ -277,6 +798,23 @@ def main():
         default=1,
         help='Number of parallel processes (default: 1)'
     )
+    parser.add_argument(
+        '-b', '--backend',
+        choices=BACKENDS,
+        default='magick',
+        help='magick (default), pillow (in-process, ImageMagick fallback), '
+             'or auto (pillow when installed)'
+    )
+    parser.add_argument(
+        '-i', '--incremental',
+        action='store_true',
+        help='Skip images whose content and options are unchanged since the last run'
+    )
+    parser.add_argument(
+        '--manifest',
+        type=Path,
+        help='Manifest file for --incremental (default: <output>/.media-manifest.json)'
+    )
     parser.add_argument(
         '-r', '--recursive',
         action='store_true',
@@ -295,18 +833,30 @@ def main():
 
     args = parser.parse_args()
 
+    if args.renditions:
+        try:
+            args.renditions = parse_renditions(args.renditions)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Validate dimensions
-    if not args.width and not args.img_height:
+    if not args.renditions and not args.width and not args.img_height:
         print("Error: At least one of --width or --height required", file=sys.stderr)
         sys.exit(1)
 
     # Initialize resizer
-    resizer = ImageResizer(verbose=args.verbose, dry_run=args.dry_run)
+    resizer = ImageResizer(verbose=args.verbose, dry_run=args.dry_run, backend=args.backend)
 
     # Check dependencies
-    if not resizer.check_imagemagick():
-        print("Error: ImageMagick not found", file=sys.stderr)
+    if args.backend == 'pillow' and not PIL_AVAILABLE:
+        print("Error: Pillow not installed (pip install pillow)", file=sys.stderr)
         sys.exit(1)
+    if not resizer.check_imagemagick():
+        if not resizer.use_pillow():
+            print("Error: ImageMagick not found", file=sys.stderr)
+            sys.exit(1)
+        print("Warning: ImageMagick not found; images Pillow can't handle will fail",
+              file=sys.stderr)
 
     # Collect input images
     images = collect_images(args.inputs, args.recursive)
@@ -321,19 +871,41 @@ def main():
     if not args.dry_run:
         args.output.mkdir(parents=True, exist_ok=True)
 
+    manifest = None
+    if args.incremental:
+        manifest = BuildManifest(args.manifest or default_manifest_path(args.output))
+
     # Process images
-    success, fail = resizer.batch_resize(
-        images,
-        args.output,
-        args.width,
-        args.img_height,
-        args.strategy,
-        args.quality,
-        args.format,
-        args.watermark,
-        args.parallel
-    )
+    try:
+        if args.renditions:
+            success, fail = resizer.batch_renditions(
+                images,
+                args.output,
+                args.renditions,
+                args.quality,
+                args.watermark,
+                args.parallel,
+                manifest
+            )
+        else:
+            success, fail = resizer.batch_resize(
+                images,
+                args.output,
+                args.width,
+                args.img_height,
+                args.strategy,
+                args.quality,
+                args.format,
+                args.watermark,
+                args.parallel,
+                manifest
+            )
+    finally:
+        if manifest and not args.dry_run:
+            manifest.save()  # Keep what finished even if interrupted
 
+    if manifest:
+        print(f"Skipped {manifest.skipped} unchanged image(s)")
     print(f"\nResults: {success} succeeded, {fail} failed")
     sys.exit(0 if fail == 0 else 1)
 
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Incremental-build manifest shared by batch_resize.py and media_convert.py.
+
+For every output the manifest records the input's SHA-256 (plus size/mtime
+as a fast path), the options that produced it, and the output's size/mtime.
+On a re-run, outputs whose input content, options and output file are all
+unchanged are skipped.
+
+Stored as JSON, by default in the output directory (.media-manifest.json).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+MANIFEST_NAME = '.media-manifest.json'
+MANIFEST_VERSION = 1
+
+
+# (path, size, mtime_ns) -> digest, so a source with several outputs
+# (e.g. renditions) is read and hashed once per run
+_hash_memo: Dict[tuple, str] = {}
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents, memoized until the file changes."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+class BuildManifest:
+    """Input hash + options -> output records for skip-unchanged runs."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self._entries = data.get('outputs', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def is_current(
+        self,
+        input_path: Path,
+        output_path: Path,
+        params: Dict[str, Any],
+        count: bool = True
+    ) -> bool:
+        """True if output_path was built from this exact input content with these options.
+
+        Adds to `skipped` unless count is False (callers skipping several
+        outputs as one unit count themselves).
+        """
+        key = str(Path(output_path).resolve())
+        entry = self._entries.get(key)
+        if not entry or entry.get('params') != params:
+            return False
+
+        try:
+            out_stat = os.stat(output_path)
+            in_stat = os.stat(input_path)
+        except OSError:
+            return False
+        if [out_stat.st_size, out_stat.st_mtime_ns] != entry.get('output_stat'):
+            return False  # Output was deleted, edited or rebuilt elsewhere
+
+        # Fast path: untouched input. Otherwise (e.g. fresh checkout) compare content
+        if [in_stat.st_size, in_stat.st_mtime_ns] != entry.get('input_stat'):
+            try:
+                if file_sha256(Path(input_path)) != entry.get('input_sha256'):
+                    return False
+            except OSError:
+                return False
+            with self._lock:
+                entry['input_stat'] = [in_stat.st_size, in_stat.st_mtime_ns]
+
+        if count:
+            with self._lock:
+                self.skipped += 1
+        return True
+
+    def record(self, input_path: Path, output_path: Path, params: Dict[str, Any]) -> None:
+        """Remember that output_path was just built from input_path with params."""
+        try:
+            in_stat = os.stat(input_path)
+            out_stat = os.stat(output_path)
+            digest = file_sha256(Path(input_path))
+        except OSError:
+            return
+        with self._lock:
+            self._entries[str(Path(output_path).resolve())] = {
+                'input': str(Path(input_path).resolve()),
+                'input_sha256': digest,
+                'input_stat': [in_stat.st_size, in_stat.st_mtime_ns],
+                'output_stat': [out_stat.st_size, out_stat.st_mtime_ns],
+                'params': params
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            data = {'version': MANIFEST_VERSION, 'outputs': self._entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Best-effort: the next run just rebuilds more
+
+
+def default_manifest_path(output_dir: Optional[Path]) -> Path:
+    """Manifest location for a run writing into output_dir (cwd for in-place output)."""
+    return (Path(output_dir) if output_dir else Path.cwd()) / MANIFEST_NAME
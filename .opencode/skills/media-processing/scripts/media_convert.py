@@ -3,15 +3,23 @@
 Unified media conversion tool for video, audio, and images.
 
 Auto-detects format and applies appropriate tool (FFmpeg or ImageMagick).
-Supports quality presets, batch processing, and dry-run mode.
+Supports quality presets, batch processing (optionally in parallel,
+longest jobs first, with progress and ETA), incremental runs that skip
+unchanged inputs, and dry-run mode.
 """
 
 import argparse
+import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from build_manifest import BuildManifest, default_manifest_path
+from probe_cache import get_probe_cache
 
 # Format mappings
 VIDEO_FORMATS = {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv', '.m4v'}
@@ -40,6 +48,10 @@ QUALITY_PRESETS = {
     }
 }
 
+# Threads given to each ffmpeg job in parallel batches; the pool size is
+# CPU cores divided by this, so concurrent jobs don't oversubscribe the CPU
+DEFAULT_THREADS_PER_JOB = 2
+
 
 def check_dependencies() -> Tuple[bool, bool]:
     """Check if ffmpeg and imagemagick are available."""
@@ -75,28 +87,33 @@ def detect_media_type(file_path: Path) -> str:
 def build_video_command(
     input_path: Path,
     output_path: Path,
-    preset: str = 'web'
+    preset: str = 'web',
+    threads: Optional[int] = None
 ) -> List[str]:
     """Build FFmpeg command for video conversion."""
     quality = QUALITY_PRESETS[preset]
 
-    return [
+    cmd = [
         'ffmpeg', '-i', str(input_path),
         '-c:v', 'libx264',
         '-preset', quality['video_preset'],
         '-crf', str(quality['video_crf']),
         '-c:a', 'aac',
         '-b:a', quality['audio_bitrate'],
-        '-movflags', '+faststart',
-        '-y',
-        str(output_path)
+        '-movflags', '+faststart'
     ]
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+
+    cmd.extend(['-y', str(output_path)])
+    return cmd
 
 
 def build_audio_command(
     input_path: Path,
     output_path: Path,
-    preset: str = 'web'
+    preset: str = 'web',
+    threads: Optional[int] = None
 ) -> List[str]:
     """Build FFmpeg command for audio conversion."""
     quality = QUALITY_PRESETS[preset]
@@ -120,6 +137,9 @@ def build_audio_command(
     if codec not in ['flac', 'pcm_s16le']:
         cmd.extend(['-b:a', quality['audio_bitrate']])
 
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+
     cmd.extend(['-y', str(output_path)])
     return cmd
 
@@ -145,9 +165,13 @@ def convert_file(
     output_path: Path,
     preset: str = 'web',
     dry_run: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    threads: Optional[int] = None
 ) -> bool:
-    """Convert a single media file."""
+    """Convert a single media file.
+
+    threads caps ffmpeg's worker threads (used when several jobs run at once).
+    """
     media_type = detect_media_type(input_path)
 
     if media_type == 'unknown':
@@ -159,9 +183,9 @@ def convert_file(
 
     # Build command based on media type
     if media_type == 'video':
-        cmd = build_video_command(input_path, output_path, preset)
+        cmd = build_video_command(input_path, output_path, preset, threads)
     elif media_type == 'audio':
-        cmd = build_audio_command(input_path, output_path, preset)
+        cmd = build_audio_command(input_path, output_path, preset, threads)
     else:  # image
         cmd = build_image_command(input_path, output_path, preset)
 
@@ -189,17 +213,103 @@ def convert_file(
         return False
 
 
+def probe_durations(file_paths: List[Path]) -> List[float]:
+    """Durations in seconds, probed concurrently through the shared probe cache.
+
+    0.0 for images and for files ffprobe can't read.
+    """
+    durations = [0.0] * len(file_paths)
+    media = [i for i, path in enumerate(file_paths) if detect_media_type(path) in ('video', 'audio')]
+    probed = get_probe_cache().probe_many([file_paths[i] for i in media])
+    for i, data in zip(media, probed):
+        try:
+            durations[i] = float(data['format'].get('duration', 0))
+        except (ValueError, KeyError, TypeError):
+            pass
+    return durations
+
+
+def default_jobs(threads_per_job: int = DEFAULT_THREADS_PER_JOB) -> int:
+    """Parallel jobs that fit the CPU: cores // threads per ffmpeg job."""
+    return max(1, (os.cpu_count() or 1) // max(1, threads_per_job))
+
+
+def _format_eta(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+class BatchProgress:
+    """Aggregate progress, throughput and ETA, weighted by media duration.
+
+    Images (no duration) count as one second of work each.
+    """
+
+    def __init__(self, weights: List[float], clock=time.monotonic):
+        self.total_jobs = len(weights)
+        self.total_work = sum(weights)
+        self.done_jobs = 0
+        self.done_work = 0.0
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+
+    def update(self, weight: float, label: str) -> str:
+        """Record a finished job; return the progress line."""
+        with self._lock:
+            self.done_jobs += 1
+            self.done_work += weight
+            elapsed = max(self._clock() - self._start, 1e-6)
+            rate = self.done_work / elapsed  # Media seconds per wall second
+            remaining = self.total_work - self.done_work
+            percent = 100.0 * self.done_work / self.total_work if self.total_work else 100.0
+            eta = _format_eta(remaining / rate) if rate > 0 else '?'
+            return (f"[{self.done_jobs}/{self.total_jobs}] {percent:.1f}% | "
+                    f"{rate:.1f}x realtime, {self.done_jobs * 60 / elapsed:.1f} files/min | "
+                    f"ETA {eta} | {label}")
+
+
+def _output_path_for(
+    input_path: Path,
+    output_dir: Optional[Path],
+    output_format: Optional[str]
+) -> Optional[Path]:
+    """Output path for a batch input, or None if no format was given for in-place output."""
+    if output_dir:
+        if output_format:
+            return output_dir / f"{input_path.stem}.{output_format.lstrip('.')}"
+        return output_dir / input_path.name
+    if output_format:
+        return input_path.with_suffix(f".{output_format.lstrip('.')}")
+    return None
+
+
 def batch_convert(
     input_paths: List[Path],
     output_dir: Optional[Path] = None,
     output_format: Optional[str] = None,
     preset: str = 'web',
     dry_run: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    jobs: int = 1,
+    threads_per_job: int = DEFAULT_THREADS_PER_JOB,
+    manifest: Optional[BuildManifest] = None
 ) -> Tuple[int, int]:
-    """Convert multiple files."""
+    """Convert multiple files.
+
+    With jobs > 1 (0 = CPU cores // threads_per_job) conversions run
+    concurrently, longest first by ffprobe duration so a long clip doesn't
+    start last and hold up the batch, and aggregate progress/ETA is printed
+    as jobs finish.
+
+    With a manifest, files whose content and preset are unchanged since the
+    last run are skipped (and counted as succeeded).
+    """
     success_count = 0
     fail_count = 0
+    tasks = []
+    params = {'tool': 'media_convert', 'preset': preset, 'format': output_format}
 
     for input_path in input_paths:
         if not input_path.exists():
@@ -207,27 +317,64 @@ def batch_convert(
             fail_count += 1
             continue
 
-        # Determine output path
-        if output_dir:
-            output_name = input_path.stem
-            if output_format:
-                output_path = output_dir / f"{output_name}.{output_format.lstrip('.')}"
-            else:
-                output_path = output_dir / input_path.name
-        else:
-            if output_format:
-                output_path = input_path.with_suffix(f".{output_format.lstrip('.')}")
+        output_path = _output_path_for(input_path, output_dir, output_format)
+        if output_path is None:
+            print(f"Error: No output format specified for {input_path}", file=sys.stderr)
+            fail_count += 1
+            continue
+
+        if manifest is not None and manifest.is_current(input_path, output_path, params):
+            if verbose:
+                print(f"Skipping unchanged {input_path.name}")
+            success_count += 1
+            continue
+
+        tasks.append((input_path, output_path))
+
+    def converted(input_path: Path, output_path: Path) -> None:
+        if manifest is not None and not dry_run:
+            manifest.record(input_path, output_path, params)
+
+    if jobs == 0:
+        jobs = default_jobs(threads_per_job)
+
+    if jobs <= 1 or len(tasks) <= 1 or dry_run:
+        for input_path, output_path in tasks:
+            print(f"Converting {input_path.name} -> {output_path.name}")
+
+            if convert_file(input_path, output_path, preset, dry_run, verbose):
+                success_count += 1
+                converted(input_path, output_path)
             else:
-                print(f"Error: No output format specified for {input_path}", file=sys.stderr)
                 fail_count += 1
-                continue
 
-        print(f"Converting {input_path.name} -> {output_path.name}")
-
-        if convert_file(input_path, output_path, preset, dry_run, verbose):
-            success_count += 1
-        else:
-            fail_count += 1
+        return success_count, fail_count
+
+    # Longest job first: probe durations (in parallel), images sort by size
+    durations = probe_durations([i for i, _ in tasks])
+    order = sorted(range(len(tasks)),
+                   key=lambda k: (durations[k], tasks[k][0].stat().st_size),
+                   reverse=True)
+    weights = [durations[k] or 1.0 for k in range(len(tasks))]
+    progress = BatchProgress(weights)
+    print(f"Converting {len(tasks)} files with {jobs} parallel jobs "
+          f"({threads_per_job} threads each), longest first")
+
+    def run(k: int) -> bool:
+        input_path, output_path = tasks[k]
+        success = convert_file(input_path, output_path, preset, dry_run, verbose, threads_per_job)
+        if success:
+            converted(input_path, output_path)
+        status = f"{input_path.name} -> {output_path.name}" + ("" if success else " FAILED")
+        print(progress.update(weights[k], status))
+        return success
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for success in executor.map(run, order):
+            if success:
+                success_count += 1
+            else:
+                fail_count += 1
 
     return success_count, fail_count
 
@@ -258,6 +405,28 @@ def main():
         default='web',
         help='Quality preset (default: web)'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Parallel conversions for batches (0 = CPU cores / --threads-per-job, default: 1)'
+    )
+    parser.add_argument(
+        '--threads-per-job',
+        type=int,
+        default=DEFAULT_THREADS_PER_JOB,
+        help=f'FFmpeg threads per parallel job (default: {DEFAULT_THREADS_PER_JOB})'
+    )
+    parser.add_argument(
+        '-i', '--incremental',
+        action='store_true',
+        help='Skip inputs whose content and preset are unchanged since the last run'
+    )
+    parser.add_argument(
+        '--manifest',
+        type=Path,
+        help='Manifest file for --incremental (default: <output>/.media-manifest.json)'
+    )
     parser.add_argument(
         '-n', '--dry-run',
         action='store_true',
@@ -271,6 +440,9 @@ def main():
 
     args = parser.parse_args()
 
+    if args.jobs < 0 or args.threads_per_job < 1:
+        parser.error("--jobs must be >= 0 and --threads-per-job >= 1")
+
     # Check dependencies
     ffmpeg_ok, magick_ok = check_dependencies()
     if not ffmpeg_ok and not magick_ok:
@@ -294,15 +466,28 @@ def main():
         if not args.output:
             output_dir = None  # Will convert in place with new format
 
-        success, fail = batch_convert(
-            args.inputs,
-            output_dir,
-            args.format,
-            args.preset,
-            args.dry_run,
-            args.verbose
-        )
-
+        manifest = None
+        if args.incremental:
+            manifest = BuildManifest(args.manifest or default_manifest_path(output_dir))
+
+        try:
+            success, fail = batch_convert(
+                args.inputs,
+                output_dir,
+                args.format,
+                args.preset,
+                args.dry_run,
+                args.verbose,
+                args.jobs,
+                args.threads_per_job,
+                manifest
+            )
+        finally:
+            if manifest and not args.dry_run:
+                manifest.save()  # Keep what finished even if interrupted
+
+        if manifest:
+            print(f"Skipped {manifest.skipped} unchanged file(s)")
         print(f"\nResults: {success} succeeded, {fail} failed")
         sys.exit(0 if fail == 0 else 1)
 
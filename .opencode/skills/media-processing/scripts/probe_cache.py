@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+ffprobe cache for the media-processing scripts.
+
+The cache itself lives in .opencode/scripts/media_probe_cache.py and is
+shared with ai-multimodal (same keys, same $MEDIA_PROBE_CACHE store). When
+this skill is installed without it, every call runs ffprobe.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'scripts'))
+try:
+    from media_probe_cache import PROBE_WORKERS, ProbeCache, get_probe_cache
+    PROBE_CACHE_AVAILABLE = True
+except ImportError:
+    # Fallback if the shared cache is not available: probe without caching
+    import json
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    PROBE_CACHE_AVAILABLE = False
+    PROBE_WORKERS = 8
+
+    class ProbeCache:
+        """Uncached stand-in with the shared ProbeCache interface."""
+
+        def __init__(self, path=None):
+            self.path = None
+
+        def lookup(self, file_path):
+            return None
+
+        def probe(self, file_path):
+            result = subprocess.run(['ffprobe', '-v', 'quiet', '-print_format', 'json',
+                                     '-show_format', '-show_streams', str(file_path)],
+                                    capture_output=True, text=True, check=True)
+            return json.loads(result.stdout)
+
+        def probe_many(self, file_paths, max_workers=PROBE_WORKERS):
+            def safe_probe(file_path):
+                try:
+                    return self.probe(file_path)
+                except (subprocess.CalledProcessError, OSError, ValueError):
+                    return None
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(safe_probe, file_paths))
+
+        def save(self):
+            pass
+
+    def get_probe_cache():
+        return ProbeCache()
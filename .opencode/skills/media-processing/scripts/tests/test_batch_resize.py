@@ -10,7 +10,8 @@ import pytest
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from batch_resize import ImageResizer, collect_images
+from batch_resize import ImageResizer, Rendition, collect_images, parse_renditions
+from build_manifest import BuildManifest
 
 
 class TestImageResizer:
@@ -368,5 +369,257 @@ class TestResizeStrategies:
         assert "!" in geometry
 
 
+
+class TestPillowBackend:
+    """Test the in-process Pillow backend."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        pytest.importorskip("PIL")
+        self.resizer = ImageResizer(backend="pillow")
+
+    def make_image(self, path, size=(400, 200), mode="RGB"):
+        from PIL import Image
+        Image.new(mode, size, "red").save(path)
+        return path
+
+    def output_size(self, path):
+        from PIL import Image
+        with Image.open(path) as img:
+            return img.size
+
+    @pytest.mark.parametrize("strategy,width,height,expected", [
+        ("fit", 100, None, (100, 50)),
+        ("fit", 100, 100, (100, 50)),
+        ("fill", 100, 100, (100, 100)),
+        ("cover", 100, 100, (200, 100)),
+        ("exact", 100, 100, (100, 100)),
+        ("thumbnail", 64, None, (64, 64)),
+    ])
+    @patch("subprocess.run")
+    def test_strategies_match_imagemagick_geometry(self, mock_run, tmp_path,
+                                                   strategy, width, height, expected):
+        """Test each strategy yields the ImageMagick output size without spawning magick."""
+        src = self.make_image(tmp_path / "in.jpg")
+        out = tmp_path / "out.jpg"
+
+        assert self.resizer.resize_image(src, out, width, height, strategy, 80) is True
+        assert self.output_size(out) == expected
+        mock_run.assert_not_called()
+
+    def test_watermark_and_alpha_flatten(self, tmp_path):
+        """Test watermark is composited and alpha is flattened for JPEG."""
+        from PIL import Image
+        src = self.make_image(tmp_path / "in.png", mode="RGBA")
+        mark = tmp_path / "mark.png"
+        Image.new("RGBA", (20, 20), (0, 0, 255, 255)).save(mark)
+        out = tmp_path / "out.jpg"
+
+        assert self.resizer.resize_image(src, out, 200, None, "fit", 90, mark) is True
+        with Image.open(out) as img:
+            assert img.mode == "RGB"
+            r, g, b = img.getpixel((200 - 15, 100 - 15))
+            assert b > 200 and r < 50
+
+    def test_oversized_watermark_is_clamped(self, tmp_path):
+        """Test a mark larger than the rendition is pasted from the top-left corner."""
+        from PIL import Image
+        src = self.make_image(tmp_path / "in.png")
+        mark = tmp_path / "mark.png"
+        corner = Image.new("RGBA", (150, 80), (0, 0, 0, 0))
+        corner.paste((0, 0, 255, 255), (0, 0, 5, 5))
+        corner.save(mark)
+        out = tmp_path / "out.png"
+
+        assert self.resizer.resize_image(src, out, 100, None, "fit", 90, mark) is True
+        with Image.open(out) as img:
+            assert img.getpixel((0, 0))[:3] == (0, 0, 255)
+
+    @patch.object(ImageResizer, "_resize_with_magick", return_value=True)
+    def test_save_error_falls_back(self, mock_magick, tmp_path):
+        """Test a mode the output format can't store goes to ImageMagick."""
+        src = self.make_image(tmp_path / "in.jpg", mode="CMYK")
+        out = tmp_path / "out.png"
+
+        assert self.resizer.resize_image(src, out, 100, None) is True
+        mock_magick.assert_called_once()
+        assert not out.exists()
+
+    @patch.object(ImageResizer, "_resize_with_magick", return_value=False)
+    def test_failed_fallback_is_not_reported_done(self, mock_magick, tmp_path, capsys):
+        """Test an ImageMagick fallback that fails is counted and not printed as processed."""
+        from PIL import Image
+        frames = [Image.new("RGB", (40, 40), c) for c in ("red", "blue")]
+        gifs = [tmp_path / f"anim{i}.gif" for i in range(2)]
+        for gif in gifs:
+            frames[0].save(gif, save_all=True, append_images=frames[1:])
+
+        success, fail = self.resizer.batch_resize(gifs, tmp_path / "out", 20, None, parallel=2)
+
+        assert (success, fail) == (0, 2)
+        assert "(ImageMagick)" not in capsys.readouterr().out
+
+    @patch.object(ImageResizer, "_resize_with_magick", return_value=True)
+    def test_batch_uses_process_pool_and_falls_back(self, mock_magick, tmp_path):
+        """Test a parallel batch resizes with Pillow and hands animated GIFs to ImageMagick."""
+        from PIL import Image
+        images = [self.make_image(tmp_path / f"img{i}.jpg") for i in range(4)]
+        frames = [Image.new("RGB", (40, 40), c) for c in ("red", "blue")]
+        gif = tmp_path / "anim.gif"
+        frames[0].save(gif, save_all=True, append_images=frames[1:])
+
+        success, fail = self.resizer.batch_resize(
+            images + [gif], tmp_path / "out", 100, None, parallel=2
+        )
+
+        assert (success, fail) == (5, 0)
+        assert self.output_size(tmp_path / "out" / "img0.jpg") == (100, 50)
+        mock_magick.assert_called_once()
+        assert mock_magick.call_args[0][0] == gif
+
+
+class TestIncrementalResize:
+    """Test skip-unchanged runs with a build manifest."""
+
+    @staticmethod
+    def fake_resize(input_path, output_path, *args):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(b"resized:" + input_path.read_bytes())
+        return True
+
+    def run(self, images, output_dir, manifest_path, width=800):
+        manifest = BuildManifest(manifest_path)
+        resizer = ImageResizer(verbose=False, dry_run=False)
+        with patch.object(ImageResizer, "resize_image", side_effect=self.fake_resize) as mock_resize:
+            result = resizer.batch_resize(images, output_dir, width, None, manifest=manifest)
+        manifest.save()
+        return result, [c.args[0].name for c in mock_resize.call_args_list]
+
+    def test_skips_unchanged_and_rebuilds_changed(self, tmp_path):
+        """Test only edited images, or all images after an option change, are redone."""
+        images = [tmp_path / "a.jpg", tmp_path / "b.jpg"]
+        for img in images:
+            img.write_bytes(img.name.encode())
+        output_dir = tmp_path / "out"
+        manifest_path = output_dir / ".media-manifest.json"
+
+        assert self.run(images, output_dir, manifest_path) == ((2, 0), ["a.jpg", "b.jpg"])
+        assert self.run(images, output_dir, manifest_path) == ((2, 0), [])
+
+        images[1].write_bytes(b"edited")
+        assert self.run(images, output_dir, manifest_path) == ((2, 0), ["b.jpg"])
+
+        assert self.run(images, output_dir, manifest_path, width=400)[1] == ["a.jpg", "b.jpg"]
+
+    def test_deleted_output_is_rebuilt(self, tmp_path):
+        """Test a missing output is rebuilt even though the input is unchanged."""
+        image = tmp_path / "a.jpg"
+        image.write_bytes(b"a")
+        output_dir = tmp_path / "out"
+        manifest_path = output_dir / ".media-manifest.json"
+
+        self.run([image], output_dir, manifest_path)
+        (output_dir / "a.jpg").unlink()
+
+        assert self.run([image], output_dir, manifest_path)[1] == ["a.jpg"]
+
+
+
+class TestRenditions:
+    """Test multi-rendition output from a single decode."""
+
+    RENDITIONS = "thumb:64x64:thumbnail:webp,medium:200x:fit:jpg,large:300x"
+
+    def test_parse_renditions(self):
+        """Test the name:WxH[:strategy[:format]] spec."""
+        thumb, medium, large = parse_renditions(self.RENDITIONS)
+        assert thumb == Rendition("thumb", 64, 64, "thumbnail", "webp")
+        assert medium == Rendition("medium", 200, None, "fit", "jpg")
+        assert large == Rendition("large", 300, None, "fit", None)
+        assert large.output_path(Path("a/photo.png"), Path("out")) == Path("out/photo-large.png")
+
+    @pytest.mark.parametrize("spec", ["thumb", "thumb:200", "thumb:x", "t:1x1:squash", ""])
+    def test_parse_renditions_rejects_bad_spec(self, spec):
+        """Test malformed specs raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_renditions(spec)
+
+    def test_magick_command_decodes_once(self):
+        """Test the command reads the source once and branches from mpr:src."""
+        resizer = ImageResizer()
+        renditions = parse_renditions(self.RENDITIONS)
+        outputs = [(r.output_path(Path("in.jpg"), Path("out")), r) for r in renditions]
+
+        cmd = resizer.build_renditions_command(Path("in.jpg"), outputs, 80)
+
+        assert cmd[:5] == ["magick", "in.jpg", "-write", "mpr:src", "+delete"]
+        assert cmd.count("in.jpg") == 1
+        assert cmd.count("mpr:src") == 4
+        assert cmd.count("(") == 2
+        assert cmd[-1] == str(Path("out/in-large.jpg"))
+        assert cmd[cmd.index(str(Path("out/in-thumb.webp"))) - 1] == "-write"
+
+    @patch("subprocess.run")
+    def test_batch_renditions_runs_one_magick_per_image(self, mock_run, tmp_path):
+        """Test each source image costs one magick process regardless of rendition count."""
+        images = [tmp_path / "a.jpg", tmp_path / "b.jpg"]
+        for img in images:
+            img.touch()
+        resizer = ImageResizer()
+
+        success, fail = resizer.batch_renditions(images, tmp_path / "out",
+                                                 parse_renditions(self.RENDITIONS))
+
+        assert (success, fail) == (2, 0)
+        assert mock_run.call_count == 2
+
+    @patch("subprocess.run")
+    def test_manifest_hashes_each_source_once(self, mock_run, tmp_path):
+        """Test recording every rendition of a source reads and hashes it once."""
+        import hashlib
+
+        def fake_magick(cmd, **kwargs):
+            for arg in cmd:
+                if arg.startswith(str(tmp_path / "out")):
+                    Path(arg).write_bytes(b"rendition")
+        mock_run.side_effect = fake_magick
+        image = tmp_path / "a.jpg"
+        image.write_bytes(b"source")
+        manifest = BuildManifest(tmp_path / "out" / ".media-manifest.json")
+        (tmp_path / "out").mkdir()
+
+        with patch("build_manifest.hashlib.sha256", wraps=hashlib.sha256) as mock_sha:
+            ImageResizer().batch_renditions([image], tmp_path / "out",
+                                            parse_renditions(self.RENDITIONS), manifest=manifest)
+
+        assert mock_sha.call_count == 1
+        assert len({entry["input_sha256"] for entry in manifest._entries.values()}) == 1
+        assert len(manifest._entries) == 3
+
+    def test_pillow_renditions_single_open(self, tmp_path):
+        """Test Pillow writes every rendition after opening the source once."""
+        pytest.importorskip("PIL")
+        from PIL import Image
+        src = tmp_path / "photo.jpg"
+        Image.new("RGB", (800, 400), "red").save(src)
+        resizer = ImageResizer(backend="pillow")
+        renditions = parse_renditions(self.RENDITIONS)
+        outputs = [(r.output_path(src, tmp_path / "out"), r) for r in renditions]
+
+        with patch("batch_resize.Image.open", wraps=Image.open) as mock_open:
+            assert resizer.render_renditions(src, outputs) is True
+        assert mock_open.call_count == 1
+
+        sizes = {}
+        for path, _ in outputs:
+            with Image.open(path) as img:
+                sizes[path.name] = (img.format, img.size)
+        assert sizes == {
+            "photo-thumb.webp": ("WEBP", (64, 64)),
+            "photo-medium.jpg": ("JPEG", (200, 100)),
+            "photo-large.jpg": ("JPEG", (300, 150)),
+        }
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Tests for media_convert.py"""
 
+import os
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -11,13 +12,17 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from media_convert import (
+    BatchProgress,
+    batch_convert,
     build_audio_command,
     build_image_command,
     build_video_command,
     check_dependencies,
     convert_file,
+    default_jobs,
     detect_media_type,
 )
+from build_manifest import BuildManifest, file_sha256
 
 
 class TestMediaTypeDetection:
@@ -215,6 +220,103 @@ class TestFileConversion:
         assert result is False
 
 
+class TestParallelBatchConvert:
+    """Test parallel batch conversion."""
+
+    def test_video_command_threads(self):
+        """Test ffmpeg threads are capped only when requested."""
+        assert "-threads" not in build_video_command(Path("in.mp4"), Path("out.mp4"))
+        cmd = build_video_command(Path("in.mp4"), Path("out.mp4"), threads=2)
+        assert cmd[cmd.index("-threads") + 1] == "2"
+
+    @patch("media_convert.os.cpu_count", return_value=8)
+    def test_default_jobs_divides_cores(self, mock_cpu):
+        """Test pool size is cores divided by threads per job."""
+        assert default_jobs(2) == 4
+        assert default_jobs(16) == 1
+
+    @patch("media_convert.convert_file", return_value=True)
+    @patch("media_convert.probe_durations")
+    def test_longest_jobs_start_first(self, mock_probe, mock_convert, tmp_path):
+        """Test jobs are dispatched in descending duration order."""
+        durations = {"short.mp4": 10.0, "long.mp4": 600.0, "mid.mp4": 120.0}
+        inputs = []
+        for name in durations:
+            path = tmp_path / name
+            path.write_bytes(b"\x00")
+            inputs.append(path)
+        mock_probe.side_effect = lambda paths: [durations[p.name] for p in paths]
+
+        success, fail = batch_convert(inputs, tmp_path / "out", "webm", jobs=2)
+
+        assert (success, fail) == (3, 0)
+        # Two workers take the two longest jobs; the shortest is queued last
+        started = [call.args[0].name for call in mock_convert.call_args_list]
+        assert set(started[:2]) == {"long.mp4", "mid.mp4"}
+        assert started[2] == "short.mp4"
+        assert all(call.args[5] == 2 for call in mock_convert.call_args_list)
+
+    def test_progress_eta(self):
+        """Test progress is weighted by duration and ETA follows throughput."""
+        now = [0.0]
+        progress = BatchProgress([300.0, 100.0], clock=lambda: now[0])
+        now[0] = 100.0  # 300s of media in 100s = 3x realtime
+        line = progress.update(300.0, "a.mp4 -> a.webm")
+        assert "[1/2] 75.0%" in line
+        assert "3.0x realtime" in line
+        assert "ETA 0m33s" in line
+
+
+
+class TestIncrementalConvert:
+    """Test skip-unchanged batch conversion."""
+
+    @staticmethod
+    def fake_convert(input_path, output_path, *args):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(input_path.read_bytes())
+        return True
+
+    def test_second_run_skips_unchanged(self, tmp_path):
+        """Test a re-run only converts inputs that changed."""
+        inputs = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        for path in inputs:
+            path.write_bytes(path.name.encode())
+        manifest_path = tmp_path / "out" / ".media-manifest.json"
+
+        def run(preset="web"):
+            manifest = BuildManifest(manifest_path)
+            with patch("media_convert.convert_file", side_effect=self.fake_convert) as mock_convert:
+                result = batch_convert(inputs, tmp_path / "out", "mp3", preset, manifest=manifest)
+            manifest.save()
+            return result, [c.args[0].name for c in mock_convert.call_args_list]
+
+        assert run() == ((2, 0), ["a.wav", "b.wav"])
+        assert run() == ((2, 0), [])
+
+        inputs[0].write_bytes(b"new take")
+        assert run() == ((2, 0), ["a.wav"])
+        assert run(preset="archive")[1] == ["a.wav", "b.wav"]
+
+    def test_touched_but_identical_input_is_skipped(self, tmp_path):
+        """Test an input with a new mtime but the same content is not reconverted."""
+        source = tmp_path / "a.wav"
+        source.write_bytes(b"audio")
+        output = tmp_path / "a.mp3"
+        output.write_bytes(b"converted")
+        params = {"tool": "media_convert", "preset": "web", "format": "mp3"}
+
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        manifest.record(source, output, params)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert manifest.is_current(source, output, params)
+        assert manifest.is_current(source, output, dict(params, preset="archive")) is False
+        assert manifest.skipped == 1
+        assert manifest._entries[str(output.resolve())]["input_sha256"] == file_sha256(source)
+
+
 class TestQualityPresets:
     """Test quality preset functionality."""
 
@@ -11,6 +11,7 @@ import pytest
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from probe_cache import ProbeCache
 from video_optimize import VideoInfo, VideoOptimizer
 
 
@@ -325,6 +326,147 @@ class TestVideoOptimizer:
         assert result is False
 
 
+
+class TestLadder:
+    """Test single-decode ABR ladder encoding."""
+
+    def make_info(self, path="input.mp4", width=1920, height=1080):
+        return VideoInfo(
+            path=Path(path),
+            duration=60.0,
+            width=width,
+            height=height,
+            bitrate=5000000,
+            fps=30.0,
+            size=40000000,
+            codec="h264",
+            audio_codec="aac",
+            audio_bitrate=128000
+        )
+
+    @patch("subprocess.run")
+    @patch.object(VideoOptimizer, "get_video_info")
+    def test_ladder_single_ffmpeg_with_split(self, mock_get_info, mock_run, tmp_path):
+        """Test every rendition comes from one ffmpeg run and is reported as VideoInfo."""
+        mock_get_info.side_effect = lambda path: self.make_info(
+            path, *{"input.mp4": (1920, 1080), "input_1080p.mp4": (1920, 1080),
+                    "input_720p.mp4": (1280, 720), "input_480p.mp4": (852, 480)}[path.name])
+        mock_run.return_value = MagicMock(returncode=0)
+
+        renditions = VideoOptimizer().optimize_ladder(Path("input.mp4"), tmp_path)
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count("-i") == 1
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.startswith("[0:v]split=3[v0][v1][v2]")
+        assert "[v1]scale=1280:720[out1]" in graph
+        assert cmd.count("libx264") == 3
+        assert str(tmp_path / "input_480p.mp4") in cmd
+        assert [(r.path.name, r.height) for r in renditions] == [
+            ("input_1080p.mp4", 1080), ("input_720p.mp4", 720), ("input_480p.mp4", 480)]
+
+    @patch("subprocess.run")
+    @patch.object(VideoOptimizer, "get_video_info")
+    def test_ladder_dry_run(self, mock_get_info, mock_run, tmp_path):
+        """Test dry run prints the command without encoding anything."""
+        mock_get_info.return_value = self.make_info(width=1280, height=720)
+
+        result = VideoOptimizer(dry_run=True).optimize_ladder(
+            Path("input.mp4"), tmp_path, heights=[1080, 720, 480])
+
+        assert result == []
+        mock_run.assert_not_called()
+
+    @patch("subprocess.run")
+    @patch.object(VideoOptimizer, "get_video_info")
+    def test_ladder_never_upscales(self, mock_get_info, mock_run, tmp_path):
+        """Test a 720p source yields 720p and 480p renditions only."""
+        mock_get_info.return_value = self.make_info(width=1280, height=720)
+        mock_run.return_value = MagicMock(returncode=0)
+
+        VideoOptimizer().optimize_ladder(Path("input.mp4"), tmp_path, heights=[1080, 720, 480])
+
+        cmd = mock_run.call_args[0][0]
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph == "[0:v]split=2[v0][v1];[v0]scale=1280:720[out0];[v1]scale=852:480[out1]"
+        assert str(tmp_path / "input_1080p.mp4") not in cmd
+
+    @patch("subprocess.run")
+    @patch.object(VideoOptimizer, "get_video_info")
+    def test_ladder_failure(self, mock_get_info, mock_run, tmp_path):
+        """Test a failed encode returns None."""
+        import subprocess
+        mock_get_info.return_value = self.make_info()
+        mock_run.side_effect = subprocess.CalledProcessError(1, "ffmpeg")
+
+        assert VideoOptimizer().optimize_ladder(Path("input.mp4"), tmp_path) is None
+
+
+
+class TestProbeCache:
+    """Test the shared ffprobe cache."""
+
+    PROBE = {
+        "streams": [{"codec_type": "video", "codec_name": "h264", "width": 640,
+                     "height": 360, "r_frame_rate": "25/1"}],
+        "format": {"duration": "10.0", "bit_rate": "800000", "size": "1000000"}
+    }
+
+    def probe_result(self, *args, **kwargs):
+        return MagicMock(stdout=json.dumps(self.PROBE), returncode=0)
+
+    @patch("subprocess.run")
+    def test_unchanged_file_probed_once(self, mock_run, tmp_path):
+        """Test repeated lookups (e.g. optimize + compare) reuse one ffprobe call."""
+        mock_run.side_effect = self.probe_result
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"video")
+        optimizer = VideoOptimizer(probe_cache=ProbeCache())
+
+        first = optimizer.get_video_info(video)
+        second = optimizer.get_video_info(video)
+
+        assert first == second and first.width == 640
+        assert mock_run.call_count == 1
+
+        video.write_bytes(b"edited video")
+        optimizer.get_video_info(video)
+        assert mock_run.call_count == 2
+
+    @patch("subprocess.run")
+    def test_disk_store_survives_restart(self, mock_run, tmp_path):
+        """Test probes saved to disk are reused by a new cache instance."""
+        mock_run.side_effect = self.probe_result
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"video")
+        store = tmp_path / "probes.json"
+
+        cache = ProbeCache(store)
+        cache.probe(video)
+        cache.save()
+        assert ProbeCache(store).probe(video) == self.PROBE
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_probe_many_keeps_order_and_reports_failures(self, mock_run, tmp_path):
+        """Test batch probing returns results in input order with None for failures."""
+        import subprocess
+
+        def run(cmd, **kwargs):
+            if cmd[-1].endswith("bad.mp4"):
+                raise subprocess.CalledProcessError(1, cmd)
+            return self.probe_result()
+        mock_run.side_effect = run
+        paths = [tmp_path / f"{name}.mp4" for name in ("a", "bad", "c")]
+        for path in paths:
+            path.write_bytes(path.name.encode())
+
+        results = ProbeCache().probe_many(paths)
+
+        assert results == [self.PROBE, None, self.PROBE]
+
+
 class TestVideoInfo:
     """Test VideoInfo dataclass."""
 
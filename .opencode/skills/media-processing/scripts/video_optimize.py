@@ -3,16 +3,22 @@
 Video size optimization with quality/size balance.
 
 Supports resolution reduction, frame rate adjustment, audio bitrate optimization,
-multi-pass encoding, and comparison metrics.
+multi-pass encoding, comparison metrics, and ABR ladders (several resolutions
+encoded from a single decode).
 """
 
 import argparse
-import json
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from probe_cache import PROBE_WORKERS, ProbeCache, get_probe_cache
+
+# Default ABR ladder (rendition heights)
+DEFAULT_LADDER = (1080, 720, 480)
 
 
 @dataclass
@@ -33,9 +39,16 @@ class VideoInfo:
 class VideoOptimizer:
     """Handle video optimization operations using FFmpeg."""
 
-    def __init__(self, verbose: bool = False, dry_run: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        dry_run: bool = False,
+        probe_cache: Optional[ProbeCache] = None
+    ):
         self.verbose = verbose
         self.dry_run = dry_run
+        # Shared, so a file probed before/after encoding and in compare_videos runs ffprobe once
+        self.probe_cache = probe_cache or get_probe_cache()
 
     def check_ffmpeg(self) -> bool:
         """Check if FFmpeg is available."""
@@ -51,54 +64,52 @@ class VideoOptimizer:
             return False
 
     def get_video_info(self, input_path: Path) -> Optional[VideoInfo]:
-        """Extract video information using ffprobe."""
+        """Extract video information using ffprobe (cached per unchanged file)."""
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                str(input_path)
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, check=True)
-            data = json.loads(result.stdout)
-
-            # Find video and audio streams
-            video_stream = None
-            audio_stream = None
-
-            for stream in data['streams']:
-                if stream['codec_type'] == 'video' and not video_stream:
-                    video_stream = stream
-                elif stream['codec_type'] == 'audio' and not audio_stream:
-                    audio_stream = stream
-
-            if not video_stream:
-                return None
-
-            # Parse frame rate
-            fps_parts = video_stream.get('r_frame_rate', '0/1').split('/')
-            fps = float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else 0
-
-            return VideoInfo(
-                path=input_path,
-                duration=float(data['format'].get('duration', 0)),
-                width=int(video_stream.get('width', 0)),
-                height=int(video_stream.get('height', 0)),
-                bitrate=int(data['format'].get('bit_rate', 0)),
-                fps=fps,
-                size=int(data['format'].get('size', 0)),
-                codec=video_stream.get('codec_name', 'unknown'),
-                audio_codec=audio_stream.get('codec_name', 'none') if audio_stream else 'none',
-                audio_bitrate=int(audio_stream.get('bit_rate', 0)) if audio_stream else 0
-            )
-
+            return self._parse_video_info(input_path, self.probe_cache.probe(input_path))
         except Exception as e:
             print(f"Error getting video info: {e}", file=sys.stderr)
             return None
 
+    def get_video_infos(self, input_paths: List[Path]) -> List[Optional[VideoInfo]]:
+        """Video information for many files, probed concurrently; None where it fails."""
+        if len(input_paths) <= 1:
+            return [self.get_video_info(p) for p in input_paths]
+        with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+            return list(executor.map(self.get_video_info, input_paths))
+
+    @staticmethod
+    def _parse_video_info(input_path: Path, data: Dict[str, Any]) -> Optional[VideoInfo]:
+        # Find video and audio streams
+        video_stream = None
+        audio_stream = None
+
+        for stream in data['streams']:
+            if stream['codec_type'] == 'video' and not video_stream:
+                video_stream = stream
+            elif stream['codec_type'] == 'audio' and not audio_stream:
+                audio_stream = stream
+
+        if not video_stream:
+            return None
+
+        # Parse frame rate
+        fps_parts = video_stream.get('r_frame_rate', '0/1').split('/')
+        fps = float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else 0
+
+        return VideoInfo(
+            path=input_path,
+            duration=float(data['format'].get('duration', 0)),
+            width=int(video_stream.get('width', 0)),
+            height=int(video_stream.get('height', 0)),
+            bitrate=int(data['format'].get('bit_rate', 0)),
+            fps=fps,
+            size=int(data['format'].get('size', 0)),
+            codec=video_stream.get('codec_name', 'unknown'),
+            audio_codec=audio_stream.get('codec_name', 'none') if audio_stream else 'none',
+            audio_bitrate=int(audio_stream.get('bit_rate', 0)) if audio_stream else 0
+        )
+
     def calculate_target_resolution(
         self,
         width: int,
@@ -267,6 +278,77 @@ class VideoOptimizer:
                 for log_file in Path('.').glob('ffmpeg2pass-*.log*'):
                     log_file.unlink(missing_ok=True)
 
+    def optimize_ladder(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        heights: Sequence[int] = DEFAULT_LADDER,
+        target_fps: Optional[float] = None,
+        crf: int = 23,
+        audio_bitrate: str = '128k',
+        preset: str = 'medium'
+    ) -> Optional[List[VideoInfo]]:
+        """Encode an ABR ladder from a single decode of the input.
+
+        One ffmpeg process decodes the source once and a `split` filter feeds
+        one scaler + libx264 encoder per rendition, instead of decoding the
+        source again for every resolution. Renditions are never upscaled
+        (rungs above the source collapse into one at source size) and are
+        written as <stem>_<height>p.mp4 in output_dir.
+
+        Returns VideoInfo for each rendition written (empty in dry-run mode),
+        or None on failure.
+        """
+        info = self.get_video_info(input_path)
+        if not info:
+            print(f"Error: Could not read video info for {input_path}", file=sys.stderr)
+            return None
+
+        sizes = []
+        for height in sorted(heights, reverse=True):
+            size = self.calculate_target_resolution(info.width, info.height, None, height)
+            if size not in sizes:
+                sizes.append(size)
+
+        outputs = [output_dir / f"{input_path.stem}_{h}p.mp4" for _, h in sizes]
+
+        # [0:v] -> split -> one scale per rendition
+        graph = [f"[0:v]split={len(sizes)}" + ''.join(f"[v{i}]" for i in range(len(sizes)))]
+        graph += [f"[v{i}]scale={w}:{h}[out{i}]" for i, (w, h) in enumerate(sizes)]
+        cmd = ['ffmpeg', '-y', '-i', str(input_path), '-filter_complex', ';'.join(graph)]
+
+        for i, output_path in enumerate(outputs):
+            cmd.extend(['-map', f'[out{i}]', '-map', '0:a?'])
+            if target_fps and target_fps < info.fps:
+                cmd.extend(['-r', str(target_fps)])
+            cmd.extend([
+                '-c:v', 'libx264',
+                '-preset', preset,
+                '-crf', str(crf),
+                '-c:a', 'aac',
+                '-b:a', audio_bitrate,
+                '-movflags', '+faststart',
+                str(output_path)
+            ])
+
+        if self.verbose or self.dry_run:
+            print(f"Command: {' '.join(cmd)}")
+
+        if self.dry_run:
+            return []
+
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            subprocess.run(cmd, check=True, capture_output=not self.verbose)
+        except subprocess.CalledProcessError as e:
+            print(f"Error encoding ladder: {e}", file=sys.stderr)
+            return None
+        except Exception as e:
+            print(f"Error encoding ladder: {e}", file=sys.stderr)
+            return None
+
+        return [r for r in self.get_video_infos(outputs) if r]
+
     def compare_videos(self, original: Path, optimized: Path) -> None:
         """Compare original and optimized videos."""
         orig_info = self.get_video_info(original)
@@ -315,7 +397,14 @@ def main():
         '-o', '--output',
         type=Path,
         required=True,
-        help='Output video file'
+        help='Output video file (output directory with --ladder)'
+    )
+    parser.add_argument(
+        '--ladder',
+        nargs='?',
+        const=','.join(str(h) for h in DEFAULT_LADDER),
+        help='Encode an ABR ladder of comma-separated heights from one decode '
+             f"(default: {','.join(str(h) for h in DEFAULT_LADDER)})"
     )
     parser.add_argument(
         '-w', '--max-width',
@@ -386,6 +475,32 @@ def main():
         print("Error: FFmpeg not found", file=sys.stderr)
         sys.exit(1)
 
+    if args.ladder:
+        try:
+            heights = [int(h) for h in args.ladder.split(',') if h.strip()]
+        except ValueError:
+            parser.error(f"Invalid --ladder heights: {args.ladder}")
+
+        print(f"Encoding {args.input.name} ladder: {', '.join(f'{h}p' for h in heights)}...")
+        renditions = optimizer.optimize_ladder(
+            args.input,
+            args.output,
+            heights,
+            args.fps,
+            args.crf,
+            args.audio_bitrate,
+            args.preset
+        )
+        if renditions is None:
+            sys.exit(1)
+
+        for info in renditions:
+            print(f"  {info.path.name}: {info.width}x{info.height}, "
+                  f"{info.bitrate // 1000} kbps, {info.size / (1024*1024):.2f} MB")
+        if not args.dry_run:
+            print(f"\nLadder saved to: {args.output}")
+        return
+
     # Optimize video
     print(f"Optimizing {args.input.name}...")
     success = optimizer.optimize_video(
@@ -6,16 +6,16 @@ Usage: python search.py "<query>" [--domain <domain>] [--max-results 5]
        python search.py "<query>" --use-case
        python search.py --category <category>
        python search.py --complexity <low|medium|high>
+       python search.py --serve    (keep indexes warm; later calls use the daemon)
 
 Domains: examples, categories, use-cases, api
 """
 
 import argparse
 import json
-from core import (
-    CSV_CONFIG, MAX_RESULTS, search,
-    search_by_complexity, search_by_category, get_recommended_examples
-)
+import sys
+from core import CSV_CONFIG, MAX_RESULTS
+from search_daemon import call, serve
 
 
 def format_output(result):
@@ -51,18 +51,22 @@ def main():
     parser.add_argument("--use-case", "-u", action="store_true", help="Get recommended examples for use case")
     parser.add_argument("--category", "-c", type=str, help="Filter by category")
     parser.add_argument("--complexity", "-x", choices=["low", "medium", "high"], help="Filter by complexity")
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (keeps indexes warm in memory)")
 
     args = parser.parse_args()
 
+    if args.serve:
+        sys.exit(serve())
+
     # Handle special search modes
     if args.complexity:
-        result = search_by_complexity(args.complexity, args.max_results)
+        result = call("search_by_complexity", args.complexity, args.max_results)
     elif args.category:
-        result = search_by_category(args.category, args.max_results)
+        result = call("search_by_category", args.category, args.max_results)
     elif args.use_case and args.query:
-        result = get_recommended_examples(args.query, args.max_results)
+        result = call("get_recommended_examples", args.query, args.max_results)
     elif args.query:
-        result = search(args.query, args.domain, args.max_results)
+        result = call("search", args.query, args.domain, args.max_results)
     else:
         parser.print_help()
         return
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for core.py (BM25 ranking and batch scoring)"""
+
+import random
+import sys
+from math import log
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core
+from core import BM25
+
+
+def reference_scores(documents, query, k1=1.5, b=0.75):
+    """Textbook BM25 over every document (no postings, no top-k)"""
+    bm25 = BM25(k1, b)
+    corpus = [bm25.tokenize(doc) for doc in documents]
+    avgdl = sum(len(doc) for doc in corpus) / len(corpus)
+    scores = {}
+    for idx, doc in enumerate(corpus):
+        total = 0.0
+        for token in bm25.tokenize(query):
+            df = sum(1 for d in corpus if token in d)
+            if df:
+                idf = log((len(corpus) - df + 0.5) / (df + 0.5) + 1)
+                tf = doc.count(token)
+                total += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avgdl))
+        if total > 0:
+            scores[idx] = total
+    return scores
+
+
+def random_corpus(n_docs, seed=7):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(60)] + ["glass", "dark", "minimal", "flat"]
+    documents = [" ".join(rng.choices(vocab, k=rng.randint(3, 25))) for _ in range(n_docs)]
+    queries = [" ".join(rng.choices(vocab, k=rng.randint(1, 4))) for _ in range(40)]
+    queries += ["glass glass dark", "unknownword", "", "term1 unknownword term2"]
+    return documents, queries
+
+
+class TestBM25Postings:
+    """Test ranking from postings."""
+
+    def test_scores_match_reference(self):
+        """Test postings-based scores equal a full scan of every document."""
+        documents, queries = random_corpus(30)
+        bm25 = BM25()
+        bm25.fit(documents)
+        for query in queries:
+            expected = reference_scores(documents, query)
+            got = dict(bm25.score(query))
+            assert got.keys() == expected.keys()
+            for idx, value in expected.items():
+                assert got[idx] == pytest.approx(value)
+
+    def test_only_matching_documents_are_returned(self):
+        """Test documents sharing no query term are left out."""
+        bm25 = BM25()
+        bm25.fit(["apple banana", "cherry", "banana split"])
+        assert [idx for idx, _ in bm25.score("banana")] == [0, 2]
+        assert bm25.score("durian") == []
+
+    def test_ties_keep_row_order(self):
+        """Test equal scores rank by row order, with and without top_k."""
+        bm25 = BM25()
+        bm25.fit(["apple pie", "banana", "apple pie", "cherry", "apple pie"])
+        assert [idx for idx, _ in bm25.score("apple")] == [0, 2, 4]
+        assert [idx for idx, _ in bm25.score("apple", top_k=2)] == [0, 2]
+
+    def test_top_k_is_prefix_of_full_ranking(self):
+        """Test the heap top-k agrees with the fully sorted ranking."""
+        documents, queries = random_corpus(40)
+        bm25 = BM25()
+        bm25.fit(documents)
+        for query in queries:
+            assert bm25.score(query, top_k=5) == bm25.score(query)[:5]
+
+
+class TestScoreBatch:
+    """Test the NumPy batch backend."""
+
+    @pytest.mark.skipif(not core.NUMPY_AVAILABLE, reason="NumPy not installed")
+    def test_batch_rankings_are_bit_identical(self):
+        """Test vectorized scoring returns exactly score()'s rankings and floats."""
+        documents, queries = random_corpus(core.VECTORIZE_MIN_DOCS * 4)
+        bm25 = BM25()
+        bm25.fit(documents)
+        assert bm25.N > core.VECTORIZE_MIN_DOCS
+
+        for top_k in (None, 1, 5):
+            assert bm25.score_batch(queries, top_k) == [bm25.score(q, top_k) for q in queries]
+
+    def test_small_corpus_uses_score(self):
+        """Test corpora below VECTORIZE_MIN_DOCS take the pure-Python path."""
+        bm25 = BM25()
+        bm25.fit(["apple pie", "banana", "apple"])
+        with patch.object(BM25, "_weight_matrix", side_effect=AssertionError("vectorized")):
+            assert bm25.score_batch(["apple", "banana"]) == [bm25.score("apple"), bm25.score("banana")]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,14 +5,26 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import heapq
+import importlib.util
+import json
+import os
 import re
 from pathlib import Path
 from math import log
 from collections import defaultdict
 
+# NumPy is optional and only imported on first vectorized use, so CLI startup stays light
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = Path(__file__).parent.parent / ".index"
+INDEX_VERSION = 1
 MAX_RESULTS = 3
+VECTORIZE_MIN_DOCS = 50  # Corpus size above which score_batch() uses NumPy
 
 CSV_CONFIG = {
     "style": {
@@ -96,18 +108,27 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
 # ============ BM25 IMPLEMENTATION ============
+def _numpy():
+    """Import NumPy on demand (only called when NUMPY_AVAILABLE)"""
+    global np
+    if np is None:
+        import numpy as np
+    return np
+
+
 class BM25:
     """BM25 ranking algorithm for text search"""
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.doc_freqs = {}
+        self.postings = {}
         self.N = 0
+        self._matrix = None
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
@@ -115,47 +136,125 @@ class BM25:
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index (postings, doc lengths, IDF) from documents"""
+        corpus = [self.tokenize(doc) for doc in documents]
+        self._matrix = None
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            term_freqs = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self.postings = dict(postings)
+        self.doc_freqs = {word: len(docs) for word, docs in self.postings.items()}
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
+    def score(self, query, top_k=None):
+        """Score documents containing a query term, best first (ties by row order)"""
         query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        scores = defaultdict(float)
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
+        # Only walk the postings of query terms; untouched documents score 0
+        for token in query_tokens:
+            if token in self.idf:
+                idf = self.idf[token]
+                for idx, tf in self.postings[token]:
                     numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+                    denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+                    scores[idx] += idf * numerator / denominator
+
+        rank_key = lambda x: (x[1], -x[0])
+        if top_k is None:
+            return sorted(scores.items(), key=rank_key, reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=rank_key)
+
+    def score_batch(self, queries, top_k=None):
+        """Score several queries at once; same rankings as score() for each query.
+
+        With NumPy and a large enough corpus, each query is scored as a dense
+        row accumulated from columns of the sparse document-term weight matrix.
+        Columns are added in query-token order, so the float sums (and therefore
+        ties and rankings) are bit-identical to the pure-Python path.
+        """
+        if not NUMPY_AVAILABLE or self.N < VECTORIZE_MIN_DOCS:
+            return [self.score(query, top_k) for query in queries]
+
+        np = _numpy()
+        vocab, indptr, indices, weights = self._weight_matrix()
+        scores = np.zeros((len(queries), self.N))
+        for row, query in enumerate(queries):
+            for token in self.tokenize(query):
+                col = vocab.get(token)
+                if col is not None:
+                    start, end = indptr[col], indptr[col + 1]
+                    scores[row, indices[start:end]] += weights[start:end]
+
+        rankings = []
+        for row_scores in scores:
+            hits = np.flatnonzero(row_scores)
+            order = hits[np.lexsort((hits, -row_scores[hits]))]
+            if top_k is not None:
+                order = order[:top_k]
+            rankings.append([(int(idx), float(row_scores[idx])) for idx in order])
+        return rankings
+
+    def _weight_matrix(self):
+        """Sparse (CSC) document-term matrix of precomputed BM25 term weights"""
+        if self._matrix is None:
+            np = _numpy()
+            vocab = {}
+            indptr = [0]
+            indices = []
+            tfs = []
+            for col, (word, docs) in enumerate(self.postings.items()):
+                vocab[word] = col
+                for idx, tf in docs:
+                    indices.append(idx)
+                    tfs.append(tf)
+                indptr.append(len(indices))
+
+            indices = np.array(indices, dtype=np.int64)
+            tf = np.array(tfs, dtype=np.float64)
+            idf = np.repeat(np.array([self.idf[word] for word in vocab], dtype=np.float64), np.diff(indptr))
+            doc_len = np.array(self.doc_lengths, dtype=np.float64)[indices]
+            # Same operation order as score() so every weight is bit-identical
+            numerator = tf * (self.k1 + 1)
+            denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+            self._matrix = (vocab, indptr, indices, idf * numerator / denominator)
+        return self._matrix
+
+    def to_dict(self):
+        """Serialize the fitted index to JSON-compatible data"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a fitted index produced by to_dict()"""
+        bm25 = cls(data["k1"], data["b"])
+        bm25.N = data["N"]
+        bm25.avgdl = data["avgdl"]
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.idf = data["idf"]
+        bm25.postings = data["postings"]
+        bm25.doc_freqs = {word: len(docs) for word, docs in bm25.postings.items()}
+        return bm25
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -165,29 +264,128 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
+# In-process cache: (csv path, search cols) -> (file signature, rows, BM25)
+_INDEXES = {}
+
+
+def _file_signature(filepath):
+    """Cheap change detector for a data file: (mtime_ns, size)"""
+    stat = filepath.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _file_hash(filepath):
+    """SHA-256 of a data file, used when the mtime changed but content may not have"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _index_path(filepath):
+    """On-disk index location for a CSV, e.g. .index/stacks__react.json"""
+    relative = filepath.relative_to(DATA_DIR) if filepath.is_relative_to(DATA_DIR) else Path(filepath.name)
+    return INDEX_DIR / (relative.with_suffix("").as_posix().replace("/", "__") + ".json")
+
+
+def _read_index(index_path, search_cols, signature, filepath):
+    """Return a stored index payload if it still matches the CSV, else None"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if payload.get("version") != INDEX_VERSION or payload.get("search_cols") != search_cols:
+        return None
+    if payload.get("signature") == signature:
+        return payload
+    if payload.get("sha256") == _file_hash(filepath):
+        # Touched but unchanged (checkout, copy): refresh the signature only
+        payload["signature"] = signature
+        _write_index(index_path, payload)
+        return payload
+    return None
+
+
+def _write_index(index_path, payload):
+    """Atomically write an index payload; a read-only install just skips persistence"""
+    try:
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def _get_index(filepath, search_cols):
+    """Load (rows, BM25) for a CSV from memory or disk, rebuilding when the CSV changed"""
+    key = (str(filepath), tuple(search_cols))
+    signature = _file_signature(filepath)
+
+    cached = _INDEXES.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    index_path = _index_path(filepath)
+    payload = _read_index(index_path, search_cols, signature, filepath)
+    if payload:
+        data = payload["rows"]
+        bm25 = BM25.from_dict(payload["bm25"])
+    else:
+        data = _load_csv(filepath)
+
+        # Build documents from search columns
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+        bm25 = BM25()
+        bm25.fit(documents)
+
+        _write_index(index_path, {
+            "version": INDEX_VERSION,
+            "source": filepath.name,
+            "signature": signature,
+            "sha256": _file_hash(filepath),
+            "search_cols": search_cols,
+            "rows": data,
+            "bm25": bm25.to_dict()
+        })
+
+    _INDEXES[key] = (signature, data, bm25)
+    return data, bm25
+
+
+def _search_csv_many(filepath, search_cols, output_cols, queries, max_results):
+    """Score several queries against one CSV, loading its index once"""
     if not filepath.exists():
-        return []
+        return [[] for _ in queries]
 
-    data = _load_csv(filepath)
+    data, bm25 = _get_index(filepath, search_cols)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    # Top results (only documents sharing a query term have score > 0)
+    return [
+        [{col: data[idx].get(col, "") for col in output_cols if col in data[idx]} for idx, _ in ranked]
+        for ranked in bm25.score_batch(queries, max_results)
+    ]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using the persisted BM25 index"""
+    return _search_csv_many(filepath, search_cols, output_cols, [query], max_results)[0]
+
 
-    return results
+def warm_indexes():
+    """Load every domain and stack index into memory (used by the search daemon)"""
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _get_index(filepath, config["search_cols"])
+    for config in STACK_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _get_index(filepath, _STACK_COLS["search_cols"])
 
 
 def detect_domain(query):
@@ -235,6 +433,36 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
+def search_many(queries_by_domain, max_results=MAX_RESULTS):
+    """Batch search: each domain's index is loaded once and all its queries scored together.
+
+    queries_by_domain maps domain -> query string (result is a search() dict)
+    or domain -> list of queries (result is a list of search() dicts).
+    max_results is an int or a {domain: int} mapping.
+    """
+    output = {}
+    for domain, queries in queries_by_domain.items():
+        batch = [queries] if isinstance(queries, str) else list(queries)
+        limit = max_results.get(domain, MAX_RESULTS) if isinstance(max_results, dict) else max_results
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+
+        if not filepath.exists():
+            domain_results = [{"error": f"File not found: {filepath}", "domain": domain} for _ in batch]
+        else:
+            ranked = _search_csv_many(filepath, config["search_cols"], config["output_cols"], batch, limit)
+            domain_results = [{
+                "domain": domain,
+                "query": query,
+                "file": config["file"],
+                "count": len(results),
+                "results": results
+            } for query, results in zip(batch, ranked)]
+
+        output[domain] = domain_results[0] if isinstance(queries, str) else domain_results
+    return output
+
+
 def search_stack(query, stack, max_results=MAX_RESULTS):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
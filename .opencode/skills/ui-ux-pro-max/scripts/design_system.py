@@ -12,7 +12,7 @@ Usage:
 import csv
 import json
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -43,17 +43,17 @@ class DesignSystemGenerator:
             return list(csv.DictReader(f))
 
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
-        for domain, config in SEARCH_CONFIG.items():
+        """Execute searches across multiple domains as one batch."""
+        queries = {}
+        for domain in SEARCH_CONFIG:
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                queries[domain] = f"{query} {priority_query}"
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                queries[domain] = query
+        max_results = {domain: config["max_results"] for domain, config in SEARCH_CONFIG.items()}
+        return search_many(queries, max_results)
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
@@ -157,7 +157,7 @@ class DesignSystemGenerator:
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = search_many({"product": query}, 1)["product"]
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
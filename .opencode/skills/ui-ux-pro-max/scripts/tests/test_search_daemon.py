@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for search_daemon.py (shared server/client in .opencode/scripts)"""
+
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import search_daemon
+
+pytestmark = pytest.mark.skipif(
+    not search_daemon.SEARCH_DAEMON_AVAILABLE or not hasattr(socket, "AF_UNIX"),
+    reason="Unix socket daemon not available"
+)
+
+if search_daemon.SEARCH_DAEMON_AVAILABLE:
+    import skill_search_daemon
+    from skill_search_daemon import SearchDaemon
+
+
+@pytest.fixture
+def listening_socket(tmp_path):
+    """A socket that accepts connections but never answers (a hung daemon)"""
+    path = tmp_path / "s.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.listen(8)
+    yield path
+    sock.close()
+
+
+class TestSearchDaemon:
+    """Test socket placement, ownership checks and client fallback."""
+
+    def test_default_path_is_private(self, monkeypatch):
+        """Test the default socket lives in XDG_RUNTIME_DIR or a per-user directory."""
+        monkeypatch.delenv("UIPRO_SEARCH_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        path = skill_search_daemon.default_socket_path("ui-ux-pro-max", "UIPRO_SEARCH_SOCKET")
+        assert path.parent.name == f"skill-search-{os.getuid()}"
+
+    def test_default_path_uses_runtime_dir(self, monkeypatch, tmp_path):
+        """Test a private XDG_RUNTIME_DIR is preferred."""
+        tmp_path.chmod(0o700)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert skill_search_daemon.default_socket_path("x") == tmp_path / "x-search.sock"
+
+    def test_foreign_socket_is_not_used(self, listening_socket, monkeypatch):
+        """Test the client never connects to a socket owned by another user."""
+        daemon = SearchDaemon("t", {"search": lambda q: "local"}, socket_path=listening_socket)
+        uid = os.getuid()
+        monkeypatch.setattr(skill_search_daemon.os, "getuid", lambda: uid + 1)
+        monkeypatch.setattr(skill_search_daemon.socket, "socket",
+                            lambda *a: pytest.fail("connected to a foreign socket"))
+
+        assert daemon.call("search", "q") == "local"
+
+    def test_serve_refuses_foreign_stale_socket(self, listening_socket, monkeypatch):
+        """Test serve() fails cleanly instead of unlinking another user's socket."""
+        daemon = SearchDaemon("t", {}, socket_path=listening_socket)
+        uid = os.getuid()
+        monkeypatch.setattr(skill_search_daemon.os, "getuid", lambda: uid + 1)
+
+        assert daemon.serve() == 1
+        assert listening_socket.exists()
+
+    def test_hung_daemon_is_skipped_after_timeout(self, listening_socket, monkeypatch):
+        """Test one timeout disables the daemon for the rest of the process."""
+        monkeypatch.setattr(skill_search_daemon, "CLIENT_TIMEOUT", 0.2)
+        daemon = SearchDaemon("t", {"search": lambda q: f"local {q}"}, socket_path=listening_socket)
+
+        assert daemon.call("search", "a") == "local a"
+        start = time.monotonic()
+        assert daemon.call("search", "b") == "local b"
+        assert time.monotonic() - start < 0.1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])